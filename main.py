@@ -1,24 +1,91 @@
 import argparse
 import time
 import sys
+import os
 
-sys.path.append(".\\source")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "source"))
 from source import image_processing
 
+# The pipeline imports these modules by their top-level names, and their defaults are module state,
+# so they must be the same module objects and not copies under the "source." package
+import ocr_cache
+import color_cache
+import translation_memory
+import argos_translate
+import google_translate_async
+import translation_dispatch
+
 def run(args):
+    # Network access only happens here, the default package check works offline
+    if args.update_packages:
+        argos_translate.valid_check(update=True, src=args.src, dest=args.dest)
+
+    # The CTranslate2 settings are process-wide, set once before any model is loaded
+    argos_translate.configure(inter_threads=args.argos_inter_threads, intra_threads=args.argos_intra_threads, \
+                              compute_type=args.argos_compute_type, beam_size=args.argos_beam_size)
+
+    if args.translator in ("google_async", "hedged"):
+        google_translate_async.set_default(google_translate_async.AsyncTranslator(max_concurrency=args.google_concurrency))
+
+    if args.translator == "hedged":
+        translation_dispatch.set_default(translation_dispatch.TranslationDispatcher(primary=args.hedge_primary, deadline=args.hedge_deadline))
+
+    cache = None
+    if args.cache_dir:
+        os.makedirs(args.cache_dir, exist_ok=True)
+        cache = ocr_cache.OCRCache(os.path.join(args.cache_dir, "ocr_cache.db"))
+        translation_memory.set_default(translation_memory.TranslationMemory(os.path.join(args.cache_dir, "translation_memory.db")))
+
+    colors = None
+    if args.color_cache_size > 0:
+        colors = color_cache.ColorCache(args.color_cache_size)
+
     image_translator = image_processing.ProcessingBlock(
         image_path = args.file,
         save_path = args.save,
         src_lang = args.src,
         dest_lang = args.dest,
         font_type = args.font,
-        translator_mode = args.translator
+        font_min_scale = args.font_min_scale,
+        erase_method = args.erase_method,
+        translator_mode = args.translator,
+        ocr_mode = args.ocr_mode,
+        tile_size = args.tile_size,
+        tile_overlap = args.tile_overlap,
+        ocr_workers = args.ocr_workers,
+        ocr_engine = args.ocr_engine,
+        ocr_preprocess = args.ocr_preprocess,
+        ocr_text_height = args.ocr_text_height,
+        ocr_gate = bool(args.ocr_gate),
+        ocr_cache = cache,
+        block_mode = args.block_mode,
+        color_method = args.color_method,
+        color_workers = args.color_workers,
+        translate_workers = args.translate_workers,
+        color_cache = colors,
+        translate_batch = bool(args.translate_batch),
+        translate_plan = bool(args.translate_plan)
     )
     image_translator.ocr_process()
     image_translator.recollection_text()
     image_translator.build_blocks()
-    image_translator.processing_run()
-    image_translator.draw_process()
+
+    if args.stream:
+        # Print each block as soon as it is translated and rendered
+        for result in image_translator.iter_results(priority=args.stream_priority):
+            print(f"[{result['elapsed'] * 1000:8.1f} ms] {result['rank'] + 1}/{len(image_translator.blocks_)} "
+                  f"{result['text']!r} -> {' '.join(result['translated_text'])!r} ({result['engine']})")
+    else:
+        image_translator.processing_run()
+
+    if args.verbose:
+        print(f"translation plan: {image_translator.translation_stats_}")
+
+        if args.translator == "hedged":
+            print(f"translation engines: {translation_dispatch.get_default().stats()}")
+
+        if translation_memory.get_default() is not None:
+            print(f"translation memory: {translation_memory.get_default().stats()}")
 
     if args.result == 0:
         image_translator.show_result()
@@ -44,7 +111,36 @@ def main():
     parser.add_argument("--src", type=str, default="en", help="The source language")
     parser.add_argument("--dest", type=str, default="ko", help="The target language")
     parser.add_argument("--font", type=str, default="fonts\\gulim.ttc", help="Path to font")
-    parser.add_argument("--translator", type=str, default="argos", help="Translator name to use")
+    parser.add_argument("--font_min_scale", type=float, default=0.5, help="Smallest font scale used to fit the translated text into its line boxes")
+    parser.add_argument("--erase_method", type=str, default="fill", help="How the old text is erased, fill: background color of each line box, inpaint: text pixels only, for textured backgrounds")
+    parser.add_argument("--translator", type=str, default="argos", help="Translator name to use, argos, google_lib, google_async (concurrent requests over one pooled client) or hedged (online engine with argos fallback)")
+    parser.add_argument("--ocr_mode", type=str, default="full", help="OCR mode, full: whole image at once, tiled: overlapping tiles in parallel, region: proposed text regions only")
+    parser.add_argument("--tile_size", type=int, default=2048, help="Tile size in pixels for the tiled OCR mode")
+    parser.add_argument("--tile_overlap", type=int, default=256, help="Tile overlap in pixels for the tiled OCR mode")
+    parser.add_argument("--ocr_workers", type=int, default=None, help="Number of OCR worker processes, default uses all cores")
+    parser.add_argument("--ocr_engine", type=str, default="pytesseract", help="OCR engine, pytesseract, tesserocr (in-process) or pool (warm worker processes)")
+    parser.add_argument("--ocr_preprocess", type=str, default=None, help="Conversion before OCR, gray or binary")
+    parser.add_argument("--ocr_text_height", type=int, default=None, help="Rescale the image so characters are about this many pixels high before OCR")
+    parser.add_argument("--ocr_gate", type=int, default=0, help="1: skip Tesseract in the full and tiled OCR modes when no text region is proposed (may miss low-contrast text), 0: always run it")
+    parser.add_argument("--block_mode", type=str, default="sequential", help="Paragraph clustering, sequential or spatial (multi-column layouts)")
+    parser.add_argument("--color_method", type=str, default="kmeans", help="Color estimator, kmeans (sklearn reference), cv2, histogram or batch (all blocks in one pass)")
+    parser.add_argument("--color_workers", type=int, default=1, help="Number of threads finding block colors")
+    parser.add_argument("--translate_workers", type=int, default=1, help="Number of threads translating blocks")
+    parser.add_argument("--translate_batch", type=int, default=0, help="1: translate all blocks with one batch call (argos, google_async, hedged), --translate_workers is not used then, 0: translate block by block")
+    parser.add_argument("--translate_plan", type=int, default=1, help="1: translate each unique text once, skipping numbers, URLs and text already in the target language, 0: translate every block")
+    parser.add_argument("--stream", action="store_true", help="Print each block as soon as it is ready instead of waiting for the whole page")
+    parser.add_argument("--stream_priority", type=str, default="font", help="Order of the streamed blocks, font (largest first), top, area or order")
+    parser.add_argument("--hedge_primary", type=str, default="google_async", help="Primary engine of the hedged translator, argos is the fallback")
+    parser.add_argument("--hedge_deadline", type=float, default=10.0, help="Seconds after which the hedged translator abandons the primary engine")
+    parser.add_argument("--google_concurrency", type=int, default=16, help="Maximum number of requests in flight for the google_async translator")
+    parser.add_argument("--color_cache_size", type=int, default=0, help="Number of region colors to cache and reuse for regions with the same color signature (not used by the batch method), 0 disables the cache")
+    parser.add_argument("--cache_dir", type=str, default="", help="Directory of the OCR result cache and the translation memory, e.g. .\\cache, empty string (default) disables both")
+    parser.add_argument("--argos_inter_threads", type=int, default=None, help="Number of batches CTranslate2 translates in parallel")
+    parser.add_argument("--argos_intra_threads", type=int, default=None, help="Number of CTranslate2 threads per batch, 0 lets CTranslate2 decide")
+    parser.add_argument("--argos_compute_type", type=str, default=None, help="CTranslate2 compute type, e.g. int8, int8_float32 or float32")
+    parser.add_argument("--argos_beam_size", type=int, default=None, help="Beam size of batch translation, 1 is greedy decoding")
+    parser.add_argument("--update_packages", action="store_true", help="Download the Argos package index and install missing language packages before running")
+    parser.add_argument("--verbose", action="store_true", help="Print the translation plan, engine and translation memory statistics after the run")
     parser.add_argument("--result", type=int, default="0", help="Result options, 0: only show result, 1: save only, 2: save and show, 3: save all process")
 
     args = parser.parse_args()
@@ -1,5 +1,9 @@
 import os
 import sys
+import json
+import base64
+import cv2
+import numpy as np
 import dotenv
 import shutil
 import hashlib
@@ -8,7 +12,7 @@ from pathlib import Path
 from pymongo import MongoClient
 from datetime import datetime, timezone
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
 # Load image processing module
 BASE_DIR = Path(__file__).resolve().parent
@@ -16,6 +20,15 @@ MODULE_DIR = BASE_DIR / "source"
 sys.path.append(str(MODULE_DIR))
 from source import image_processing
 
+# The pipeline imports these modules by their top-level names, and their defaults are module state,
+# so they must be the same module objects and not copies under the "source." package
+import ocr_cache
+import color_cache
+import translation_memory
+import argos_translate
+import google_translate_async
+import translation_dispatch
+
 # Load environment variables from .env file
 dotenv.load_dotenv()
 
@@ -36,6 +49,68 @@ RESULT_DIR.mkdir(parents=True, exist_ok=True)
 # Max file size: 5MB
 MAX_SIZE = 5 * 1024 * 1024
 
+# OCR result cache shared by every request, disabled if OCR_CACHE_PATH is not set
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH")
+OCR_CACHE = None
+if OCR_CACHE_PATH:
+    Path(OCR_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    OCR_CACHE = ocr_cache.OCRCache(OCR_CACHE_PATH)
+
+# Translation memory shared by every worker through one SQLite file, disabled if TRANSLATION_MEMORY_PATH is not set
+TRANSLATION_MEMORY_PATH = os.getenv("TRANSLATION_MEMORY_PATH")
+if TRANSLATION_MEMORY_PATH:
+    Path(TRANSLATION_MEMORY_PATH).parent.mkdir(parents=True, exist_ok=True)
+    translation_memory.set_default(translation_memory.TranslationMemory(TRANSLATION_MEMORY_PATH))
+
+# Region color cache shared by every request, disabled if COLOR_CACHE_SIZE is not set
+COLOR_CACHE_SIZE = int(os.getenv("COLOR_CACHE_SIZE", "0"))
+COLOR_CACHE = color_cache.ColorCache(COLOR_CACHE_SIZE) if COLOR_CACHE_SIZE > 0 else None
+
+# Translate all blocks of an image with one batch call, "1" to enable
+TRANSLATE_BATCH = os.getenv("TRANSLATE_BATCH", "0") == "1"
+
+# Color estimator of every request, "batch" estimates all blocks of an image in one pass
+COLOR_METHOD = os.getenv("COLOR_METHOD", "kmeans")
+
+# CTranslate2 settings of the Argos models, unset values keep the CTranslate2 defaults
+ARGOS_INTER_THREADS = int(os.getenv("ARGOS_INTER_THREADS")) if os.getenv("ARGOS_INTER_THREADS") else None
+ARGOS_INTRA_THREADS = int(os.getenv("ARGOS_INTRA_THREADS")) if os.getenv("ARGOS_INTRA_THREADS") else None
+ARGOS_COMPUTE_TYPE = os.getenv("ARGOS_COMPUTE_TYPE") or None
+ARGOS_BEAM_SIZE = int(os.getenv("ARGOS_BEAM_SIZE")) if os.getenv("ARGOS_BEAM_SIZE") else None
+
+# Applied once at startup for the whole process, so the preloaded models below and every request share these settings
+argos_translate.configure(
+    inter_threads=ARGOS_INTER_THREADS,
+    intra_threads=ARGOS_INTRA_THREADS,
+    compute_type=ARGOS_COMPUTE_TYPE,
+    beam_size=ARGOS_BEAM_SIZE
+)
+
+# Endpoint and request limit of the google_async translator, the defaults are used if neither is set
+GOOGLE_TRANSLATE_URL = os.getenv("GOOGLE_TRANSLATE_URL")
+GOOGLE_MAX_CONCURRENCY = os.getenv("GOOGLE_MAX_CONCURRENCY")
+if GOOGLE_TRANSLATE_URL or GOOGLE_MAX_CONCURRENCY:
+    google_translate_async.set_default(google_translate_async.AsyncTranslator(
+        url=GOOGLE_TRANSLATE_URL or google_translate_async.DEFAULT_URL,
+        max_concurrency=int(GOOGLE_MAX_CONCURRENCY or "16")
+    ))
+
+# Translator of every request, "hedged" sends slow or failing online requests to Argos as well
+TRANSLATOR_MODE = os.getenv("TRANSLATOR_MODE", "argos")
+if TRANSLATOR_MODE == "hedged":
+    translation_dispatch.set_default(translation_dispatch.TranslationDispatcher(
+        primary=os.getenv("HEDGE_PRIMARY", "google_async"),
+        deadline=float(os.getenv("HEDGE_DEADLINE", "10"))
+    ))
+
+# Eraser of the old text, "fill" paints the line boxes, "inpaint" keeps textured backgrounds
+ERASE_METHOD = os.getenv("ERASE_METHOD", "fill")
+
+# Argos language pairs loaded at startup as "src-dest" separated by commas, e.g. "en-ko,ja-ko"
+ARGOS_PRELOAD = os.getenv("ARGOS_PRELOAD", "")
+for pair in filter(None, ARGOS_PRELOAD.split(",")):
+    argos_translate.preload(*pair.strip().split("-"))
+
 
 # Initialize FastAPI
 app = FastAPI()
@@ -58,48 +133,141 @@ def get_file_hash(file_path: str) -> str:
     return sha256_hash.hexdigest()
 
 
-def run(image_path: str, save_path: str) -> None:
+def create_translator(image_path: str, save_path: str, file_hash: str = None) -> image_processing.ProcessingBlock:
     """
-    Run the image processing pipeline.  
-    This function reads an input image file for OCR, translation, 
-    then processes it, saves the result.
+    Create the image processing pipeline with the shared caches and run OCR and grouping.
 
     Args:
         image_path (str): Path to the input image.
         save_path (str): Path to save the processed image.
+        file_hash (str, optional): SHA-256 hash of the input image, used as the OCR cache key.
+
+    Returns:
+        ProcessingBlock: The pipeline with its paragraph blocks built.
     """
     image_translator = image_processing.ProcessingBlock(
         image_path = image_path,
-        save_path = save_path
+        save_path = save_path,
+        translator_mode = TRANSLATOR_MODE,
+        erase_method = ERASE_METHOD,
+        ocr_cache = OCR_CACHE,
+        image_hash = file_hash,
+        color_cache = COLOR_CACHE,
+        color_method = COLOR_METHOD,
+        translate_batch = TRANSLATE_BATCH
     )
 
     image_translator.ocr_process()
     image_translator.recollection_text()
     image_translator.build_blocks()
+
+    return image_translator
+
+
+def run(image_path: str, save_path: str, file_hash: str = None) -> None:
+    """
+    Run the image processing pipeline.  
+    This function reads an input image file for OCR, translation, 
+    then processes it, saves the result.
+
+    Args:
+        image_path (str): Path to the input image.
+        save_path (str): Path to save the processed image.
+        file_hash (str, optional): SHA-256 hash of the input image, used as the OCR cache key.
+    """
+    image_translator = create_translator(image_path, save_path, file_hash)
     image_translator.processing_run()
-    image_translator.draw_process()
     image_translator.save_result()
 
     return
 
 
-@app.post("/upload")
-async def upload_image(request: Request, image: UploadFile = File(...)):
+def block_result_json(result: dict) -> dict:
     """
-    Endpoint to upload and process the image file.
+    Convert a block result of `ProcessingBlock.iter_results` into JSON-compatible values.
+
+    The rendered patch is encoded as a base64 PNG.
 
     Args:
-        image (UploadFile): Image file uploaded by the user
+        result (dict): The block result.
 
     Returns:
-        dict: Success message and file hash.
+        dict: The block result with plain Python values.
+    """
+    _, png = cv2.imencode(".png", result["patch"])
+
+    return {
+        "index": int(result["index"]),
+        "rank": int(result["rank"]),
+        "position": [int(value) for value in result["position"]],
+        "text": result["text"],
+        "translated_text": result["translated_text"],
+        "font_size": [int(size) for size in result["font_size"]],
+        "engine": result["engine"],
+        "background_color": np.asarray(result["background_color"]).tolist(),
+        "font_color": np.asarray(result["font_color"]).tolist(),
+        "patch": base64.b64encode(png.tobytes()).decode("ascii"),
+        "elapsed": result["elapsed"]
+    }
+
+
+def stream_run(image_path: str, save_path: str, file_hash: str, record_id, priority: str = "font"):
+    """
+    Run the image processing pipeline and yield each block as one NDJSON line as soon as it is ready.
+
+    The last line reports the end of the run with the translation counters, or the error that stopped it.  
+    The result image is saved and the DB record updated before the last line.
+
+    Args:
+        image_path (str): Path to the input image.
+        save_path (str): Path to save the processed image.
+        file_hash (str): SHA-256 hash of the input image.
+        record_id (ObjectId): ID of the DB record of the upload.
+        priority (str, optional): Order of the blocks, see `ProcessingBlock.priority_order`. Defaults to "font".
+
+    Yields:
+        str: One JSON object per line.
+    """
+    try:
+        image_translator = create_translator(image_path, save_path, file_hash)
+
+        for result in image_translator.iter_results(priority=priority):
+            yield json.dumps(block_result_json(result), ensure_ascii=False) + "\n"
+
+        image_translator.save_result()
+
+        collection.update_one(
+            {"_id": record_id},
+            {"$set": {
+                "processed": True,
+                "processed_at": datetime.now(timezone.utc),
+                "result_file_path": save_path
+            }}
+        )
+
+        yield json.dumps({"done": True, "file_hash": file_hash, "stats": image_translator.translation_stats_}) + "\n"
+
+    except Exception as e:
+        yield json.dumps({"done": False, "error": f"process failure: {str(e)}"}) + "\n"
+
+    return
+
+
+def store_upload(request: Request, image: UploadFile) -> tuple:
+    """
+    Validate an uploaded image, store it in the upload directory and hash it.
+
+    Args:
+        request (Request): The upload request.
+        image (UploadFile): Image file uploaded by the user.
+
+    Returns:
+        tuple: The stored file path and its SHA-256 hash as (save_path, file_hash).
 
     Raises:
         HTTPException: 
             - status_code=400: if the file is not an image.
             - status_code=413: if the file size exceeds MAX_SIZE.
-            - status_code=303: if the file already exists (duplicate).
-            - status_code=500: if processing fails.
     """
     # Check the file type
     if not image.content_type.startswith("image/"):
@@ -118,17 +286,23 @@ async def upload_image(request: Request, image: UploadFile = File(...)):
     # Calculate the file hash by sha-256
     file_hash = get_file_hash(save_path)
 
-    # Check duplicates in the database by file_hash
-    existing_file = collection.find_one({"file_hash": file_hash})
-    if existing_file:
-        if save_path.is_file():
-            save_path.unlink()
-        return JSONResponse(
-            status_code=303,
-            content={"message": "already existing file", "file_hash": file_hash}
-        )
+    return save_path, file_hash
 
-    # Insert new record into DB
+
+def insert_record(save_path: Path, file_hash: str):
+    """
+    Insert the DB record of a new upload.
+
+    Args:
+        save_path (Path): Path of the stored upload.
+        file_hash (str): SHA-256 hash of the upload.
+
+    Returns:
+        ObjectId: ID of the inserted record.
+
+    Raises:
+        HTTPException: status_code=500 if the insert fails.
+    """
     try:
         record = {
             "file_hash": file_hash,
@@ -143,14 +317,50 @@ async def upload_image(request: Request, image: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB error: {str(e)}")
 
+    return result.inserted_id
+
+
+@app.post("/upload")
+async def upload_image(request: Request, image: UploadFile = File(...)):
+    """
+    Endpoint to upload and process the image file.
+
+    Args:
+        image (UploadFile): Image file uploaded by the user
+
+    Returns:
+        dict: Success message and file hash.
+
+    Raises:
+        HTTPException: 
+            - status_code=400: if the file is not an image.
+            - status_code=413: if the file size exceeds MAX_SIZE.
+            - status_code=303: if the file already exists (duplicate).
+            - status_code=500: if processing fails.
+    """
+    save_path, file_hash = store_upload(request, image)
+
+    # Check duplicates in the database by file_hash
+    existing_file = collection.find_one({"file_hash": file_hash})
+    if existing_file:
+        if save_path.is_file():
+            save_path.unlink()
+        return JSONResponse(
+            status_code=303,
+            content={"message": "already existing file", "file_hash": file_hash}
+        )
+
+    # Insert new record into DB
+    record_id = insert_record(save_path, file_hash)
+
     # Run the image processing pipeline
     try:
         result_file_path = RESULT_DIR / f"{file_hash}{Path(image.filename).suffix}"
 
-        run(str(save_path), str(result_file_path))
+        run(str(save_path), str(result_file_path), file_hash)
 
         collection.update_one(
-            {"_id": result.inserted_id},
+            {"_id": record_id},
             {"$set": {
                 "processed": True,
                 "processed_at": datetime.now(timezone.utc),
@@ -165,6 +375,54 @@ async def upload_image(request: Request, image: UploadFile = File(...)):
     return {"message": "process success", "file_hash": file_hash}
 
 
+@app.post("/upload/stream")
+async def upload_image_stream(request: Request, image: UploadFile = File(...), priority: str = "font"):
+    """
+    Endpoint to upload an image and stream the translated blocks as they are ready.
+
+    The response is newline-delimited JSON: one object per block in priority order 
+    (translation, colors, position and the rendered patch as a base64 PNG), then a final object with "done".  
+    The result image is stored like with /upload and can be downloaded afterwards.
+
+    Args:
+        image (UploadFile): Image file uploaded by the user
+        priority (str, optional): Order of the blocks, font (largest first), top, area or order. Defaults to "font".
+
+    Returns:
+        StreamingResponse: The NDJSON stream of block results.
+
+    Raises:
+        HTTPException: 
+            - status_code=400: if the file is not an image or the priority is unknown.
+            - status_code=413: if the file size exceeds MAX_SIZE.
+            - status_code=303: if the file already exists (duplicate).
+            - status_code=500: if the DB insert fails.
+    """
+    # Checked before anything is stored, the stream cannot report an error once the response has started
+    if priority not in image_processing.PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"unknown priority: {priority}, expected one of {', '.join(image_processing.PRIORITIES)}")
+
+    save_path, file_hash = store_upload(request, image)
+
+    # Check duplicates in the database by file_hash
+    existing_file = collection.find_one({"file_hash": file_hash})
+    if existing_file:
+        if save_path.is_file():
+            save_path.unlink()
+        return JSONResponse(
+            status_code=303,
+            content={"message": "already existing file", "file_hash": file_hash}
+        )
+
+    record_id = insert_record(save_path, file_hash)
+    result_file_path = RESULT_DIR / f"{file_hash}{Path(image.filename).suffix}"
+
+    return StreamingResponse(
+        stream_run(str(save_path), str(result_file_path), file_hash, record_id, priority),
+        media_type="application/x-ndjson"
+    )
+
+
 @app.get("/download/{file_hash}")
 async def download_image(file_hash: str):
     """
@@ -1,16 +1,47 @@
+import os
+import re
+import threading
+import ctranslate2
 import argostranslate
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
 
+import translation_memory
+
 """
 Source file for Argos translation.
 Used for offline translation.
 Argos Translate is Open-source offline translation library written in Python.
+Translation objects are loaded once per language pair and kept resident,
+and the package check runs offline unless a network update is requested.
 https://github.com/argosopentech/argos-translate
 """
 
-# Global flag: check for installed language pack.
-VALID_CHECK = False
+# Language pairs (source code, destination code) whose installed packages were checked.
+VALID_CHECK = set()
+
+# Lock so concurrent translations run the package check only once
+VALID_LOCK = threading.Lock()
+
+# Resident translation objects keyed by (source language code, destination language code)
+TRANSLATORS = {}
+TRANSLATOR_LOCK = threading.Lock()
+
+# Sentence boundaries used to split texts before batch translation if the package has no sentencizer (argostranslate 1.9 and older)
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Maximum number of sentences CTranslate2 translates in one batch
+BATCH_SIZE = 32
+
+# CTranslate2 settings of the loaded models, changed with configure().
+# The defaults are the CTranslate2 defaults: one batch at a time on all cores (0 = automatic), the model's own compute type.
+INTER_THREADS = 1
+INTRA_THREADS = 0
+COMPUTE_TYPE = "default"
+
+# Beam size of batch translation, the value argostranslate uses
+BEAM_SIZE = 4
 
 
 def find_package_index(package_language: str) -> list:
@@ -33,45 +64,90 @@ def find_package_index(package_language: str) -> list:
     return package_index
 
 
-def valid_check(package_language: str= None, install_all: bool= False) -> None:
+def find_pair_packages(src: str, dest: str) -> list:
+    """
+    Find the available packages that translate between two languages, directly or through English.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+
+    Returns:
+        list: The available packages translating src to dest, or src to English and English to dest if there is no direct package.
+    """
+    available_packages = argostranslate.package.get_available_packages()
+    pairs = [(src, dest)]
+
+    if not any((package.from_code, package.to_code) in pairs for package in available_packages):
+        pairs = [(src, "en"), ("en", dest)]
+
+    return [package for package in available_packages if (package.from_code, package.to_code) in pairs]
+
+
+def valid_check(package_language: str= None, \
+                install_all: bool= False, \
+                update: bool= False, \
+                src: str= "en", \
+                dest: str= "ko") -> None:
     """
     Validate and install the required language packages for translation.
 
+    The check works offline: installed packages are read from the local package directory,
+    and packages to install are looked up in the cached package index.  
+    The remote package index is only downloaded if `update` is True, 
+    or if packages are requested explicitly and no cached index exists yet.  
+    The default check validates that the languages of the requested pair are installed, 
+    and installs the packages of the pair (English and Korean by default) only with `update`.
+
     Args:
         package_language (str, optional): The language for which packages should be installed.
         install_all (bool, optional): If True, installs all available language packages.
+        update (bool, optional): If True, refreshes the package index and installs the missing packages of the pair. Defaults to False.
+        src (str, optional): The source language code of the pair to validate. Defaults to "en".
+        dest (str, optional): The destination language code of the pair to validate. Defaults to "ko".
 
     Raises:
-        Exception: If an error occurs during the package installation process.
+        Exception: If an error occurs during the package installation process, 
+            or if the languages of the pair are not installed and `update` is False.
     """
-    global VALID_CHECK
-
     try:
-        argostranslate.package.update_package_index()
-        available_packages = argostranslate.package.get_available_packages()
-        installed_languages = list(map(str, argostranslate.translate.get_installed_languages()))
+        explicit_install = install_all or package_language is not None
+        if update or (explicit_install and not os.path.exists(argostranslate.settings.local_package_index)):
+            argostranslate.package.update_package_index()
+
+        installed_languages = [language.code for language in argostranslate.translate.get_installed_languages()]
+        installed = False
         
         # Install all available packages. (not recommended)
         if install_all:
             argostranslate.argospm.install_all_packages()
+            installed = True
 
         # Install packages for the specified language.
         elif package_language is not None:
+            available_packages = argostranslate.package.get_available_packages()
             package_index = find_package_index(package_language)
 
             for num in package_index:
                 argostranslate.package.install_from_path(available_packages[num].download())
+            installed = True
+
+        # Default behavior: validate the requested pair, install its packages only on request.
+        elif not (src in installed_languages and dest in installed_languages):
+            if not update:
+                raise Exception(f"Argos packages for {src} and {dest} are not installed, run valid_check(update=True) with network access")
 
-        # Default behavior: install Korean package.
-        else:
-            package_index = find_package_index("Korean")
+            for package in find_pair_packages(src, dest):
+                argostranslate.package.install_from_path(package.download())
+            installed = True
 
-            if not('English' in installed_languages and 'Korean' in installed_languages):
-                for num in package_index:
-                    argostranslate.package.install_from_path(available_packages[num].download())
+        # Newly installed packages replace the resident translators
+        if installed:
+            clear_translators()
 
-        # Update global flag, installation is complete.
-        VALID_CHECK = True
+        # Remember the pair once its languages are installed.
+        if not explicit_install:
+            VALID_CHECK.add((src, dest))
 
     except Exception as e:
         raise Exception(f"Error during valid_check: {e}")
@@ -79,6 +155,196 @@ def valid_check(package_language: str= None, install_all: bool= False) -> None:
     return
 
 
+def ensure_valid(src: str, dest: str) -> None:
+    """
+    Run the offline package check once per language pair and process, also when called from several threads.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+    """
+    if (src, dest) not in VALID_CHECK:
+        with VALID_LOCK:
+            if (src, dest) not in VALID_CHECK:
+                valid_check(src=src, dest=dest)
+
+    return
+
+
+def get_translator(src: str, dest: str):
+    """
+    Return the resident translation object for a language pair, loading it on first use.
+
+    The object keeps its CTranslate2 model loaded, so later calls skip resolving the installed languages and loading the model.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+
+    Returns:
+        ITranslation: The argostranslate translation object.
+
+    Raises:
+        Exception: If no installed package translates between the languages.
+    """
+    translation = TRANSLATORS.get((src, dest))
+    if translation is not None:
+        return translation
+
+    with TRANSLATOR_LOCK:
+        translation = TRANSLATORS.get((src, dest))
+
+        if translation is None:
+            try:
+                translation = argostranslate.translate.get_translation_from_codes(src, dest)
+            except Exception as e:
+                raise Exception(f"No installed Argos package translates {src} to {dest}: {e}")
+
+            if translation is None:
+                raise Exception(f"No installed Argos package translates {src} to {dest}")
+
+            load_models(translation)
+            TRANSLATORS[(src, dest)] = translation
+
+    return translation
+
+
+def package_translations(translation) -> list:
+    """
+    Return the package translations a translation object is made of.
+
+    Args:
+        translation (ITranslation): The argostranslate translation object.
+
+    Returns:
+        list: The package translations, two for a translation through a pivot language.
+    """
+    while hasattr(translation, 'underlying'):
+        translation = translation.underlying
+
+    if hasattr(translation, 't1') and hasattr(translation, 't2'):
+        return package_translations(translation.t1) + package_translations(translation.t2)
+
+    if hasattr(translation, 'pkg'):
+        return [translation]
+
+    return []
+
+
+def load_models(translation) -> None:
+    """
+    Load the CTranslate2 models of a translation object with the configured threading and compute type.
+
+    Models that are already loaded are kept.
+
+    Args:
+        translation (ITranslation): The argostranslate translation object.
+    """
+    for package_translation in package_translations(translation):
+        if package_translation.translator is None:
+            package_translation.translator = ctranslate2.Translator(
+                str(package_translation.pkg.package_path / "model"),
+                device=argostranslate.settings.device,
+                compute_type=COMPUTE_TYPE,
+                inter_threads=INTER_THREADS,
+                intra_threads=INTRA_THREADS
+            )
+
+    return
+
+
+def configure(inter_threads: int= None, \
+              intra_threads: int= None, \
+              compute_type: str= None, \
+              beam_size: int= None) -> None:
+    """
+    Change the CTranslate2 settings used for translation.
+
+    The settings are shared by the whole process, so they are set once at startup (see main.py and server.py) 
+    and not per image, since a change releases models that other threads may be translating with.  
+    Settings left as None keep their current value.  
+    If the threading or the compute type changes, the loaded models are released and reloaded on the next translation.  
+    The beam size applies to batch translation (`text_translate_batch`), 
+    `text_translate` uses the argostranslate pipeline and its fixed beam size.
+
+    Args:
+        inter_threads (int, optional): Number of batches translated in parallel.
+        intra_threads (int, optional): Number of threads used for one batch, 0 lets CTranslate2 decide.
+        compute_type (str, optional): Weight and computation type, e.g. 'int8', 'int8_float32', 'float32' or 'default'.
+        beam_size (int, optional): Beam size of batch translation, 1 is greedy decoding.
+    """
+    global INTER_THREADS, INTRA_THREADS, COMPUTE_TYPE, BEAM_SIZE
+
+    loaded = (INTER_THREADS, INTRA_THREADS, COMPUTE_TYPE)
+
+    if inter_threads is not None:
+        INTER_THREADS = inter_threads
+    if intra_threads is not None:
+        INTRA_THREADS = intra_threads
+    if compute_type is not None:
+        COMPUTE_TYPE = compute_type
+    if beam_size is not None:
+        BEAM_SIZE = beam_size
+
+    if loaded != (INTER_THREADS, INTRA_THREADS, COMPUTE_TYPE):
+        unload_models()
+
+    return
+
+
+def get_settings() -> dict:
+    """
+    Return the current CTranslate2 settings.
+
+    Returns:
+        dict: The settings with keys 'inter_threads', 'intra_threads', 'compute_type' and 'beam_size'.
+    """
+    return {
+        'inter_threads': INTER_THREADS,
+        'intra_threads': INTRA_THREADS,
+        'compute_type': COMPUTE_TYPE,
+        'beam_size': BEAM_SIZE
+    }
+
+
+def preload(src: str, dest: str) -> None:
+    """
+    Load the translation object and its CTranslate2 model ahead of the first translation, e.g. at server start.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+    """
+    ensure_valid(src, dest)
+    get_translator(src, dest)
+
+    return
+
+
+def unload_models() -> None:
+    """
+    Release the CTranslate2 models of the resident translation objects and drop the objects.
+    """
+    with TRANSLATOR_LOCK:
+        for translation in TRANSLATORS.values():
+            for package_translation in package_translations(translation):
+                package_translation.translator = None
+
+    clear_translators()
+
+    return
+
+
+def clear_translators() -> None:
+    """
+    Drop the resident translation objects, e.g. after installing packages.
+    """
+    with TRANSLATOR_LOCK:
+        TRANSLATORS.clear()
+
+    return
+
+
 def text_translate(text: str, dest: str, src: str, detail: bool= False) -> str:
     """
     Translate a given text from the source language to the destination language.
@@ -95,14 +361,204 @@ def text_translate(text: str, dest: str, src: str, detail: bool= False) -> str:
     Raises:
         Exception: If an error occurs during the translation process.
     """
-    global VALID_CHECK
+    ensure_valid(src, dest)
 
-    if not VALID_CHECK:
-        valid_check()
-    
-    trans_text = argostranslate.translate.translate(text, src, dest)
+    # Reuse a stored translation if a translation memory is set
+    memory = translation_memory.get_default()
+    trans_text = None
+    if memory is not None:
+        trans_text = memory.get('argos', memory_model(src, dest, batch=False), src, dest, text)
+
+    if trans_text is None:
+        trans_text = get_translator(src, dest).translate(text)
+
+        if memory is not None:
+            memory.put('argos', memory_model(src, dest, batch=False), src, dest, text, trans_text)
     
     if detail:
         return (trans_text, text, dest, src, None, None)
     
-    return trans_text
\ No newline at end of file
+    return trans_text
+
+
+def model_version(src: str, dest: str) -> str:
+    """
+    Return the version of the installed package translating between two languages, used in translation memory keys.
+
+    The version is read from the resident translation object on every call, so packages updated while the server runs
+    are picked up once the translators are cleared or reloaded.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+
+    Returns:
+        str: The package codes and version, or 'pivot' if the languages are only connected through a pivot language.
+    """
+    translation = get_package_translation(src, dest)
+    if translation is None:
+        return 'pivot'
+
+    pkg = translation.pkg
+
+    return f"{pkg.from_code}-{pkg.to_code}-{getattr(pkg, 'package_version', 'unknown')}"
+
+
+def memory_model(src: str, dest: str, batch: bool= True) -> str:
+    """
+    Return the model name stored in translation memory keys, the package version plus any non-default setting changing the output.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+        batch (bool, optional): True for batch translation, which uses the configured beam size. Defaults to True.
+
+    Returns:
+        str: The model name.
+    """
+    model = model_version(src, dest)
+
+    if COMPUTE_TYPE != "default":
+        model += f"/{COMPUTE_TYPE}"
+    if batch and BEAM_SIZE != 4:
+        model += f"/beam{BEAM_SIZE}"
+
+    return model
+
+
+def get_package_translation(src: str, dest: str):
+    """
+    Return the installed package translation between two languages, without the argos cache wrapper.
+
+    Args:
+        src (str): The source language code.
+        dest (str): The destination language code.
+
+    Returns:
+        PackageTranslation: The translation object, or None if the languages are only connected 
+        through a pivot language or the package has no tokenizer (older argostranslate versions).
+    """
+    translation = get_translator(src, dest)
+
+    while hasattr(translation, 'underlying'):
+        translation = translation.underlying
+
+    if not hasattr(translation, 'pkg') or getattr(translation.pkg, 'tokenizer', None) is None:
+        return None
+
+    return translation
+
+
+def text_translate_batch(texts: list, dest: str, src: str) -> list:
+    """
+    Translate several texts with one CTranslate2 batch call.
+
+    Every text is split into paragraphs at line breaks and into sentences by the package's own sentencizer, 
+    as `text_translate` does, all sentences are tokenized with the package tokenizer
+    and translated together by the package's CTranslate2 translator, then the sentences are joined back per paragraph and text.  
+    Older argostranslate versions without a sentencizer split sentences at '.', '!' and '?'.  
+    If the batch path is not available for the language pair, each text is translated separately.  
+    If a translation memory is set, only texts without a stored translation are translated.
+
+    Args:
+        texts (list): The texts to be translated.
+        dest (str): The destination language code.
+        src (str): The source language code.
+
+    Returns:
+        list: The translated texts, in the order of the input texts.
+
+    Raises:
+        Exception: If an error occurs during the translation process.
+    """
+    ensure_valid(src, dest)
+
+    memory = translation_memory.get_default()
+    if memory is None:
+        return package_translate_batch(texts, dest, src)
+
+    model = memory_model(src, dest)
+    translated = [memory.get('argos', model, src, dest, text) for text in texts]
+    missing = [i for i, text in enumerate(translated) if text is None]
+
+    if missing:
+        missing_translated = package_translate_batch([texts[i] for i in missing], dest, src)
+
+        for i, translated_text in zip(missing, missing_translated):
+            translated[i] = translated_text
+            memory.put('argos', model, src, dest, texts[i], translated_text)
+
+    return translated
+
+
+def package_translate_batch(texts: list, dest: str, src: str) -> list:
+    """
+    Translate several texts with one CTranslate2 batch call, without the translation memory.
+
+    Args:
+        texts (list): The texts to be translated.
+        dest (str): The destination language code.
+        src (str): The source language code.
+
+    Returns:
+        list: The translated texts, in the order of the input texts.
+    """
+    translation = get_package_translation(src, dest)
+    if translation is None:
+        translation = get_translator(src, dest)
+        return [translation.translate(text) for text in texts]
+
+    pkg = translation.pkg
+    if translation.translator is None:
+        load_models(translation)
+
+    sentencizer = getattr(translation, 'sentencizer', None)
+    if sentencizer is not None:
+        split_sentences = sentencizer.split_sentences
+    else:
+        split_sentences = lambda paragraph: [sentence for sentence in SENTENCE_PATTERN.split(paragraph.strip()) if sentence]
+
+    # Sentences of every paragraph of every text, remembering which paragraph they belong to
+    paragraphs = []
+    sentences = []
+    owners = []
+    for index, text in enumerate(texts):
+        for paragraph in text.split('\n'):
+            for sentence in split_sentences(paragraph):
+                sentences.append(sentence)
+                owners.append(len(paragraphs))
+            paragraphs.append(index)
+
+    if not sentences:
+        return ['' for _ in texts]
+
+    tokenized = [pkg.tokenizer.encode(sentence) for sentence in sentences]
+    target_prefix = [[pkg.target_prefix]] * len(tokenized) if pkg.target_prefix != "" else None
+
+    results = translation.translator.translate_batch(
+        tokenized,
+        target_prefix=target_prefix,
+        replace_unknowns=True,
+        max_batch_size=BATCH_SIZE,
+        beam_size=BEAM_SIZE,
+        num_hypotheses=1,
+        length_penalty=0.2
+    )
+
+    # Decode the tokens of each paragraph together and join the paragraphs of a text with line breaks, as argostranslate does
+    tokens = [[] for _ in paragraphs]
+    for owner, result in zip(owners, results):
+        tokens[owner] += result.hypotheses[0]
+
+    translated = [[] for _ in texts]
+    for index, paragraph_tokens in zip(paragraphs, tokens):
+        value = pkg.tokenizer.decode(paragraph_tokens) if paragraph_tokens else ''
+
+        if pkg.target_prefix != "" and value.startswith(pkg.target_prefix):
+            value = value[len(pkg.target_prefix):]
+        if value.startswith(' '):
+            value = value[1:]
+
+        translated[index].append(value)
+
+    return ['\n'.join(values).lstrip('\n') for values in translated]
@@ -0,0 +1,166 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+
+"""
+In-memory cache of the colors found in text regions.
+Comics, slides and screenshots repeat the same background and font colors in many boxes,
+so regions are keyed by a cheap color signature and the colors of a matching region are reused
+instead of clustering its pixels again.
+"""
+
+
+def roi_fingerprint(roi: np.ndarray, \
+                    bits: int = 4, \
+                    step: int = 2, \
+                    min_share: float = 0.02, \
+                    min_distance: float = 32.0, \
+                    top: int = 3, \
+                    share_step: float = 0.1) -> tuple:
+    """
+    Build a color signature of a region from a coarse histogram of a pixel subsample.
+
+    Every `step`-th pixel in both directions is quantized to `bits` bits per channel.
+    The signature lists the most populated bins holding at least `min_share` of the pixels, 
+    skipping bins closer than `min_distance` to a listed bin so anti-aliased shades do not push the text color out, 
+    ordered from the most populated one and paired with their shares rounded to `share_step`.
+    Regions with the same background and text colors share a signature even if the text differs,
+    while regions mixing the same colors in clearly different proportions do not.
+    Colors within one bin are treated as equal, so cached colors may differ from a fresh estimate
+    by up to the bin width (16 levels for 4 bits).
+
+    Args:
+        roi (np.ndarray): The region of interest.
+        bits (int, optional): Bits per channel of the histogram. Defaults to 4.
+        step (int, optional): Pixel subsampling step. Defaults to 2.
+        min_share (float, optional): Minimum share of the pixels for a bin to be part of the signature. Defaults to 0.02.
+        min_distance (float, optional): Minimum distance between the colors of the listed bins. Defaults to 32.0.
+        top (int, optional): Maximum number of bins in the signature. Defaults to 3.
+        share_step (float, optional): Rounding step of the pixel shares. Defaults to 0.1.
+
+    Returns:
+        tuple: The signature as a tuple of (bin index, rounded share) pairs.
+    """
+    pixels = roi[::step, ::step].reshape(-1, 3)
+    if len(pixels) == 0:
+        return ()
+
+    quantized = pixels.astype(np.int32) >> (8 - bits)
+    bins = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+    counts = np.bincount(bins, minlength=1 << (3 * bits))
+
+    mask = (1 << bits) - 1
+    signature = []
+    colors = []
+    for index in np.argsort(counts, kind='stable')[::-1].tolist():
+        if counts[index] < min_share * len(pixels) or len(signature) == top:
+            break
+
+        color = np.array([index >> (2 * bits), (index >> bits) & mask, index & mask]) << (8 - bits)
+        if all(np.abs(color - other).sum() >= min_distance for other in colors):
+            colors.append(color)
+            signature.append((index, int(round(counts[index] / len(pixels) / share_step))))
+
+    return tuple(signature)
+
+
+class ColorCache:
+    """
+    A bounded, thread-safe LRU cache of region colors.
+
+    Keys are built by the caller from the color settings and `roi_fingerprint`,
+    values are (background color, font color) pairs.
+
+    Attributes:
+        max_entries_ (int): Maximum number of cached entries.
+        entries_ (OrderedDict): Cached colors, from least to most recently used.
+        hits_ (int): Number of lookups answered from the cache.
+        misses_ (int): Number of lookups not found in the cache.
+        lock_ (threading.Lock): Lock serializing access to the entries.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached entries. Defaults to 4096.
+        """
+        self.max_entries_ = max_entries
+        self.entries_ = OrderedDict()
+        self.hits_ = 0
+        self.misses_ = 0
+        self.lock_ = threading.Lock()
+
+        return
+
+
+    def get(self, key: tuple) -> tuple:
+        """
+        Look up the colors of a region and mark them as recently used.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            tuple: The cached (background color, font color) pair, or None if the key is not cached.
+        """
+        with self.lock_:
+            colors = self.entries_.get(key)
+
+            if colors is None:
+                self.misses_ += 1
+                return None
+
+            self.entries_.move_to_end(key)
+            self.hits_ += 1
+
+        return colors
+
+
+    def put(self, key: tuple, colors: tuple) -> None:
+        """
+        Store the colors of a region and evict the least recently used entries beyond the size limit.
+
+        Args:
+            key (tuple): The cache key.
+            colors (tuple): The (background color, font color) pair.
+        """
+        with self.lock_:
+            self.entries_[key] = colors
+            self.entries_.move_to_end(key)
+
+            while len(self.entries_) > self.max_entries_:
+                self.entries_.popitem(last=False)
+
+        return
+
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The counters with keys 'hits', 'misses', 'hit_rate' and 'entries'.
+        """
+        with self.lock_:
+            lookups = self.hits_ + self.misses_
+
+            return {
+                'hits': self.hits_,
+                'misses': self.misses_,
+                'hit_rate': self.hits_ / lookups if lookups else 0.0,
+                'entries': len(self.entries_)
+            }
+
+
+    def clear(self) -> None:
+        """
+        Remove every entry and reset the counters.
+        """
+        with self.lock_:
+            self.entries_.clear()
+            self.hits_ = 0
+            self.misses_ = 0
+
+        return
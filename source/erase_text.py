@@ -1,11 +1,43 @@
+import cv2
 import numpy as np
 from sklearn.cluster import KMeans
+from concurrent.futures import ThreadPoolExecutor
+
+import text_region
 
 """
 Estimate colors in a specific region of an image using K-means clustering.
 This is used to determine the background and character colors.
+Besides the sklearn KMeans reference, faster estimators are available:
+a quantized color histogram, OpenCV k-means on a bounded pixel sample, and a shortcut for solid regions.
+The old text is erased by filling the line boxes with their background colors,
+or by inpainting the text pixels inside the boxes for textured backgrounds.
 """
 
+# Color estimators accepted by `make_cluster`
+CLUSTER_METHODS = ['kmeans', 'cv2', 'histogram']
+
+# Text erasers accepted by `erase_boxes`
+ERASE_METHODS = ['fill', 'inpaint']
+
+
+class ColorClusters:
+    """
+    Result of a color estimator with the same attributes as a fitted sklearn KMeans model,
+    so it can be passed to `find_dominant_color`.
+
+    Attributes:
+        labels_ (np.ndarray): Cluster index of each (sampled) pixel.
+        cluster_centers_ (np.ndarray): Color of each cluster.
+    """
+
+    def __init__(self, labels: np.ndarray, centers: np.ndarray) -> None:
+        self.labels_ = labels
+        self.cluster_centers_ = centers
+
+        return
+
+
 def find_roi(image: np.ndarray, x: int, y: int, w: int, h: int) -> np.ndarray:
     """
     Extract a region of interest (ROI) from the image based on coordinates.
@@ -40,28 +72,281 @@ def find_roi(image: np.ndarray, x: int, y: int, w: int, h: int) -> np.ndarray:
     return image[y:y+h, x:x+w]
 
 
-def make_cluster(roi: np.ndarray, cluster_number: int = 5) -> KMeans:
+def make_cluster(roi: np.ndarray, \
+                 cluster_number: int = 5, \
+                 method: str = 'kmeans', \
+                 max_samples: int = 4096, \
+                 solid_threshold: float = 4.0):
     """
     Perform K-means clustering on the ROI to group similar colors.
 
     The ROI is reshaped into a 2D array where each row represents a pixel's RGB values.
-    A higher number of clusters may yield more accurate color estimates at the cost of increased runtime.
+    A higher number of clusters may yield more accurate color estimates at the cost of increased runtime.  
+    Every estimator is seeded, so the same ROI always yields the same colors.  
+    With the fast estimators, clustering is skipped for an ROI whose color hardly varies and the mean color is returned as the only cluster.  
+    The 'kmeans' reference always clusters.
 
     Args:
         roi (np.ndarray): The region of interest.
         cluster_number (int, optional): The number of clusters for K-means. Defaults to 5.
+        method (str, optional): The color estimator, 'kmeans' (sklearn reference), 'cv2' (OpenCV k-means on a pixel sample)
+            or 'histogram' (quantized color histogram). Defaults to 'kmeans'.
+        max_samples (int, optional): Maximum number of pixels clustered by the 'cv2' estimator. Defaults to 4096.
+        solid_threshold (float, optional): Standard deviation of every channel below which the ROI counts as a solid color
+            for the 'cv2' and 'histogram' estimators, None always clusters. Defaults to 4.0.
 
     Returns:
-        KMeans: The fitted sklearn KMeans clustering model.
+        KMeans or ColorClusters: The fitted clustering model, with `labels_` and `cluster_centers_`.
+
+    Raises:
+        ValueError: If the method is unknown.
     """
     # Reshape the ROI to a 2D array (each pixel is a row with 3 color channels).
     roi_reshape = roi.reshape((roi.shape[0] * roi.shape[1], 3))
-    cluster = KMeans(n_clusters=cluster_number, n_init=10).fit(roi_reshape)
+
+    if method != 'kmeans' and solid_threshold is not None and roi_reshape.std(axis=0).max() < solid_threshold:
+        return ColorClusters(np.zeros(len(roi_reshape), dtype=np.int32), roi_reshape.mean(axis=0, keepdims=True))
+
+    if method == 'kmeans':
+        cluster = KMeans(n_clusters=cluster_number, n_init=10, random_state=0).fit(roi_reshape)
+    elif method == 'cv2':
+        cluster = cv2_cluster(roi_reshape, cluster_number, max_samples)
+    elif method == 'histogram':
+        cluster = histogram_cluster(roi_reshape, cluster_number)
+    else:
+        raise ValueError(f"Unknown color estimator: {method}")
 
     return cluster
 
 
-def find_dominant_color(cluster: KMeans, \
+def cv2_cluster(pixels: np.ndarray, cluster_number: int = 5, max_samples: int = 4096) -> ColorClusters:
+    """
+    Cluster pixel colors with OpenCV k-means on a bounded random sample of the pixels.
+
+    The sample is drawn with a fixed seed, so the result is deterministic.
+
+    Args:
+        pixels (np.ndarray): Pixel colors as an array of shape (N, 3).
+        cluster_number (int, optional): The number of clusters. Defaults to 5.
+        max_samples (int, optional): Maximum number of pixels to cluster. Defaults to 4096.
+
+    Returns:
+        ColorClusters: Labels of the sampled pixels and the cluster centers.
+    """
+    if len(pixels) > max_samples:
+        pixels = pixels[np.random.default_rng(0).choice(len(pixels), max_samples, replace=False)]
+
+    samples = np.float32(pixels)
+    cluster_number = min(cluster_number, len(samples))
+
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 1.0)
+    cv2.setRNGSeed(0)
+    _, labels, centers = cv2.kmeans(samples, cluster_number, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
+
+    return ColorClusters(labels.ravel(), centers)
+
+
+def histogram_cluster(pixels: np.ndarray, \
+                      cluster_number: int = 5, \
+                      bits: int = 4, \
+                      min_distance: float = 32.0) -> ColorClusters:
+    """
+    Cluster pixel colors with a quantized color histogram.
+
+    Every channel is quantized to `bits` bits and the most populated bins are used as seeds,
+    skipping bins closer than `min_distance` to an already chosen seed so anti-aliased shades of one color
+    do not take several clusters. Each occupied bin is assigned to the nearest seed, so the pixels are labeled
+    through a lookup table, and the cluster centers are the mean colors of their pixels.
+
+    Args:
+        pixels (np.ndarray): Pixel colors as an array of shape (N, 3).
+        cluster_number (int, optional): The maximum number of clusters. Defaults to 5.
+        bits (int, optional): Bits per channel of the quantized histogram. Defaults to 4.
+        min_distance (float, optional): Minimum distance between seed colors. Defaults to 32.0.
+
+    Returns:
+        ColorClusters: Labels of the pixels and the cluster centers.
+    """
+    shift = 8 - bits
+    quantized = pixels.astype(np.int32) >> shift
+    bins = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+    counts = np.bincount(bins, minlength=1 << (3 * bits))
+
+    # Pick the most populated bins that are far enough from each other
+    mask = (1 << bits) - 1
+    seeds = []
+    for index in np.argsort(counts)[::-1]:
+        if counts[index] == 0 or len(seeds) == cluster_number:
+            break
+
+        color = (np.array([index >> (2 * bits), (index >> bits) & mask, index & mask]) + 0.5) * (1 << shift)
+        if all(np.linalg.norm(color - seed) >= min_distance for seed in seeds):
+            seeds.append(color)
+
+    seeds = np.array(seeds)
+
+    # Mean color of the pixels in each occupied bin
+    occupied = np.flatnonzero(counts)
+    bin_colors = np.stack([np.bincount(bins, weights=pixels[:, c], minlength=len(counts))[occupied] for c in range(3)], axis=1)
+    bin_colors /= counts[occupied][:, None]
+
+    # Assign each occupied bin to the nearest seed, then label the pixels through the bins
+    bin_labels = ((bin_colors[:, None, :] - seeds[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    lookup = np.zeros(len(counts), dtype=np.int64)
+    lookup[occupied] = bin_labels
+    labels = lookup[bins]
+
+    # Move the centers to the mean color of their pixels
+    weights = counts[occupied]
+    sizes = np.bincount(bin_labels, weights=weights, minlength=len(seeds))
+    centers = np.stack([np.bincount(bin_labels, weights=bin_colors[:, c] * weights, minlength=len(seeds)) for c in range(3)], axis=1)
+    centers = np.where(sizes[:, None] > 0, centers / np.maximum(sizes, 1)[:, None], seeds)
+
+    return ColorClusters(labels, centers)
+
+
+def batch_colors(image: np.ndarray, \
+                 rects: list, \
+                 margin: int = 5, \
+                 bits: int = 4, \
+                 min_distance: float = 32.0, \
+                 chunk_size: int = 256, \
+                 workers: int = 1) -> tuple:
+    """
+    Estimate the background and font colors of many regions in a single pass.
+
+    The pixels of all regions are gathered with vectorized indexing into one buffer
+    and quantized into a color histogram per region, as in `histogram_cluster`.
+    The most populated bin of a region is the background seed, and the most populated bin
+    at least `min_distance` away from it is the font seed. Each color is the mean of the pixels
+    within `min_distance` of its seed and closer to it than to the other seed.
+    A region without a second color, such as a solid area, gets the background color as font color.  
+    The regions are split into equal chunks of at most `chunk_size` regions to bound the size of the histograms, 
+    and into at least `workers` chunks, which run on a thread pool if `workers` is greater than 1.
+
+    Args:
+        image (np.ndarray): The full image array.
+        rects (list): Regions as tuples (x, y, width, height).
+        margin (int, optional): Margin added around each region, like `find_roi`. Defaults to 5.
+        bits (int, optional): Bits per channel of the quantized histogram. Defaults to 4.
+        min_distance (float, optional): Minimum distance between the background and font colors. Defaults to 32.0.
+        chunk_size (int, optional): Maximum number of regions per histogram pass. Defaults to 256.
+        workers (int, optional): Number of threads processing chunks concurrently. Defaults to 1.
+
+    Returns:
+        tuple: The background colors and the font colors of the regions as two lists of color tuples.
+    """
+    background_color, font_color = [], []
+    if len(rects) == 0:
+        return background_color, font_color
+
+    image_height, image_width = image.shape[:2]
+    flat_image = image.reshape(-1, 3)
+    rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+
+    x0 = np.clip(rects[:, 0] - margin, 0, image_width - 1)
+    y0 = np.clip(rects[:, 1] - margin, 0, image_height - 1)
+    x1 = np.clip(rects[:, 0] + rects[:, 2] + margin, x0 + 1, image_width)
+    y1 = np.clip(rects[:, 1] + rects[:, 3] + margin, y0 + 1, image_height)
+
+    def process_chunk(bounds):
+        start, end = bounds
+        widths = x1[start:end] - x0[start:end]
+        heights = y1[start:end] - y0[start:end]
+
+        # Flat index of the first pixel of every row of every region, then of every pixel
+        row_segment = np.repeat(np.arange(end - start), heights)
+        row_offset = np.arange(len(row_segment)) - np.repeat(np.cumsum(heights) - heights, heights)
+        row_start = (y0[start:end][row_segment] + row_offset) * image_width + x0[start:end][row_segment]
+        row_width = widths[row_segment]
+
+        segment = np.repeat(row_segment, row_width)
+        index = np.repeat(row_start - (np.cumsum(row_width) - row_width), row_width) + np.arange(len(segment))
+        pixels = flat_image[index]
+
+        return histogram_colors(pixels, segment, end - start, bits, min_distance)
+
+    # Every worker gets a chunk even on a page with fewer regions than `chunk_size`
+    chunk_count = min(len(rects), max(-(-len(rects) // chunk_size), workers))
+    edges = np.linspace(0, len(rects), chunk_count + 1).astype(np.int64).tolist()
+    chunks = list(zip(edges[:-1], edges[1:]))
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process_chunk, chunks))
+    else:
+        results = [process_chunk(chunk) for chunk in chunks]
+
+    for background, font in results:
+        background_color.extend(tuple(color) for color in background.astype("uint8").tolist())
+        font_color.extend(tuple(color) for color in font.astype("uint8").tolist())
+
+    return background_color, font_color
+
+
+def histogram_colors(pixels: np.ndarray, \
+                     segment: np.ndarray, \
+                     count: int, \
+                     bits: int = 4, \
+                     min_distance: float = 32.0) -> tuple:
+    """
+    Find the background and font colors of several pixel groups from one combined color histogram.
+
+    Args:
+        pixels (np.ndarray): Pixel colors as an array of shape (N, 3).
+        segment (np.ndarray): Group index of each pixel, in the range [0, count).
+        count (int): The number of groups, every group must have at least one pixel.
+        bits (int, optional): Bits per channel of the quantized histogram. Defaults to 4.
+        min_distance (float, optional): Minimum distance between the background and font colors. Defaults to 32.0.
+
+    Returns:
+        tuple: The background colors and the font colors as two arrays of shape (count, 3).
+    """
+    # Color histogram of every group, one entry per occupied (group, bin) pair
+    shift = 8 - bits
+    quantized = pixels >> shift
+    keys = (segment << (3 * bits)) | (quantized[:, 0].astype(np.int64) << (2 * bits)) | (quantized[:, 1].astype(np.int64) << bits) | quantized[:, 2]
+
+    length = count << (3 * bits)
+    all_counts = np.bincount(keys, minlength=length)
+    occupied = np.flatnonzero(all_counts)
+    counts = all_counts[occupied]
+    key_segment = occupied >> (3 * bits)
+    bin_colors = np.stack([np.bincount(keys, weights=pixels[:, c], minlength=length)[occupied] for c in range(3)], axis=1)
+    bin_colors /= counts[:, None]
+
+    # Bins sorted by group, most populated first
+    order = np.lexsort((-counts, key_segment))
+    sorted_segment = key_segment[order]
+    first = np.r_[True, sorted_segment[1:] != sorted_segment[:-1]]
+    background_bin = order[first]
+
+    # The most populated bin far enough from the background is the font seed
+    background_distance = np.linalg.norm(bin_colors - bin_colors[background_bin][key_segment], axis=1)
+    candidates = order[background_distance[order] >= min_distance]
+    candidate_segment = key_segment[candidates]
+    candidate_first = np.r_[True, candidate_segment[1:] != candidate_segment[:-1]] if len(candidates) else np.zeros(0, dtype=bool)
+    font_bin = background_bin.copy()
+    font_bin[candidate_segment[candidate_first]] = candidates[candidate_first]
+
+    # Average the bins around each seed
+    font_distance = np.linalg.norm(bin_colors - bin_colors[font_bin][key_segment], axis=1)
+    near_background = (background_distance < min_distance) & (background_distance <= font_distance)
+    near_font = (font_distance < min_distance) & (font_distance < background_distance)
+
+    def seed_mean(near, seed_bin):
+        weights = counts[near]
+        total = np.bincount(key_segment[near], weights=weights, minlength=count)
+        sums = np.stack([np.bincount(key_segment[near], weights=bin_colors[near, c] * weights, minlength=count) for c in range(3)], axis=1)
+        return np.where(total[:, None] > 0, sums / np.maximum(total, 1)[:, None], bin_colors[seed_bin])
+
+    background_color = seed_mean(near_background, background_bin)
+    font_color = np.where((font_bin == background_bin)[:, None], background_color, seed_mean(near_font, font_bin))
+
+    return background_color, font_color
+
+
+def find_dominant_color(cluster, \
                         centroids: np.ndarray = None, \
                         order: int = 0) -> list:
     """
@@ -71,10 +356,11 @@ def find_dominant_color(cluster: KMeans, \
     Typically, the most prevalent color (order 0) is assumed to be the background,
     while the second most prevalent (order 1) might represent the text color.
 
-    Note that in some cases, such as with thick fonts, these roles may be reversed.
+    Note that in some cases, such as with thick fonts, these roles may be reversed.  
+    Empty clusters are ignored, and if there are fewer colors than `order + 1` the least prevalent color is returned.
 
     Args:
-        cluster (KMeans): The fitted KMeans clustering model.
+        cluster (KMeans or ColorClusters): The fitted clustering model.
         centroids (np.ndarray, optional): Array of cluster centers. Defaults to the model's centers.
         order (int, optional): The order of the color to return (0 for the most dominant). Defaults to 0.
 
@@ -85,18 +371,17 @@ def find_dominant_color(cluster: KMeans, \
         centroids = cluster.cluster_centers_
 
     # Create a histogram of cluster labels.
-    bins = np.arange(0, len(np.unique(cluster.labels_)) + 1)
-    (hist, _) = np.histogram(cluster.labels_, bins = bins)
+    hist = np.bincount(np.asarray(cluster.labels_).ravel(), minlength=len(centroids))
     hist = hist.astype("float")
     hist /= hist.sum()
 
     # Pair each centroid with its normalized percentage and sort in descending order.
-    colors = sorted([(percent, color) for (percent, color) in zip(hist, centroids)], \
+    colors = sorted([(percent, color) for (percent, color) in zip(hist, centroids) if percent > 0], \
                     key=lambda x: x[0], \
                     reverse=True)
     
     # Select the color based on the specified order.
-    per, first_color = colors[order]
+    per, first_color = colors[min(order, len(colors) - 1)]
 
     return first_color.astype("uint8").tolist()
 
@@ -126,4 +411,190 @@ def correction_color(color: tuple, \
         # Decrease brightness, ensuring the value does not go below 0.
         modified_color = tuple(max(c - value, 0) for c in color)
 
-    return modified_color
\ No newline at end of file
+    return modified_color
+
+
+def box_bounds(image_shape: tuple, rects: list) -> np.ndarray:
+    """
+    Clip boxes to the image as (x0, y0, x1, y1) with exclusive ends.
+
+    A box (x, y, width, height) covers the pixels x..x+width and y..y+height inclusive, 
+    the same area as a filled PIL rectangle [(x, y), (x + width, y + height)].
+
+    Args:
+        image_shape (tuple): Shape of the image array.
+        rects (list): Boxes as tuples (x, y, width, height).
+
+    Returns:
+        np.ndarray: The clipped boxes, one row per box.
+    """
+    image_height, image_width = image_shape[:2]
+    rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+
+    x0 = np.clip(rects[:, 0], 0, image_width)
+    y0 = np.clip(rects[:, 1], 0, image_height)
+    x1 = np.clip(rects[:, 0] + rects[:, 2] + 1, x0, image_width)
+    y1 = np.clip(rects[:, 1] + rects[:, 3] + 1, y0, image_height)
+
+    return np.stack([x0, y0, x1, y1], axis=1)
+
+
+def group_boxes(bounds: np.ndarray) -> list:
+    """
+    Group the boxes by the merged rectangles of `text_region.merge_rects`.
+
+    Boxes of different groups neither overlap nor touch, so every group can be handled on its own
+    over its merged rectangle, and the memory follows the text area instead of the bounding rectangle of all boxes.
+
+    Args:
+        bounds (np.ndarray): Boxes from `box_bounds()`.
+
+    Returns:
+        list: The boxes of each group as (rect, indices), with the merged rectangle as (x0, y0, x1, y1) with exclusive ends
+            and the indices of its boxes in `bounds` in their original order.
+    """
+    merged = text_region.merge_rects([(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in bounds.tolist()])
+
+    groups = []
+    for x, y, w, h in merged:
+        indices = np.flatnonzero((bounds[:, 0] >= x) & (bounds[:, 1] >= y) & (bounds[:, 2] <= x + w) & (bounds[:, 3] <= y + h))
+        groups.append(((x, y, x + w, y + h), indices))
+
+    return groups
+
+
+def label_mask(bounds: np.ndarray) -> tuple:
+    """
+    Build one label mask for a set of boxes over their common bounding rectangle.
+
+    Every pixel holds the number of the last box covering it, starting at 1, or 0 outside all boxes, 
+    so overlapping boxes behave as if they were filled one after another.
+
+    Args:
+        bounds (np.ndarray): Boxes from `box_bounds()`.
+
+    Returns:
+        tuple: The mask and the position of its top-left corner in the image as (labels, (x, y)).
+    """
+    left, top = int(bounds[:, 0].min()), int(bounds[:, 1].min())
+    right, bottom = int(bounds[:, 2].max()), int(bounds[:, 3].max())
+
+    dtype = np.uint16 if len(bounds) < np.iinfo(np.uint16).max else np.int32
+    labels = np.zeros((max(0, bottom - top), max(0, right - left)), dtype=dtype)
+
+    for label, (x0, y0, x1, y1) in enumerate(bounds.tolist(), start=1):
+        labels[y0 - top:y1 - top, x0 - left:x1 - left] = label
+
+    return labels, (left, top)
+
+
+def fill_boxes(image: np.ndarray, rects: list, colors: list) -> None:
+    """
+    Fill every box with its color in place.
+
+    The boxes are filled one after another through array slices, so later boxes cover earlier ones 
+    and no memory beyond the image is used.
+
+    Args:
+        image (np.ndarray): The image array, modified in place.
+        rects (list): Boxes as tuples (x, y, width, height).
+        colors (list): Fill color of each box.
+    """
+    bounds = box_bounds(image.shape, rects)
+    if len(bounds) == 0:
+        return
+
+    palette = np.asarray(colors, dtype=image.dtype).reshape(len(bounds), -1)[:, :image.shape[2]]
+    for (x0, y0, x1, y1), color in zip(bounds.tolist(), palette):
+        image[y0:y1, x0:x1] = color
+
+    return
+
+
+def inpaint_boxes(image: np.ndarray, \
+                  rects: list, \
+                  colors: list, \
+                  threshold: float = 48.0, \
+                  radius: int = 3) -> None:
+    """
+    Remove the text inside the boxes in place by inpainting, keeping the texture of the background.
+
+    The inpainting mask holds the pixels of a box farther than `threshold` from its background color, 
+    grown by one pixel to cover the anti-aliased edges of the glyphs.  
+    Overlapping boxes are merged, the mask is built for each merged rectangle on its own, 
+    and `cv2.inpaint` runs on each merged rectangle plus `radius` pixels of context, 
+    so the memory and the cost follow the text area instead of the image area.
+
+    Args:
+        image (np.ndarray): The image array, modified in place.
+        rects (list): Boxes as tuples (x, y, width, height).
+        colors (list): Background color of each box.
+        threshold (float, optional): Minimum color distance of a text pixel from the background color. Defaults to 48.0.
+        radius (int, optional): Inpainting radius in pixels. Defaults to 3.
+    """
+    bounds = box_bounds(image.shape, rects)
+    if len(bounds) == 0:
+        return
+
+    image_height, image_width = image.shape[:2]
+    palette = np.asarray(colors, dtype=np.float32).reshape(len(bounds), -1)[:, :image.shape[2]]
+    groups = group_boxes(bounds)
+
+    # Text mask of every merged rectangle, all of them built before any pixel is inpainted
+    masks = []
+    for _, indices in groups:
+        labels, (left, top) = label_mask(bounds[indices])
+        region = image[top:top + labels.shape[0], left:left + labels.shape[1]]
+
+        # Distance of every box pixel from the background color of its box
+        inside = labels > 0
+        distance = np.zeros(labels.shape, dtype=np.float32)
+        distance[inside] = np.abs(region[inside].astype(np.float32) - palette[indices][labels[inside] - 1]).sum(axis=1)
+
+        text = ((distance > threshold) * 255).astype(np.uint8)
+        text = cv2.dilate(text, np.ones((3, 3), dtype=np.uint8))
+        text[~inside] = 0
+        masks.append(text)
+
+    merged = np.array([rect for rect, _ in groups], dtype=np.int64)
+    for x, y, x_end, y_end in merged.tolist():
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        x1, y1 = min(image_width, x_end + radius), min(image_height, y_end + radius)
+
+        # The text of other merged rectangles within the context is inpainted with this one
+        crop_mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        near = np.flatnonzero((merged[:, 0] < x1) & (merged[:, 2] > x0) & (merged[:, 1] < y1) & (merged[:, 3] > y0))
+        for index in near.tolist():
+            left, top, right, bottom = merged[index].tolist()
+            mask_x0, mask_y0, mask_x1, mask_y1 = max(x0, left), max(y0, top), min(x1, right), min(y1, bottom)
+            crop_mask[mask_y0 - y0:mask_y1 - y0, mask_x0 - x0:mask_x1 - x0] = \
+                masks[index][mask_y0 - top:mask_y1 - top, mask_x0 - left:mask_x1 - left]
+
+        if cv2.countNonZero(crop_mask) > 0:
+            image[y0:y1, x0:x1] = cv2.inpaint(image[y0:y1, x0:x1], crop_mask, radius, cv2.INPAINT_TELEA)
+
+    return
+
+
+def erase_boxes(image: np.ndarray, rects: list, colors: list, method: str = 'fill') -> None:
+    """
+    Erase the old text of the boxes in place.
+
+    Args:
+        image (np.ndarray): The image array, modified in place.
+        rects (list): Boxes as tuples (x, y, width, height).
+        colors (list): Background color of each box.
+        method (str, optional): 'fill' to fill each box with its background color, 
+            'inpaint' to inpaint only the text pixels for textured backgrounds. Defaults to 'fill'.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method == 'fill':
+        fill_boxes(image, rects, colors)
+    elif method == 'inpaint':
+        inpaint_boxes(image, rects, colors)
+    else:
+        raise ValueError(f"Unknown erase method: {method}")
+
+    return
\ No newline at end of file
@@ -0,0 +1,217 @@
+from functools import lru_cache
+from PIL import ImageFont
+
+"""
+Process-wide cache of loaded fonts and glyph metrics used for rendering.
+Opening a TrueType collection parses the whole file, so each (font path, face index, pixel size) is loaded once
+and kept in a bounded LRU cache shared by every image.
+Glyph advance widths are cached per font as well, so the width of a text can be measured
+by adding up cached advances instead of rasterizing it.
+"""
+
+# Maximum number of loaded fonts, and of fonts whose glyph advances are kept
+FONT_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: str, index: int, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a font face, cached by (font path, face index, pixel size).
+
+    Args:
+        path (str): Path to the TrueType or OpenType font file.
+        index (int): Face index inside a font collection.
+        size (int): Font size in pixels.
+
+    Returns:
+        ImageFont.FreeTypeFont: The loaded font.
+    """
+    return ImageFont.truetype(path, size, index=index)
+
+
+def get_font(path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+    """
+    Return a cached font, loading it on first use.
+
+    Args:
+        path (str): Path to the font file.
+        size (int): Font size in pixels.
+        index (int, optional): Face index inside a font collection. Defaults to 0.
+
+    Returns:
+        ImageFont.FreeTypeFont: The font.
+    """
+    return load_font(path, index, max(1, int(size)))
+
+
+class GlyphMetrics:
+    """
+    Advance widths of the glyphs of one font, measured once per character.
+
+    The width of a text is the sum of its glyph advances. Kerning and ligatures are ignored,
+    which matches the basic layout used by PIL for Latin and CJK text to within a pixel or so per line.
+
+    Attributes:
+        font_ (ImageFont.FreeTypeFont): The font being measured.
+        advances_ (dict): Cached advance width of each measured character.
+        ascent_ (int): Distance from the baseline to the top of the highest glyph.
+        descent_ (int): Distance from the baseline to the bottom of the lowest glyph.
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont) -> None:
+        """
+        Initialize the metrics of a font.
+
+        Args:
+            font (ImageFont.FreeTypeFont): The font.
+        """
+        self.font_ = font
+        self.advances_ = {}
+        self.ascent_, self.descent_ = font.getmetrics()
+
+        return
+
+
+    def advance(self, char: str) -> float:
+        """
+        Return the advance width of a character.
+
+        Args:
+            char (str): A single character.
+
+        Returns:
+            float: The advance width in pixels.
+        """
+        width = self.advances_.get(char)
+        if width is None:
+            width = self.font_.getlength(char)
+            self.advances_[char] = width
+
+        return width
+
+
+    def text_width(self, text: str) -> float:
+        """
+        Return the width of a text from the cached glyph advances.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            float: The width in pixels.
+        """
+        advances = self.advances_
+        try:
+            return sum(map(advances.__getitem__, text))
+        except KeyError:
+            for char in set(text).difference(advances):
+                self.advance(char)
+
+        return sum(map(advances.__getitem__, text))
+
+
+    def glyph_advances(self, text: str) -> list:
+        """
+        Return the advance width of every character of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list: The advance widths in pixels.
+        """
+        advances = self.advances_
+        try:
+            return list(map(advances.__getitem__, text))
+        except KeyError:
+            for char in set(text).difference(advances):
+                self.advance(char)
+
+        return list(map(advances.__getitem__, text))
+
+
+    def line_height(self) -> int:
+        """
+        Return the height of one line of text.
+
+        Returns:
+            int: The ascent plus the descent in pixels.
+        """
+        return self.ascent_ + self.descent_
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_metrics(path: str, index: int, size: int) -> GlyphMetrics:
+    """
+    Create the glyph metrics of a font, cached by (font path, face index, pixel size).
+
+    Args:
+        path (str): Path to the font file.
+        index (int): Face index inside a font collection.
+        size (int): Font size in pixels.
+
+    Returns:
+        GlyphMetrics: The glyph metrics.
+    """
+    return GlyphMetrics(load_font(path, index, size))
+
+
+def get_metrics(path: str, size: int, index: int = 0) -> GlyphMetrics:
+    """
+    Return the cached glyph metrics of a font.
+
+    Args:
+        path (str): Path to the font file.
+        size (int): Font size in pixels.
+        index (int, optional): Face index inside a font collection. Defaults to 0.
+
+    Returns:
+        GlyphMetrics: The glyph metrics.
+    """
+    return load_metrics(path, index, max(1, int(size)))
+
+
+def text_width(text: str, path: str, size: int, index: int = 0) -> float:
+    """
+    Measure the width of a text without rasterizing it.
+
+    Args:
+        text (str): The text.
+        path (str): Path to the font file.
+        size (int): Font size in pixels.
+        index (int, optional): Face index inside a font collection. Defaults to 0.
+
+    Returns:
+        float: The width in pixels.
+    """
+    return get_metrics(path, size, index).text_width(text)
+
+
+def stats() -> dict:
+    """
+    Return the cache counters.
+
+    Returns:
+        dict: The counters with keys 'font_hits', 'font_misses', 'fonts', 'metric_hits', 'metric_misses' and 'metrics'.
+    """
+    fonts = load_font.cache_info()
+    metrics = load_metrics.cache_info()
+
+    return {
+        'font_hits': fonts.hits,
+        'font_misses': fonts.misses,
+        'fonts': fonts.currsize,
+        'metric_hits': metrics.hits,
+        'metric_misses': metrics.misses,
+        'metrics': metrics.currsize
+    }
+
+
+def clear() -> None:
+    """
+    Drop every cached font and glyph metric.
+    """
+    load_metrics.cache_clear()
+    load_font.cache_clear()
+
+    return
\ No newline at end of file
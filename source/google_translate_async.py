@@ -0,0 +1,306 @@
+import asyncio
+import threading
+import httpx
+
+import translation_memory
+
+"""
+Asynchronous Google translation backend.
+One pooled HTTP client is kept on a background event loop and shared by every call,
+so connections are reused and a batch of texts is translated with concurrent requests,
+bounded by a semaphore. The endpoint returns the detected source language with the translation,
+so no separate detection request is needed when the source language is unknown.
+Internet connection required, or a local server imitating the endpoint for tests.
+"""
+
+# Endpoint of the Google translate web client
+DEFAULT_URL = "https://translate.googleapis.com/translate_a/single"
+
+# Model name stored in translation memory keys
+MODEL = 'google-gtx'
+
+# Translator shared by the module functions, created on first use
+DEFAULT_TRANSLATOR = None
+DEFAULT_LOCK = threading.Lock()
+
+
+def pool_options(max_connections: int) -> dict:
+    """
+    Return the connection pool arguments of `httpx.AsyncClient` for the installed httpx version.
+
+    httpx 0.13, which googletrans pins, calls the pool settings `PoolLimits`, later versions `Limits`.
+
+    Args:
+        max_connections (int): Maximum number of open connections.
+
+    Returns:
+        dict: Keyword arguments for `httpx.AsyncClient`.
+    """
+    if hasattr(httpx, 'Limits'):
+        return {'limits': httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)}
+
+    return {'pool_limits': httpx.PoolLimits(max_keepalive=max_connections, max_connections=max_connections)}
+
+
+def parse_response(data: list) -> tuple:
+    """
+    Extract the translation and the detected source language from an endpoint response.
+
+    Args:
+        data (list): The decoded JSON response, the translated segments come first and the source language third.
+
+    Returns:
+        tuple: The translated text and the source language code as (text, src).
+    """
+    translated_text = ''.join(segment[0] for segment in data[0] if segment and segment[0])
+
+    return translated_text, data[2]
+
+
+class AsyncTranslator:
+    """
+    Google translation client with one pooled connection set and a concurrency limit.
+
+    The client and the semaphore live on a private event loop running in a daemon thread, 
+    so the synchronous methods can be called from any thread, including the translation worker threads.
+
+    Attributes:
+        url_ (str): URL of the translate endpoint.
+        max_concurrency_ (int): Maximum number of requests in flight.
+        timeout_ (float): Timeout of one request in seconds.
+        retries_ (int): Number of retries of a failed request.
+        loop_ (asyncio.AbstractEventLoop): The event loop running the requests.
+        thread_ (threading.Thread): The thread running the event loop.
+        client_ (httpx.AsyncClient): The pooled HTTP client.
+        semaphore_ (asyncio.Semaphore): Semaphore limiting the requests in flight.
+    """
+
+    def __init__(self, url: str= DEFAULT_URL, \
+                 max_concurrency: int= 16, \
+                 timeout: float= 10.0, \
+                 retries: int= 2) -> None:
+        """
+        Start the event loop thread and open the HTTP client.
+
+        Args:
+            url (str, optional): URL of the translate endpoint. Defaults to `DEFAULT_URL`.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 16.
+            timeout (float, optional): Timeout of one request in seconds. Defaults to 10.0.
+            retries (int, optional): Number of retries of a failed request. Defaults to 2.
+        """
+        self.url_ = url
+        self.max_concurrency_ = max_concurrency
+        self.timeout_ = timeout
+        self.retries_ = retries
+        self.client_ = None
+        self.semaphore_ = None
+
+        self.loop_ = asyncio.new_event_loop()
+        self.thread_ = threading.Thread(target=self.loop_.run_forever, daemon=True)
+        self.thread_.start()
+
+        self.run(self.open())
+
+        return
+
+
+    async def open(self) -> None:
+        """
+        Create the HTTP client and the semaphore on the event loop.
+        """
+        self.client_ = httpx.AsyncClient(timeout=self.timeout_, **pool_options(self.max_concurrency_))
+        self.semaphore_ = asyncio.Semaphore(self.max_concurrency_)
+
+        return
+
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the event loop and wait for its result.
+
+        Args:
+            coroutine (coroutine): The coroutine to run.
+
+        Returns:
+            The result of the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop_).result()
+
+
+    async def translate_one(self, text: str, dest: str, src: str= None) -> tuple:
+        """
+        Translate one text, retrying failed requests.
+
+        Args:
+            text (str): The text to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code, None to detect it. Defaults to None.
+
+        Returns:
+            tuple: The translated text and the source language code as (text, src).
+
+        Raises:
+            Exception: If every attempt fails.
+        """
+        if not text.strip():
+            return text, src
+
+        params = {'client': 'gtx', 'sl': src or 'auto', 'tl': dest, 'dt': 't', 'q': text}
+        error = None
+
+        for attempt in range(self.retries_ + 1):
+            # The request slot is only held during the request, other texts can use it while this one backs off
+            async with self.semaphore_:
+                try:
+                    response = await self.client_.get(self.url_, params=params)
+                    response.raise_for_status()
+                    return parse_response(response.json())
+
+                except (httpx.HTTPError, ValueError, IndexError, TypeError) as e:
+                    error = e
+
+            if attempt < self.retries_:
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+        raise Exception(f"Google translation failed: {error}")
+
+
+    async def translate_many(self, texts: list, dest: str, src: str= None) -> list:
+        """
+        Translate several texts with concurrent requests.
+
+        Args:
+            texts (list): The texts to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code, None to detect it per text. Defaults to None.
+
+        Returns:
+            list: Tuples (text, src) in the order of the input texts.
+        """
+        return await asyncio.gather(*[self.translate_one(text, dest, src) for text in texts])
+
+
+    def translate(self, text: str, dest: str, src: str= None) -> tuple:
+        """
+        Translate one text, blocking until the response arrives.
+
+        Args:
+            text (str): The text to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code, None to detect it. Defaults to None.
+
+        Returns:
+            tuple: The translated text and the source language code as (text, src).
+        """
+        return self.run(self.translate_one(text, dest, src))
+
+
+    def translate_batch(self, texts: list, dest: str, src: str= None) -> list:
+        """
+        Translate several texts concurrently, blocking until every response arrives.
+
+        The time is close to the slowest request instead of the sum of all requests, 
+        as long as the number of texts does not exceed `max_concurrency_`.
+
+        Args:
+            texts (list): The texts to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code, None to detect it per text. Defaults to None.
+
+        Returns:
+            list: The translated texts in the order of the input texts.
+        """
+        return [translated_text for translated_text, _ in self.run(self.translate_many(texts, dest, src))]
+
+
+    def close(self) -> None:
+        """
+        Close the HTTP client and stop the event loop thread.
+        """
+        self.run(self.client_.aclose())
+        self.loop_.call_soon_threadsafe(self.loop_.stop)
+        self.thread_.join()
+
+        return
+
+
+def set_default(translator: AsyncTranslator) -> None:
+    """
+    Set the translator used by `text_translate` and `text_translate_batch`, e.g. one pointing at a local server.
+
+    Args:
+        translator (AsyncTranslator): The translator, or None to create a default one on next use.
+    """
+    global DEFAULT_TRANSLATOR
+
+    DEFAULT_TRANSLATOR = translator
+
+    return
+
+
+def get_default() -> AsyncTranslator:
+    """
+    Return the shared translator, creating one for the public endpoint on first use.
+
+    Returns:
+        AsyncTranslator: The shared translator.
+    """
+    global DEFAULT_TRANSLATOR
+
+    if DEFAULT_TRANSLATOR is None:
+        with DEFAULT_LOCK:
+            if DEFAULT_TRANSLATOR is None:
+                DEFAULT_TRANSLATOR = AsyncTranslator()
+
+    return DEFAULT_TRANSLATOR
+
+
+def text_translate(text: str, dest: str, src: str= None, detail: bool= False) -> str:
+    """
+    Translate a given text from the source language to the destination language.
+
+    Args:
+        text (str): The text to be translated.
+        dest (str): The destination language code.
+        src (str, optional): The source language code, None to detect it. Defaults to None.
+        detail (bool, optional): If True, returns a tuple with detailed translation information. Defaults to False.
+
+    Returns:
+        str/tuple: The translated text if detail is False, otherwise a tuple with detailed translation info.
+    """
+    if detail:
+        trans_text, detected = get_default().translate(text, dest, src)
+        return (trans_text, text, dest, detected, None, None)
+
+    return text_translate_batch([text], dest, src)[0]
+
+
+def text_translate_batch(texts: list, dest: str, src: str= None) -> list:
+    """
+    Translate several texts with concurrent requests over the shared client.
+
+    If a translation memory is set, only texts without a stored translation are requested.
+
+    Args:
+        texts (list): The texts to be translated.
+        dest (str): The destination language code.
+        src (str, optional): The source language code, None to detect it per text. Defaults to None.
+
+    Returns:
+        list: The translated texts in the order of the input texts.
+    """
+    memory = translation_memory.get_default()
+    if memory is None:
+        return get_default().translate_batch(texts, dest, src)
+
+    translated = [memory.get('google_async', MODEL, src, dest, text) for text in texts]
+    missing = [i for i, text in enumerate(translated) if text is None]
+
+    if missing:
+        missing_translated = get_default().translate_batch([texts[i] for i in missing], dest, src)
+
+        for i, translated_text in zip(missing, missing_translated):
+            translated[i] = translated_text
+            memory.put('google_async', MODEL, src, dest, texts[i], translated_text)
+
+    return translated
\ No newline at end of file
@@ -1,26 +1,43 @@
 import googletrans
 
+import translation_memory
+
 '''
 Source file for google translation
 Not likely to work
 https://pypi.org/project/googletrans/
 '''
 
+# Translator reused by every call, so its HTTP client and connections are kept
+TRANSLATOR = None
+
 def text_translate(text: str, dest: str, src:str=None, detail:bool=False) -> str:
     '''
     Translate text, 
     Using google translator, 
     Internet connection required, 
+    The source language is detected in the same request if src is None, 
+    Goes through the translation memory if one is set (not for detail results, which need the pronunciations), 
     https://pypi.org/project/googletrans/
     '''
-    translator = googletrans.Translator()
+    memory = translation_memory.get_default()
+    model = 'googletrans-' + getattr(googletrans, '__version__', 'unknown')
+    memory_src = src
 
-    # Estimate by language detection if the source language is not entered
-    if src == None:
-        translated = translator.detect(text)
-        src = translated.lang
-    
-    translated = translator.translate(text=text, dest=dest, src=src)
+    if memory is not None and not detail:
+        trans_text = memory.get('google_lib', model, memory_src, dest, text)
+
+        if trans_text is not None:
+            return trans_text
+
+    global TRANSLATOR
+
+    if TRANSLATOR is None:
+        TRANSLATOR = googletrans.Translator()
+
+    # The source language is detected with the translation if it is not entered
+    translated = TRANSLATOR.translate(text=text, dest=dest, src=src or 'auto')
+    src = translated.src
 
     result = translated._response
 
@@ -34,6 +51,9 @@ def text_translate(text: str, dest: str, src:str=None, detail:bool=False) -> str
     else:
         raise Exception("HTTP response fail")
 
+    if memory is not None:
+        memory.put('google_lib', model, memory_src, dest, text, trans_text)
+
     if detail:
         return (trans_text, text, dest, src, trans_pronunciation, origin_pronunciation)
     
@@ -1,10 +1,53 @@
 import cv2
+import time
 import numpy as np
-import pytesseract
-from PIL import ImageFont, ImageDraw, Image
+from PIL import ImageDraw, Image
+from concurrent.futures import ThreadPoolExecutor
 
+import argos_translate
+import color_cache
+import erase_text
+import font_cache
+import google_translate_async
 import make_sentence_block
 import paragraph_block
+import ocr_backend
+import ocr_cache
+import ocr_preprocess
+import ocr_table
+import ocr_tiling
+import text_region
+import translation_plan
+import translation_dispatch
+
+# Parameters of each processing stage and the stages whose results it uses.
+# A stage result is memoized by its own parameters together with the parameters of its input stages.
+STAGE_PARAMETERS = {
+    'sentence': ['sentence_threshold'],
+    'block': ['block_threshold', 'block_mode'],
+    'color': ['color_method'],
+    'translate': ['src_lang', 'dest_lang', 'translator_mode', 'translate_batch', 'translate_plan'],
+    'render': ['font_type', 'font_weight', 'font_min_scale', 'erase_method']
+}
+
+STAGE_INPUTS = {
+    'sentence': [],
+    'block': ['sentence'],
+    'color': ['block'],
+    'translate': ['block'],
+    'render': ['color', 'translate']
+}
+
+# Translators that translate the texts of all blocks with one batch call.
+# The 'hedged' dispatcher returns (text, engine) tuples instead of texts.
+BATCH_TRANSLATORS = {
+    'argos': argos_translate.text_translate_batch,
+    'google_async': google_translate_async.text_translate_batch,
+    'hedged': translation_dispatch.text_translate_batch
+}
+
+# Delivery orders of `ProcessingBlock.priority_order`
+PRIORITIES = ('font', 'top', 'area', 'order')
 
 
 class ProcessingBlock:
@@ -20,16 +63,49 @@ class ProcessingBlock:
         dest_lang_ (str): Destination language code for translation.
         font_type_ (str): Path to the TrueType font file used for rendering text.
         font_weight_ (float): Scaling factor for font size to ensure proper text rendering.
+        font_min_scale_ (float): Smallest scale the font size of a block is reduced to so the translated text fits its line boxes.
+        erase_method_ (str): How the old text is erased, 'fill' paints the line boxes with their background colors, 
+            'inpaint' inpaints the text pixels inside the boxes for textured backgrounds.
         sentence_threshold_ (int): Minimum OCR confidence threshold for processing individual sentences.
         block_threshold_ (float): Threshold used to group sentences into text blocks (paragraphs).
-        translator_mode_ (str): Mode or API choice for translation (e.g., 'argos').
+        block_mode_ (str): Paragraph clustering, 'sequential' compares each sentence with the previous block,
+            'spatial' links vertically adjacent sentences through a sorted index for multi-column layouts.
+        translator_mode_ (str): Mode or API choice for translation (e.g., 'argos'), 'hedged' for the dispatcher falling back between engines.
+        color_method_ (str): Color estimator for the background and font colors, 'kmeans' (sklearn reference), 'cv2', 'histogram'
+            or 'batch' to estimate the colors of all blocks in one pass.
+        color_workers_ (int): Number of threads finding the block colors, 1 runs the color stage serially.
+        translate_workers_ (int): Number of threads translating the blocks, 1 runs the translation stage serially.
+        translate_plan_ (bool): Deduplicate the block texts and skip texts without anything to translate or already in the destination language.
+        translation_stats_ (dict or None): Counters of the last translation, including the number of translation calls avoided by the plan.
+        translate_batch_ (bool): Translate the text of all blocks with one batch call when the translator supports it ('argos', 'google_async', 'hedged'), 
+            `translate_workers_` is not used then.
+        color_cache_ (ColorCache or None): Cache of region colors shared by the blocks, and by other images if the same cache is passed, 
+            not used by the 'batch' color method.
+        ocr_mode_ (str): OCR mode, 'full' to recognize the whole image at once, 'tiled' to recognize overlapping tiles in parallel,
+            or 'region' to recognize only proposed text regions.
+        tile_size_ (int): Side length of a tile in pixels for the tiled OCR mode.
+        tile_overlap_ (int): Overlap between neighbouring tiles in pixels for the tiled OCR mode.
+        ocr_workers_ (int or None): Number of worker processes for the tiled OCR mode and the 'pool' engine, None uses all CPU cores.
+        ocr_engine_ (str): OCR backend, 'pytesseract', 'tesserocr' (in-process engine) or 'pool' (warm worker processes).
+        ocr_lang_ (str): Tesseract language code used for OCR.
+        ocr_psm_ (int or None): Tesseract page segmentation mode, None uses the Tesseract default.
+        ocr_oem_ (int or None): Tesseract OCR engine mode, None uses the Tesseract default.
+        ocr_preprocess_ (str or None): Single-channel conversion before OCR, 'gray', 'binary' or None to use the image as is.
+        ocr_text_height_ (int or None): Target character height in pixels the image is rescaled to before OCR, None disables rescaling.
+        ocr_gate_ (bool): Propose text regions before the 'full' and 'tiled' OCR modes and skip Tesseract if there are none.
+        ocr_scale_ (float): Scale factor applied to the image for the last OCR run.
+        text_regions_ (list or None): Text regions proposed by the last OCR run, in OCR image coordinates, 
+            None if no proposal was made or the OCR data came from the cache.
+        ocr_cache_ (OCRCache or None): Persistent OCR result cache consulted before running Tesseract.
+        image_hash_ (str or None): SHA-256 hash of the input image file, computed on first use of the cache.
         image_ (np.ndarray): Original image loaded via OpenCV.
-        sub_image_ (np.ndarray): Copy of the original image used for drawing visualizations.
-        result_image_ (np.ndarray): Copy of the image where the translated text is rendered.
-        ocr_data_ (dict): Dictionary containing raw OCR data returned by pytesseract.
+        sub_image_ (np.ndarray or None): Copy of the original image used for drawing visualizations, allocated by `draw_process()`.
+        result_image_ (np.ndarray): Image where the translated text is rendered, the original image itself until the first rendering.
+        ocr_data_ (OCRTable): Columnar OCR data, usable like the dictionary returned by pytesseract.
         sentence_data_ (dict): Dictionary containing grouped sentence data.
         block_data_ (dict): Dictionary containing grouped text block data.
         blocks_ (list): List of ParagraphBlock objects created from the grouped text.
+        stage_memo_ (dict): Memoized stage results keyed by `stage_key()`, reused when parameters change back and forth.
     """
 
     def __init__(self, image_path: str, \
@@ -38,9 +114,31 @@ class ProcessingBlock:
                  dest_lang: str= "ko", \
                  font_type: str= "fonts\\gulim.ttc", \
                  font_weight: float= 1.2, \
+                 font_min_scale: float= 0.5, \
+                 erase_method: str= "fill", \
                  sentence_threshold: int= 50, \
                  block_threshold: float= 1.5, \
-                 translator_mode: str= "argos") -> None:
+                 translator_mode: str= "argos", \
+                 ocr_mode: str= "full", \
+                 tile_size: int= 2048, \
+                 tile_overlap: int= 256, \
+                 ocr_workers: int= None, \
+                 ocr_engine: str= "pytesseract", \
+                 ocr_lang: str= "eng", \
+                 ocr_psm: int= None, \
+                 ocr_oem: int= None, \
+                 ocr_preprocess: str= None, \
+                 ocr_text_height: int= None, \
+                 ocr_gate: bool= False, \
+                 ocr_cache: ocr_cache.OCRCache= None, \
+                 image_hash: str= None, \
+                 block_mode: str= "sequential", \
+                 color_method: str= "kmeans", \
+                 color_workers: int= 1, \
+                 translate_workers: int= 1, \
+                 color_cache: color_cache.ColorCache= None, \
+                 translate_batch: bool= False, \
+                 translate_plan: bool= True) -> None:
         """
         Initialize the class with the specified parameters and load the image.
 
@@ -51,9 +149,33 @@ class ProcessingBlock:
             dest_lang (str, optional): Destination language code for translation. Defaults to "ko".
             font_type (str, optional): Path to the font file used for text rendering. Defaults to "fonts\\gulim.ttc".
             font_weight (float, optional): Scaling factor for font size. Defaults to 1.2.
+            font_min_scale (float, optional): Smallest font scale used to fit the translated text of a block. Defaults to 0.5.
+            erase_method (str, optional): Text eraser, 'fill' or 'inpaint'. Defaults to "fill".
             sentence_threshold (int, optional): Minimum OCR confidence threshold for sentence processing. Defaults to 50.
             block_threshold (float, optional): Threshold for grouping sentences into paragraphs. Defaults to 1.5.
             translator_mode (str, optional): Mode used for translation (e.g., 'argos'). Defaults to "argos".
+            ocr_mode (str, optional): OCR mode, 'full', 'tiled' or 'region'. Defaults to "full".
+            tile_size (int, optional): Side length of a tile in pixels for the tiled OCR mode. Defaults to 2048.
+            tile_overlap (int, optional): Overlap between tiles in pixels for the tiled OCR mode. Defaults to 256.
+            ocr_workers (int, optional): Number of worker processes for the tiled OCR mode and the 'pool' engine. Defaults to None (all CPU cores).
+            ocr_engine (str, optional): OCR backend, 'pytesseract', 'tesserocr' or 'pool'. Defaults to "pytesseract".
+            ocr_lang (str, optional): Tesseract language code used for OCR. Defaults to "eng".
+            ocr_psm (int, optional): Tesseract page segmentation mode. Defaults to None.
+            ocr_oem (int, optional): Tesseract OCR engine mode. Defaults to None.
+            ocr_preprocess (str, optional): Single-channel conversion before OCR, 'gray' or 'binary'. Defaults to None.
+            ocr_text_height (int, optional): Target character height for rescaling before OCR, e.g. 24. Defaults to None.
+            ocr_gate (bool, optional): Skip Tesseract in the 'full' and 'tiled' OCR modes if no text region is proposed. Defaults to False,
+                as the proposals can miss low-contrast text.
+            ocr_cache (OCRCache, optional): OCR result cache. Defaults to None (no caching).
+            image_hash (str, optional): SHA-256 hash of the image file if already known. Defaults to None.
+            block_mode (str, optional): Paragraph clustering, 'sequential' or 'spatial'. Defaults to "sequential".
+            color_method (str, optional): Color estimator, 'kmeans', 'cv2', 'histogram' or 'batch'. Defaults to "kmeans".
+            color_workers (int, optional): Number of threads finding the block colors. Defaults to 1.
+            translate_workers (int, optional): Number of threads translating the blocks. Defaults to 1.
+            color_cache (ColorCache, optional): Cache of region colors. Defaults to None (no caching).
+            translate_batch (bool, optional): Translate all blocks with one batch call for the 'argos', 'google_async' and 'hedged' translators
+                instead of one call per block on `translate_workers` threads. Defaults to False.
+            translate_plan (bool, optional): Translate each unique text that needs a translation only once. Defaults to True.
         """
         self.image_path_ = image_path
         self.save_path_ = save_path
@@ -61,46 +183,275 @@ class ProcessingBlock:
         self.dest_lang_ = dest_lang
         self.font_type_ = font_type
         self.font_weight_ = font_weight
+        self.font_min_scale_ = font_min_scale
+        self.erase_method_ = erase_method
         self.sentence_threshold_ = sentence_threshold
         self.block_threshold_ = block_threshold
         self.translator_mode_ = translator_mode
+        self.ocr_mode_ = ocr_mode
+        self.tile_size_ = tile_size
+        self.tile_overlap_ = tile_overlap
+        self.ocr_workers_ = ocr_workers
+        self.ocr_engine_ = ocr_engine
+        self.ocr_lang_ = ocr_lang
+        self.ocr_psm_ = ocr_psm
+        self.ocr_oem_ = ocr_oem
+        self.ocr_preprocess_ = ocr_preprocess
+        self.ocr_text_height_ = ocr_text_height
+        self.ocr_gate_ = ocr_gate
+        self.ocr_scale_ = 1.0
+        self.text_regions_ = None
+        self.ocr_cache_ = ocr_cache
+        self.image_hash_ = image_hash
+        self.block_mode_ = block_mode
+        self.color_method_ = color_method
+        self.color_workers_ = color_workers
+        self.translate_workers_ = translate_workers
+        self.color_cache_ = color_cache
+        self.translate_batch_ = translate_batch
+        self.translate_plan_ = translate_plan
+        self.translation_stats_ = None
 
         # Load the image using OpenCV
         self.image_ = cv2.imread(self.image_path_)
         if self.image_ is None:
             raise ValueError(f"Unable to load image from path: {self.image_path_}")
-        self.sub_image_ = self.image_.copy()
-        self.result_image_ = self.image_.copy()
+
+        # No copies up front, the debug canvas is allocated on request and rendering makes its own copy
+        self.sub_image_ = None
+        self.result_image_ = self.image_
 
         # OCR and text block data
         self.ocr_data_ = None
         self.sentence_data_ = None
         self.block_data_ = None
         self.blocks_ = []
+        self.stage_memo_ = {}
 
         return
     
 
-    def ocr_process(self) -> dict:
+    def set_parameter(self, \
+                      sentence_threshold: int= None, \
+                      block_threshold: float= None, \
+                      block_mode: str= None, \
+                      src_lang: str= None, \
+                      dest_lang: str= None, \
+                      translator_mode: str= None, \
+                      font_type: str= None, \
+                      font_weight: float= None, \
+                      font_min_scale: float= None, \
+                      erase_method: str= None, \
+                      color_method: str= None) -> None:
+        """
+        Change the grouping, translation or rendering parameters without reloading the image or running OCR again.
+
+        Parameters left as None keep their current value.  
+        The grouped data and paragraph objects are rebuilt on the next stage call, 
+        and only the stages whose parameters changed are recomputed, the others are taken from `stage_memo_`.
+
+        Args:
+            sentence_threshold (int, optional): Minimum OCR confidence threshold for sentence processing.
+            block_threshold (float, optional): Threshold for grouping sentences into paragraphs.
+            block_mode (str, optional): Paragraph clustering, 'sequential' or 'spatial'.
+            src_lang (str, optional): Source language code for translation.
+            dest_lang (str, optional): Destination language code for translation.
+            translator_mode (str, optional): Mode used for translation.
+            font_type (str, optional): Path to the font file used for text rendering.
+            font_weight (float, optional): Scaling factor for font size.
+            font_min_scale (float, optional): Smallest font scale used to fit the translated text of a block.
+            erase_method (str, optional): Text eraser, 'fill' or 'inpaint'.
+            color_method (str, optional): Color estimator, 'kmeans', 'cv2', 'histogram' or 'batch'.
+        """
+        parameters = {
+            'sentence_threshold': sentence_threshold,
+            'block_threshold': block_threshold,
+            'block_mode': block_mode,
+            'src_lang': src_lang,
+            'dest_lang': dest_lang,
+            'translator_mode': translator_mode,
+            'font_type': font_type,
+            'font_weight': font_weight,
+            'font_min_scale': font_min_scale,
+            'erase_method': erase_method,
+            'color_method': color_method
+        }
+
+        for name, value in parameters.items():
+            if value is not None:
+                setattr(self, name + '_', value)
+
+        self.sentence_data_ = None
+        self.block_data_ = None
+        self.blocks_ = []
+
+        return
+    
+
+    def stage_key(self, stage: str) -> tuple:
+        """
+        Build the memo key of a stage from its parameters and the keys of its input stages.
+
+        Args:
+            stage (str): The stage name, one of the keys of `STAGE_PARAMETERS`.
+
+        Returns:
+            tuple: The memo key.
+        """
+        values = tuple(getattr(self, name + '_') for name in STAGE_PARAMETERS[stage])
+
+        # The Argos settings are set once per process with `argos_translate.configure()`, and change the translations as well
+        if stage == 'translate':
+            settings = argos_translate.get_settings()
+            values += (settings['compute_type'], settings['beam_size'])
+
+        inputs = tuple(self.stage_key(input_stage) for input_stage in STAGE_INPUTS[stage])
+
+        return (stage, values, inputs)
+    
+
+    def memoize(self, stage: str, compute):
+        """
+        Return the memoized result of a stage, computing it only if the stage parameters have not been seen before.
+
+        Args:
+            stage (str): The stage name.
+            compute (callable): Function without arguments computing the stage result.
+
+        Returns:
+            The stage result.
+        """
+        key = self.stage_key(stage)
+        if key not in self.stage_memo_:
+            self.stage_memo_[key] = compute()
+
+        return self.stage_memo_[key]
+    
+
+    def clear_memo(self) -> None:
+        """
+        Drop all memoized stage results, e.g. to release rendered images after a sweep.
+        """
+        self.stage_memo_ = {}
+
+        return
+    
+
+    def ocr_process(self) -> ocr_table.OCRTable:
         """
         Perform OCR on the input image using Tesseract OCR.
 
-        This method extracts text and positional data from the image and stores it as dictionary.
+        This method extracts text and positional data from the image and stores it as dictionary.  
+        In the 'tiled' OCR mode the image is split into overlapping tiles which are recognized in parallel,
+        the result keeps the same dictionary layout.  
+        In the 'region' OCR mode only proposed text regions are recognized.  
+        In every mode an image without any text candidate skips Tesseract and yields OCR data without words, 
+        in the 'full' and 'tiled' modes only if `ocr_gate_` is set.  
+        The OCR engine is long-lived and shared by every ProcessingBlock with the same OCR settings.  
+        If an OCR cache is set, a cached result for the same image and OCR settings is returned without running Tesseract.  
+        With preprocessing enabled, OCR runs on a rescaled single-channel image 
+        and the boxes are mapped back to the coordinates of the original image.
 
         Returns:
-            dict: OCR data containing recognized text, bounding box coordinates, and confidence values.
+            OCRTable: OCR data containing recognized text, bounding box coordinates, and confidence values.
+
+        Raises:
+            ValueError: If the OCR mode is unknown.
         """
-        self.ocr_data_ = pytesseract.image_to_data(self.image_, output_type=pytesseract.Output.DICT)
+        cache_key = None
+        self.text_regions_ = None
+        if self.ocr_cache_ is not None:
+            if self.image_hash_ is None:
+                self.image_hash_ = ocr_cache.file_hash(self.image_path_)
+
+            cache_key = ocr_cache.make_key(self.image_hash_, self.ocr_settings())
+            cached_data = self.ocr_cache_.get(cache_key)
+
+            if cached_data is not None:
+                self.ocr_data_ = cached_data
+                return self.ocr_data_
+
+        backend = ocr_backend.get_backend(
+            self.ocr_engine_, 
+            lang = self.ocr_lang_, 
+            psm = self.ocr_psm_, 
+            oem = self.ocr_oem_, 
+            workers = self.ocr_workers_
+        )
+
+        ocr_image = self.image_
+        self.ocr_scale_ = 1.0
+        if self.ocr_preprocess_ is not None or self.ocr_text_height_ is not None:
+            ocr_image, self.ocr_scale_ = ocr_preprocess.preprocess(self.image_, self.ocr_preprocess_, self.ocr_text_height_)
+
+        if self.ocr_mode_ not in ("full", "tiled", "region"):
+            raise ValueError(f"Unknown OCR mode: {self.ocr_mode_}")
+
+        # The proposal is cheap next to Tesseract, an image without text candidates is not recognized at all
+        if self.ocr_mode_ == "region" or self.ocr_gate_:
+            self.text_regions_ = text_region.propose_regions(ocr_image)
+
+        if self.text_regions_ is not None and not self.text_regions_:
+            self.ocr_data_ = text_region.concat_ocr_data([], ocr_image.shape)
+
+        elif self.ocr_mode_ == "full":
+            self.ocr_data_ = backend.image_to_data(ocr_image)
+
+        elif self.ocr_mode_ == "tiled":
+            self.ocr_data_ = ocr_tiling.tiled_image_to_data(
+                ocr_image, 
+                tile_size = self.tile_size_, 
+                overlap = self.tile_overlap_, 
+                workers = self.ocr_workers_, 
+                backend = backend
+            )
+
+        else:
+            self.ocr_data_ = text_region.region_image_to_data(ocr_image, backend=backend, regions=self.text_regions_)
+
+        self.ocr_data_ = ocr_preprocess.rescale_ocr_data(self.ocr_data_, self.ocr_scale_)
+
+        if cache_key is not None:
+            self.ocr_cache_.put(cache_key, self.ocr_data_)
 
         return self.ocr_data_
     
 
+    def ocr_settings(self) -> dict:
+        """
+        Return the settings that change the OCR result, used as part of the OCR cache key.
+
+        The OCR engine is not included, every engine returns the same result for the same settings.
+
+        Returns:
+            dict: The OCR settings.
+        """
+        settings = {
+            'lang': self.ocr_lang_,
+            'psm': self.ocr_psm_,
+            'oem': self.ocr_oem_,
+            'mode': self.ocr_mode_,
+            'preprocess': self.ocr_preprocess_,
+            'text_height': self.ocr_text_height_
+        }
+
+        if self.ocr_mode_ != "region":
+            settings['gate'] = self.ocr_gate_
+
+        if self.ocr_mode_ == "tiled":
+            settings['tile_size'] = self.tile_size_
+            settings['tile_overlap'] = self.tile_overlap_
+
+        return settings
+    
+
     def recollection_text(self) -> dict:
         """
         Reassemble OCR output into structured sentences and paragraphs.
 
         This method first ensures that OCR data is available, 
-        then uses helper functions to group the OCR results into sentences and subsequently into text blocks (paragraphs).
+        then uses helper functions to group the OCR results into sentences and subsequently into text blocks (paragraphs).  
+        Both steps are memoized by their thresholds, so repeating a parameter set does not group the data again.
 
         Returns:
             dict: A dictionary containing grouped text block data, including keys like ('text', 'left', 'top', 'width', 'height', 'line', 'lpos', and 'fsize'.)
@@ -109,10 +460,15 @@ class ProcessingBlock:
             self.ocr_process()
 
         # Group OCR data into sentences based on the confidence threshold
-        self.sentence_data_ = make_sentence_block.find_sentence(self.ocr_data_, self.sentence_threshold_)
+        self.sentence_data_ = self.memoize('sentence', lambda: make_sentence_block.find_sentence(self.ocr_data_, self.sentence_threshold_))
 
         # Group sentences into paragraphs/text blocks using the block threshold
-        self.block_data_ = make_sentence_block.make_sentence_block(self.sentence_data_, threshold=self.block_threshold_)
+        def group_blocks():
+            if self.block_mode_ == "spatial":
+                return make_sentence_block.make_sentence_block_spatial(self.sentence_data_, threshold=self.block_threshold_)
+            return make_sentence_block.make_sentence_block(self.sentence_data_, threshold=self.block_threshold_)
+
+        self.block_data_ = self.memoize('block', group_blocks)
 
         return self.block_data_
     
@@ -146,20 +502,417 @@ class ProcessingBlock:
                 line = line, 
                 lpos = lpos, 
                 fsize = fsize, 
-                translator_mode = self.translator_mode_
+                translator_mode = self.translator_mode_, 
+                color_method = self.color_method_, 
+                color_cache = self.color_cache_
             )
             self.blocks_.append(block)
             
         return
     
 
+    def color_process(self) -> list:
+        """
+        Find the background and font colors of every paragraph block.
+
+        The colors only depend on the block layout, so they are memoized with the grouping parameters
+        and reused when only the translation or rendering parameters change.  
+        With the 'batch' color method the regions of all blocks are gathered and estimated in a single call.  
+        With more than one color worker the blocks (or the batch chunks) are processed on a thread pool,
+        the results are identical to the serial run.
+
+        Returns:
+            list: The colors of each block as (background color, font color) tuples.
+        """
+        if not self.blocks_:
+            self.build_blocks()
+
+        def find_colors():
+            if self.color_method_ == "batch":
+                self.batch_color_find()
+            elif self.color_workers_ > 1:
+                with ThreadPoolExecutor(max_workers=self.color_workers_) as executor:
+                    list(executor.map(lambda block: block.color_find(self.image_), self.blocks_))
+            else:
+                for block in self.blocks_:
+                    block.color_find(self.image_)
+            return [block.get_color() for block in self.blocks_]
+
+        colors = self.memoize('color', find_colors)
+        for block, (background_color, font_color) in zip(self.blocks_, colors):
+            block.set_color(background_color, font_color)
+
+        return colors
+    
+
+    def batch_color_find(self) -> None:
+        """
+        Estimate the colors of every region of every block with one `erase_text.batch_colors` call
+        and hand the results back to each ParagraphBlock.  
+        The color cache is not consulted, a color signature per region costs about as much as the batch pass itself.
+        """
+        block_rects = [block.color_rects() for block in self.blocks_]
+        rects = [rect for rects in block_rects for rect in rects]
+
+        background_color, font_color = erase_text.batch_colors(self.image_, rects, workers=self.color_workers_)
+
+        start = 0
+        for block, block_rect in zip(self.blocks_, block_rects):
+            end = start + len(block_rect)
+            block.set_color(background_color[start:end], font_color[start:end], correction=True)
+            start = end
+
+        return
+    
+
+    def translate_texts(self, texts: list) -> tuple:
+        """
+        Translate a list of texts with the translator of this object.
+
+        With batch translation and a translator in `BATCH_TRANSLATORS` the texts are translated with one batch call, 
+        otherwise text by text, on a thread pool if there is more than one translate worker.
+
+        Args:
+            texts (list): The texts to be translated.
+
+        Returns:
+            tuple: The translated texts and the engine that served each of them as (texts, engines).
+        """
+        if self.translate_batch_ and self.translator_mode_ in BATCH_TRANSLATORS:
+            translated_texts = BATCH_TRANSLATORS[self.translator_mode_](texts, dest=self.dest_lang_, src=self.src_lang_)
+
+            if self.translator_mode_ == "hedged":
+                return [translated_text for translated_text, _ in translated_texts], [engine for _, engine in translated_texts]
+            return translated_texts, [self.translator_mode_] * len(texts)
+
+        def translate(text):
+            return paragraph_block.translate_text(text, self.src_lang_, self.dest_lang_, self.translator_mode_)
+
+        if self.translate_workers_ > 1:
+            with ThreadPoolExecutor(max_workers=self.translate_workers_) as executor:
+                results = list(executor.map(translate, texts))
+        else:
+            results = [translate(text) for text in texts]
+
+        return [translated_text for translated_text, _ in results], [engine for _, engine in results]
+    
+
+    def translate_process(self) -> list:
+        """
+        Translate the text of every paragraph block.
+
+        The translations are memoized with the grouping parameters and the languages and translator.  
+        The 'argos' translator uses the CTranslate2 settings of the process, see `argos_translate.configure()`.  
+        With batch translation and a translator in `BATCH_TRANSLATORS`, the texts of all blocks are translated with one 
+        batch call (one CTranslate2 batch for 'argos', concurrent requests for 'google_async' and 'hedged') and the results are distributed back to the blocks.  
+        The engine that served each block is memoized with its translation, see `ParagraphBlock.get_translation_engine()`.  
+        Otherwise, with more than one translate worker the texts are translated on a thread pool.  
+        With the translation plan, only the unique texts that need a translation are sent to the translator 
+        and the results are fanned back out to the blocks, the counters are kept in `translation_stats_`.
+
+        Returns:
+            list: The translated text of each block, distributed across its lines.
+        """
+        if not self.blocks_:
+            self.build_blocks()
+
+        def translate_blocks():
+            texts = [block.get_text() for block in self.blocks_]
+            plan = translation_plan.TranslationPlan(texts, self.src_lang_, self.dest_lang_, enabled=self.translate_plan_)
+            translated_texts, engines = plan.fan_out(*self.translate_texts(plan.texts_))
+
+            for block, translated_text, engine in zip(self.blocks_, translated_texts, engines):
+                block.apply_translation(translated_text, self.src_lang_, self.dest_lang_, engine)
+            return [(block.get_translated_text()[2], block.get_translation_engine()) for block in self.blocks_], plan.stats()
+
+        translations, self.translation_stats_ = self.memoize('translate', translate_blocks)
+        for block, (translated_text, engine) in zip(self.blocks_, translations):
+            block.set_translated_text(translated_text, self.src_lang_, self.dest_lang_, engine)
+
+        return [translated_text for translated_text, _ in translations]
+    
+
+    def render_process(self) -> np.ndarray:
+        """
+        Render the translated text of every paragraph block onto a copy of the original image.
+
+        Each sentence area is cleared by drawing a filled rectangle with the background color, 
+        then the translated text is drawn with the specified font and size.  
+        The rendered image is memoized with the parameters of every stage before it.  
+        If either stage has more than one worker, the translation runs concurrently with the color stage, 
+        and only the drawing is serialized in block order.
+
+        Returns:
+            np.ndarray: The resulting image with the translated text rendered.
+        """
+        if not self.blocks_:
+            self.build_blocks()
+
+        if self.color_workers_ > 1 or self.translate_workers_ > 1:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                translation = executor.submit(self.translate_process)
+                self.color_process()
+                translation.result()
+        else:
+            self.color_process()
+            self.translate_process()
+
+        def render_blocks():
+            # One copy of the original image, the old text of every block is erased at once 
+            # and each paragraph is drawn in place on its own region
+            result_image = self.image_.copy()
+            self.erase_blocks(result_image, self.blocks_)
+
+            for block in self.blocks_:
+                self.draw_block(result_image, block, erase=False)
+
+            return result_image
+
+        self.result_image_ = self.memoize('render', render_blocks)
+
+        return self.result_image_
+    
+
+    def erase_blocks(self, image: np.ndarray, blocks: list) -> None:
+        """
+        Erase the old text of the line boxes of several blocks in place, see `erase_text.erase_boxes()`.
+
+        With the 'fill' method every box is one NumPy slice assignment instead of one PIL rectangle per line.  
+        With 'inpaint' the boxes are merged into rectangles, and the mask and the inpainting run per merged rectangle,
+        so the cost follows the text area instead of the bounding rectangle of all boxes.
+
+        Args:
+            image (np.ndarray): The image being rendered, modified in place.
+            blocks (list): The ParagraphBlock objects with their line boxes and colors.
+        """
+        rects = []
+        colors = []
+        for block in blocks:
+            block_line, block_lpos, _ = block.get_translated_text()
+            background_color, _ = block.get_color()
+            rects.extend(block_lpos[:block_line])
+            colors.extend(background_color[:block_line])
+
+        if rects:
+            erase_text.erase_boxes(image, rects, colors, self.erase_method_)
+
+        return
+    
+
+    def draw_block(self, image: np.ndarray, block: paragraph_block.ParagraphBlock, erase: bool = True) -> tuple:
+        """
+        Draw the translated text of one paragraph block in place.
+
+        The translation is laid out in the line boxes by measured glyph widths first, 
+        with the font size reduced down to `font_min_scale_` if it does not fit, see `ParagraphBlock.layout_text()`.  
+        The old text is erased with `erase_method_` before any text is drawn.  
+        Only the region covered by the line boxes and the drawn text is converted to a PIL image and written back, 
+        so the cost does not depend on the size of the image.
+
+        Args:
+            image (np.ndarray): The image being rendered, modified in place.
+            block (ParagraphBlock): The block with its translation and colors.
+            erase (bool, optional): Erase the old text of the block first, False if `erase_blocks()` already did. Defaults to True.
+
+        Returns:
+            tuple: The drawn region as (x, y, width, height).
+        """
+        if erase:
+            self.erase_blocks(image, [block])
+
+        block_line, block_lpos, _ = block.get_translated_text()
+        block_text, font_size = block.layout_text(self.font_type_, self.font_weight_, self.font_min_scale_)
+        _, font_color = block.get_color()
+
+        # Load the fitted font sizes, shared with every other line and image of that size
+        fonts = [font_cache.get_font(self.font_type_, font_size[i]) for i in range(block_line)]
+
+        # The region covers the line boxes and the text, whose glyphs may reach beyond a box
+        image_height, image_width = image.shape[:2]
+        x0, y0, x1, y1 = image_width, image_height, 0, 0
+        for i in range(block_line):
+            box_x, box_y, box_w, box_h = block_lpos[i]
+            left, top, right, bottom = fonts[i].getbbox(block_text[i])
+            x0, y0 = min(x0, box_x, box_x + left), min(y0, box_y, box_y + top)
+            x1, y1 = max(x1, box_x + box_w + 1, box_x + right), max(y1, box_y + box_h + 1, box_y + bottom)
+
+        x0, y0, x1, y1 = max(0, x0), max(0, y0), min(image_width, x1), min(image_height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return (x0, y0, 0, 0)
+
+        region = Image.fromarray(image[y0:y1, x0:x1])
+        draw = ImageDraw.Draw(region)
+
+        # Works with every sentence contained in a paragraph
+        for i in range(block_line):
+            box_x, box_y, _, _ = block_lpos[i]
+            box_text = block_text[i]
+            box_ft = font_color[i]
+
+            # Draw the translated text at the given position
+            draw.text((box_x - x0, box_y - y0), box_text, font=fonts[i], fill=box_ft)
+
+        image[y0:y1, x0:x1] = np.asarray(region)
+
+        return (x0, y0, x1 - x0, y1 - y0)
+    
+
+    def priority_order(self, priority: str = 'font') -> list:
+        """
+        Return the block indices in the order their results should be delivered.
+
+        Args:
+            priority (str, optional): 'font' for the largest font first, 'top' for top of page first, 
+                'area' for the largest block first, or 'order' for the block order. Defaults to 'font'.
+
+        Returns:
+            list: Indices into `blocks_`.
+
+        Raises:
+            ValueError: If the priority is unknown.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        indices = list(range(len(self.blocks_)))
+
+        if priority == 'font':
+            return sorted(indices, key=lambda i: (-max(self.blocks_[i].get_font_size()), self.blocks_[i].y_, self.blocks_[i].x_))
+        if priority == 'top':
+            return sorted(indices, key=lambda i: (self.blocks_[i].y_, self.blocks_[i].x_))
+        if priority == 'area':
+            return sorted(indices, key=lambda i: -self.blocks_[i].width_ * self.blocks_[i].height_)
+
+        return indices
+    
+
+    def iter_results(self, priority: str = 'font', chunk_size: int = 8):
+        """
+        Translate, color and render the blocks progressively, yielding each block as soon as it is ready.
+
+        The blocks are handled in priority order. The translation plan is built in that order and its texts 
+        are translated in chunks of `chunk_size` on `translate_workers_` threads (at least one), 
+        so the first chunk is ready long before the whole page is translated.  
+        Colors are found per block, except with the 'batch' method, which estimates every block in one fast pass.  
+        Each block is drawn onto the result image, and the drawn area is returned as a patch.  
+        If the colors are known before the first block, the old text of every block is erased at once as `render_process()` does, 
+        otherwise each block is erased just before it is drawn.  
+        When the generator is exhausted, the translate, color and render results are memoized 
+        as if `processing_run()` had run, and `result_image_` holds the complete image.  
+        The streamed image is kept as the render result only if no two drawn regions overlap, 
+        as then neither the drawing order nor the erasing block by block changes a pixel, 
+        otherwise the image is rendered again from the memoized stages, so it always equals the one of `processing_run()`.
+
+        Args:
+            priority (str, optional): Delivery order, see `priority_order()`. Defaults to 'font'.
+            chunk_size (int, optional): Number of texts translated per call. Defaults to 8.
+
+        Yields:
+            dict: The result of one block with keys 'index' (position in `blocks_`), 'rank', 'position', 'text', 
+                'translated_text' (the drawn lines), 'font_size' (of each drawn line), 'engine', 'background_color', 'font_color', 'patch' (np.ndarray) 
+                and 'elapsed' (seconds since the start).
+        """
+        start = time.perf_counter()
+
+        if self.block_data_ is None:
+            self.recollection_text()
+
+        if not self.blocks_:
+            self.build_blocks()
+
+        order = self.priority_order(priority)
+
+        color_key = self.stage_key('color')
+        if color_key in self.stage_memo_ or self.color_method_ == "batch":
+            self.color_process()
+        colors_ready = color_key in self.stage_memo_
+
+        # Translations already memoized are reused, otherwise the plan is translated chunk by chunk
+        translate_key = self.stage_key('translate')
+        translations = self.stage_memo_.get(translate_key)
+        plan = None
+        futures = []
+        executor = ThreadPoolExecutor(max_workers=max(1, self.translate_workers_))
+
+        if translations is None:
+            plan = translation_plan.TranslationPlan([self.blocks_[i].get_text() for i in order], \
+                                                    self.src_lang_, self.dest_lang_, enabled=self.translate_plan_)
+            futures = [executor.submit(self.translate_texts, plan.texts_[i:i + chunk_size]) \
+                       for i in range(0, len(plan.texts_), chunk_size)]
+
+        result_image = self.image_.copy()
+        if colors_ready:
+            self.erase_blocks(result_image, self.blocks_)
+
+        regions = []
+        try:
+            for rank, index in enumerate(order):
+                block = self.blocks_[index]
+
+                if plan is None:
+                    translated_text, engine = translations[0][index]
+                    block.set_translated_text(translated_text, self.src_lang_, self.dest_lang_, engine)
+                else:
+                    assignment = plan.assignments_[rank]
+                    if isinstance(assignment, int):
+                        chunk_texts, chunk_engines = futures[assignment // chunk_size].result()
+                        text, engine = chunk_texts[assignment % chunk_size], chunk_engines[assignment % chunk_size]
+                    else:
+                        text, engine = assignment, translation_plan.SKIPPED
+                    block.apply_translation(text, self.src_lang_, self.dest_lang_, engine)
+
+                if not colors_ready:
+                    block.color_find(self.image_)
+
+                region = self.draw_block(result_image, block, erase=not colors_ready)
+                if region[2] > 0 and region[3] > 0:
+                    regions.append(region)
+
+                x, y, w, h = block.get_position()
+                background_color, font_color = block.get_color()
+
+                yield {
+                    'index': index,
+                    'rank': rank,
+                    'position': (x, y, w, h),
+                    'text': block.get_text(),
+                    'translated_text': block.get_layout()[0],
+                    'font_size': block.get_layout()[1],
+                    'engine': block.get_translation_engine(),
+                    'background_color': background_color,
+                    'font_color': font_color,
+                    'patch': result_image[y:y + h, x:x + w].copy(),
+                    'elapsed': time.perf_counter() - start
+                }
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Every block is done, keep the results for later stage calls
+        if plan is not None:
+            self.stage_memo_[translate_key] = ([(block.get_translated_text()[2], block.get_translation_engine()) for block in self.blocks_], plan.stats())
+        if not colors_ready:
+            self.stage_memo_[color_key] = [block.get_color() for block in self.blocks_]
+        self.translation_stats_ = self.stage_memo_[translate_key][1]
+
+        # Inpainting a block also reads the pixels around its boxes, which may belong to a block not erased yet
+        independent = len(text_region.merge_rects(regions)) == len(regions)
+        if independent and (colors_ready or self.erase_method_ == "fill"):
+            self.result_image_ = result_image
+            self.stage_memo_[self.stage_key('render')] = self.result_image_
+        else:
+            self.render_process()
+
+        return
+    
+
     def processing_run(self) -> np.ndarray:
         """
         Process the image by translating and rendering the text blocks.
 
-        This method iterates through each ParagraphBlock, performs color detection, translates the text,
-        clears the original text region by drawing a filled rectangle with the background color, and then
-        renders the translated text using the specified font and size.
+        This method runs the color detection, translation and rendering stages for each ParagraphBlock.  
+        Every stage is memoized, so calling it again after `set_parameter()` only recomputes 
+        the stages that depend on the changed parameters.
 
         Returns:
             np.ndarray: The resulting image with the translated text rendered.
@@ -169,41 +922,48 @@ class ProcessingBlock:
 
         if not self.blocks_:
             self.build_blocks()
-        
-        # Convert the result image to a PIL image for rendering text
-        pil_image = Image.fromarray(self.result_image_)
-        draw = ImageDraw.Draw(pil_image)
-        
-        # Works with each paragraph object
-        for block in self.blocks_:
-            block.color_find(self.image_)
-            block.text_translate(src_lang=self.src_lang_, dest_lang=self.dest_lang_)
-
-            block_line, block_lpos, block_text = block.get_translated_text()
-            background_color, font_color = block.get_color()
-            font_size = block.get_font_size()
-
-            # Works with every sentence contained in a paragraph
-            for i in range(block_line):
-                box_x, box_y, box_w, box_h = block_lpos[i]
-                box_text = block_text[i]
-                box_bg = background_color[i]
-                box_ft = font_color[i]
-                box_fs = font_size[i]
-
-                # Clear the text area by drawing a filled rectangle with the background color
-                draw.rectangle([(box_x, box_y), (box_x + box_w, box_y + box_h)], fill=box_bg)
-
-                # Load the specified font with scaled size
-                font = ImageFont.truetype(self.font_type_, int(box_fs * (self.font_weight_)))
-
-                # Draw the translated text at the given position
-                draw.text((box_x, box_y), box_text, font=font, fill=box_ft)
-
-        # Update the result image from the PIL image
-        self.result_image_ = np.array(pil_image)
 
-        return self.result_image_
+        return self.render_process()
+    
+
+    def sweep(self, parameter_list: list, stage: str = 'block') -> list:
+        """
+        Run the pipeline up to a stage for several parameter sets while keeping the image and the OCR result.
+
+        Args:
+            parameter_list (list): Dictionaries of keyword arguments for `set_parameter()`, 
+                e.g. [{'sentence_threshold': 40, 'block_threshold': 1.2}, ...].
+            stage (str, optional): Last stage to run, 'sentence', 'block', 'color', 'translate' or 'render'. Defaults to 'block'.
+
+        Returns:
+            list: Tuples (parameters, result), where the result is the sentence data, the block data,
+                the block colors, the block translations or the rendered image depending on the stage.
+
+        Raises:
+            ValueError: If the stage is unknown.
+        """
+        if stage not in STAGE_PARAMETERS:
+            raise ValueError(f"Unknown stage: {stage}")
+
+        results = []
+        for parameters in parameter_list:
+            self.set_parameter(**parameters)
+            self.recollection_text()
+
+            if stage == 'sentence':
+                result = self.sentence_data_
+            elif stage == 'block':
+                result = self.block_data_
+            elif stage == 'color':
+                result = self.color_process()
+            elif stage == 'translate':
+                result = self.translate_process()
+            else:
+                result = self.render_process()
+
+            results.append((parameters, result))
+
+        return results
     
 
     def draw_process(self) -> None:
@@ -214,19 +974,20 @@ class ProcessingBlock:
           - Green rectangles around individual OCR-detected text components that meet the confidence threshold.
           - Blue rectangles around individual sentence boxes within each text block.
           - Red rectangles around the entire text block (paragraph).
+
+        The drawing canvas `sub_image_` is a copy of the original image made on the first call.
         """
+        if self.sub_image_ is None:
+            self.sub_image_ = self.image_.copy()
+
         # Draw bounding boxes for individual OCR text components
-        for i in range(len(self.ocr_data_['text'])):
-            x = self.ocr_data_['left'][i]
-            y = self.ocr_data_['top'][i]
-            w = self.ocr_data_['width'][i]
-            h = self.ocr_data_['height'][i]
-            text = self.ocr_data_['text'][i]
-            conf = int(self.ocr_data_['conf'][i])
-
-            if conf > self.sentence_threshold_ and len(text)>0:
-                # Draw Green rectangles for each word box
-                cv2.rectangle(self.sub_image_, (x,y), (x+w,y+h), (0,255,0), 1)
+        ocr_data = ocr_table.as_table(self.ocr_data_)
+        visible = (ocr_data['conf'] > self.sentence_threshold_) & (np.char.str_len(ocr_data['text']) > 0)
+        words = ocr_data.select(visible)
+
+        for x, y, w, h in zip(words['left'].tolist(), words['top'].tolist(), words['width'].tolist(), words['height'].tolist()):
+            # Draw Green rectangles for each word box
+            cv2.rectangle(self.sub_image_, (x,y), (x+w,y+h), (0,255,0), 1)
 
         # Draw bounding boxes for grouped text blocks and their sentence-level positions
         for i in range(len(self.block_data_['text'])):
@@ -267,9 +1028,14 @@ class ProcessingBlock:
         """
         Display the original image, the intermediate visualization with bounding boxes, and the final result image.
 
+        The visualization is drawn by `draw_process()` if it has not been drawn yet.
+
         Args:
             wait_time (int, optional): Delay in milliseconds for the display windows. Defaults to 0.
         """
+        if self.sub_image_ is None:
+            self.draw_process()
+
         cv2.imshow("origin", self.image_)
         cv2.imshow("process", self.sub_image_)
         cv2.imshow("result", self.result_image_)
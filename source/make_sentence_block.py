@@ -1,4 +1,7 @@
 import math
+import numpy as np
+
+import ocr_table
 
 """
 This module gathers fragmented OCR words into sentences and groups the sentences into paragraphs.
@@ -23,9 +26,99 @@ def calculate_distance(x1: int, y1: int, x2: int, y2: int) -> float:
     return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
 
 
-def find_sentence(ocr_data: dict, threshold:int = 50) -> dict:
+def find_sentence(ocr_data: ocr_table.OCRTable, threshold:int = 50) -> dict:
+    """
+    Group OCR words into sentences based on Tesseract output, using array operations over the whole page.
+
+    Word filtering, line breaks, gaps between words and sentence boundaries are computed with NumPy,
+    and the boxes and font sizes of all sentences come from segmented reductions.
+    The result is identical to `find_sentence_sequential`.
+
+    The sequential rules keep a sentence of a single one-character word open across the next break,
+    and measure a sentence oddly when a word lies left of the previous one.
+    Pages where either happens are handed to `find_sentence_sequential`.
+
+    Args:
+        ocr_data (OCRTable or dict): Tesseract OCR results as a columnar table or a pytesseract dictionary.
+        threshold (int, optional): Confidence threshold for including words. Defaults to 50.
+
+    Returns:
+        dict: A dictionary containing the grouped sentence data with keys 'text', 'left', 'top', 'width', 'height', and 'fsize'.
+    """
+    result = {
+        'text': [],
+        'left': [],
+        'top': [],
+        'width': [],
+        'height': [],
+        'fsize': []
+    }
+
+    if len(ocr_data.get('text', [])) == 0:
+        return result
+
+    level = np.asarray(ocr_data['level'])
+    conf = np.asarray(ocr_data['conf']).astype(np.float64).astype(np.int64)
+    words = np.char.strip(np.asarray(ocr_data['text'], dtype=str))
+    word_length = np.char.str_len(words)
+
+    # Words taking part in a sentence, and the line each row belongs to
+    valid = np.flatnonzero((level == 5) & (conf > threshold) & (word_length > 0))
+    if len(valid) == 0:
+        return result
+
+    line_id = np.cumsum(level == 4)[valid]
+    x = np.asarray(ocr_data['left'], dtype=np.int64)[valid]
+    y = np.asarray(ocr_data['top'], dtype=np.int64)[valid]
+    w = np.asarray(ocr_data['width'], dtype=np.int64)[valid]
+    h = np.asarray(ocr_data['height'], dtype=np.int64)[valid]
+    right = x + w
+
+    new_line = np.ones(len(valid), dtype=bool)
+    new_line[1:] = line_id[1:] != line_id[:-1]
+
+    # Right edge reached so far on each line, the cumulative maximum restarts on every line
+    offset = (right.max() - right.min() + 1) * line_id
+    reach = np.maximum.accumulate(right - right.min() + offset) - offset + right.min()
+
+    # A word farther than its own width from the text before it starts a new sentence
+    gap = np.zeros(len(valid), dtype=bool)
+    gap[1:] = ~new_line[1:] & (x[1:] > reach[:-1] + w[1:])
+
+    starts = new_line | gap
+    start_index = np.flatnonzero(starts)
+    counts = np.diff(np.append(start_index, len(valid)))
+
+    # Fall back when a sentence is only one character or a word goes back to the left
+    backward = ~starts[1:] & (x[1:] < x[:-1])
+    short = (counts == 1) & (word_length[valid][start_index] == 1)
+    if backward.any() or short.any():
+        return find_sentence_sequential(ocr_data, threshold)
+
+    left = np.minimum.reduceat(x, start_index)
+    top = np.minimum.reduceat(y, start_index)
+    width = np.maximum.reduceat(right, start_index) - left
+    height = np.maximum.reduceat(h, start_index)
+
+    # Same expression as the sequential version: sum(h * n) / n ** 2, truncated
+    font_size = (np.add.reduceat(h, start_index) * counts).astype(np.float64) / (counts * counts).astype(np.float64)
+
+    sentence_words = words[valid].tolist()
+    bounds = np.append(start_index, len(valid)).tolist()
+
+    result['text'] = [' '.join(sentence_words[bounds[i]:bounds[i + 1]]) for i in range(len(start_index))]
+    result['left'] = left.tolist()
+    result['top'] = top.tolist()
+    result['width'] = width.tolist()
+    result['height'] = height.tolist()
+    result['fsize'] = font_size.astype(np.int64).tolist()
+
+    return result
+
+
+def find_sentence_sequential(ocr_data: ocr_table.OCRTable, threshold:int = 50) -> dict:
     """
-    Group OCR words into sentences based on Tesseract output.
+    Group OCR words into sentences based on Tesseract output, one word at a time.
 
     For each word in the OCR result (with keys such as 'text', 'level', 'left', 'top', 'width', 'height', 'conf'),
     this function concatenates words that are close together (level 5) 
@@ -33,7 +126,7 @@ def find_sentence(ocr_data: dict, threshold:int = 50) -> dict:
     is encountered or when a gap between words is detected.
 
     Args:
-        ocr_data (dict): Dictionary containing Tesseract OCR results.
+        ocr_data (OCRTable or dict): Tesseract OCR results as a columnar table or a pytesseract dictionary.
         threshold (int, optional): Confidence threshold for including words. Defaults to 50.
 
     Returns:
@@ -73,15 +166,18 @@ def find_sentence(ocr_data: dict, threshold:int = 50) -> dict:
             sentence_height = -1
             sentence_font_size = []
 
-    num_words = len(ocr_data.get('text', []))
+    # Read each column once as a list, looping over NumPy arrays element by element is slow
+    columns = {key: ocr_table.column_list(ocr_data, key) for key in ['level', 'left', 'top', 'width', 'height', 'conf', 'text'] if key in ocr_data}
+
+    num_words = len(columns.get('text', []))
     for i in range(num_words):
-        lv = ocr_data['level'][i]
-        x = ocr_data['left'][i]
-        y = ocr_data['top'][i]
-        w = ocr_data['width'][i]
-        h = ocr_data['height'][i]
-        conf = int(ocr_data['conf'][i])
-        word = ocr_data['text'][i].strip()
+        lv = columns['level'][i]
+        x = columns['left'][i]
+        y = columns['top'][i]
+        w = columns['width'][i]
+        h = columns['height'][i]
+        conf = int(columns['conf'][i])
+        word = columns['text'][i].strip()
 
         # Initialize when OCR result level drops to 4
         if lv == 4:
@@ -193,3 +289,96 @@ def make_sentence_block(sentence_data: dict, threshold: float = 1.5) -> dict:
     flush_block()
     
     return result
+
+
+def make_sentence_block_spatial(sentence_data: dict, threshold: float = 1.5) -> dict:
+    """
+    Cluster sentences into paragraph blocks using a sorted spatial index, for multi-column layouts.
+
+    Sentences are sorted by their top edge, and the sentences that may continue a paragraph below a sentence 
+    are found with a binary search over that order. A sentence is linked to a sentence below it
+    when the two overlap horizontally, have similar heights, and the vertical gap is at most `threshold` times the upper height.
+    Links are accepted from the smallest gap upwards, and every sentence keeps at most one link up and one link down,
+    so a heading spanning several columns joins only one of them.
+    Each chain of linked sentences becomes one paragraph block, in the order of its first sentence.
+
+    Args:
+        sentence_data (dict): Dictionary containing sentence data with keys 'text', 'left', 'top', 'width', 'height', and 'fsize'.
+        threshold (float, optional): Threshold factor for grouping sentences. Defaults to 1.5.
+
+    Returns:
+        dict: A dictionary with paragraph data containing keys 'text', 'left', 'top', 'width', 'height', 'line', 'lpos', and 'fsize'.
+    """
+    result = {
+        'text': [],
+        'left': [],
+        'top': [],
+        'width': [],
+        'height': [],
+        'line': [],
+        'lpos': [],
+        'fsize': []
+    }
+
+    count = len(sentence_data['text'])
+    if count < 1:
+        return result
+
+    left = np.asarray(sentence_data['left'], dtype=np.int64)
+    top = np.asarray(sentence_data['top'], dtype=np.int64)
+    width = np.asarray(sentence_data['width'], dtype=np.int64)
+    height = np.asarray(sentence_data['height'], dtype=np.int64)
+    right = left + width
+    bottom = top + height
+
+    # Candidates below sentence i start between half its height above its bottom and `threshold` heights below it
+    order = np.argsort(top, kind='stable')
+    start = np.searchsorted(top[order], bottom - height / 2, side='left')
+    end = np.searchsorted(top[order], bottom + height * threshold, side='right')
+    size = end - start
+
+    upper = np.repeat(np.arange(count), size)
+    offset = np.arange(upper.size) - np.repeat(np.cumsum(size) - size, size)
+    lower = order[np.repeat(start, size) + offset]
+
+    keep = (upper != lower) & (right[upper] > left[lower]) & (right[lower] > left[upper]) \
+           & (height[lower] * threshold >= height[upper]) & (height[upper] * threshold >= height[lower])
+    upper, lower = upper[keep], lower[keep]
+    gap = top[lower] - bottom[upper]
+
+    below = [-1] * count
+    above = [-1] * count
+    for link in np.lexsort((lower, upper, gap)).tolist():
+        i, j = int(upper[link]), int(lower[link])
+        if below[i] == -1 and above[j] == -1:
+            below[i] = j
+            above[j] = i
+
+    # Walk every chain from its top sentence
+    chains = []
+    for head in range(count):
+        if above[head] != -1:
+            continue
+
+        chain = [head]
+        while below[chain[-1]] != -1:
+            chain.append(below[chain[-1]])
+        chains.append(chain)
+
+    chains.sort(key=min)
+
+    left, top, right, height, bottom = left.tolist(), top.tolist(), right.tolist(), height.tolist(), bottom.tolist()
+    for chain in chains:
+        block_left = min(left[i] for i in chain)
+        block_top = min(top[i] for i in chain)
+
+        result['text'].append(' '.join(sentence_data['text'][i] for i in chain))
+        result['left'].append(block_left)
+        result['top'].append(block_top)
+        result['width'].append(max(right[i] for i in chain) - block_left)
+        result['height'].append(max(bottom[i] for i in chain) - block_top)
+        result['line'].append(len(chain))
+        result['lpos'].append([(left[i], top[i], right[i] - left[i], height[i]) for i in chain])
+        result['fsize'].append([sentence_data['fsize'][i] for i in chain])
+
+    return result
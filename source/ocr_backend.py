@@ -0,0 +1,334 @@
+import os
+import warnings
+import threading
+import numpy as np
+import pytesseract
+from concurrent.futures import ProcessPoolExecutor
+
+import ocr_table
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+"""
+OCR backends used by ProcessingBlock.
+The pytesseract backend starts the tesseract binary and exchanges temporary files on every call.
+The tesserocr backend keeps an initialized Tesseract API in the process and passes images through memory,
+and the pool backend keeps several of those engines warm in worker processes.
+https://github.com/sirfz/tesserocr
+"""
+
+OCR_KEYS = ocr_table.OCR_KEYS
+
+# Backend created by `init_worker` inside a worker process
+_WORKER_BACKEND = None
+
+# Long-lived backends shared by every ProcessingBlock in this process
+_BACKENDS = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+class OCRBackend:
+    """
+    Base class of an OCR engine returning word level data for an image array.
+
+    Attributes:
+        lang_ (str): Tesseract language code (e.g., 'eng').
+        psm_ (int or None): Tesseract page segmentation mode, None uses the Tesseract default.
+        oem_ (int or None): Tesseract OCR engine mode, None uses the Tesseract default.
+    """
+    name_ = 'base'
+
+    def __init__(self, lang: str = 'eng', psm: int = None, oem: int = None) -> None:
+        """
+        Initialize the backend with the Tesseract settings.
+
+        Args:
+            lang (str, optional): Tesseract language code. Defaults to 'eng'.
+            psm (int, optional): Page segmentation mode. Defaults to None.
+            oem (int, optional): OCR engine mode. Defaults to None.
+        """
+        self.lang_ = lang
+        self.psm_ = psm
+        self.oem_ = oem
+
+        return
+
+
+    def spec(self) -> tuple:
+        """
+        Return the settings needed to create the same backend in another process.
+
+        Returns:
+            tuple: The backend specification as (name, lang, psm, oem).
+        """
+        return (self.name_, self.lang_, self.psm_, self.oem_)
+
+
+    def image_to_data(self, image: np.ndarray) -> ocr_table.OCRTable:
+        """
+        Perform OCR on an image.
+
+        Args:
+            image (np.ndarray): The input image array.
+
+        Returns:
+            OCRTable: Columnar OCR data, usable like the pytesseract dictionary.
+        """
+        raise NotImplementedError
+
+
+    def map_images(self, images: list) -> list:
+        """
+        Perform OCR on several images.
+
+        Args:
+            images (list): A list of image arrays.
+
+        Returns:
+            list: OCR data for each image, in the same order.
+        """
+        return [self.image_to_data(image) for image in images]
+
+
+    def close(self) -> None:
+        """
+        Release the resources held by the backend.
+        """
+        return
+
+
+class PytesseractBackend(OCRBackend):
+    """
+    OCR backend running the tesseract binary through pytesseract.
+    Used as the fallback when tesserocr is not installed.
+    """
+    name_ = 'pytesseract'
+
+    def image_to_data(self, image: np.ndarray) -> ocr_table.OCRTable:
+        config = ''
+        if self.psm_ is not None:
+            config += f' --psm {self.psm_}'
+        if self.oem_ is not None:
+            config += f' --oem {self.oem_}'
+
+        tsv = pytesseract.image_to_data(image, lang=self.lang_, config=config.strip(), output_type=pytesseract.Output.STRING)
+
+        return ocr_table.OCRTable.from_tsv(tsv, header=True)
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    OCR backend holding an initialized Tesseract API in the current process.
+
+    The language data is loaded once, and images are handed over as raw pixel buffers
+    instead of temporary image files.
+
+    Attributes:
+        api_ (tesserocr.PyTessBaseAPI): The initialized Tesseract API.
+        lock_ (threading.Lock): Lock serializing calls, the API is not thread safe.
+    """
+    name_ = 'tesserocr'
+
+    def __init__(self, lang: str = 'eng', psm: int = None, oem: int = None) -> None:
+        """
+        Initialize the Tesseract API.
+
+        Raises:
+            ImportError: If tesserocr is not installed.
+        """
+        super().__init__(lang, psm, oem)
+
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+
+        self.api_ = tesserocr.PyTessBaseAPI(
+            lang = lang,
+            psm = tesserocr.PSM.AUTO if psm is None else psm,
+            oem = tesserocr.OEM.DEFAULT if oem is None else oem
+        )
+        self.lock_ = threading.Lock()
+
+        return
+
+
+    def image_to_data(self, image: np.ndarray) -> ocr_table.OCRTable:
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+
+        with self.lock_:
+            self.api_.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+            tsv = self.api_.GetTSVText(0)
+
+        return ocr_table.OCRTable.from_tsv(tsv, header=False)
+
+
+    def close(self) -> None:
+        self.api_.End()
+
+        return
+
+
+class WarmPoolBackend(OCRBackend):
+    """
+    OCR backend keeping a pool of worker processes, each with its own initialized engine.
+
+    Images are sent to the workers through the pool's pipes, so no temporary files are written.
+    The workers use tesserocr when it is installed and pytesseract otherwise.
+
+    Attributes:
+        workers_ (int): Number of worker processes.
+        engine_ (str): Name of the backend used inside the workers.
+        executor_ (ProcessPoolExecutor): The process pool.
+    """
+    name_ = 'pool'
+
+    def __init__(self, lang: str = 'eng', psm: int = None, oem: int = None, workers: int = None) -> None:
+        """
+        Start the worker processes.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to the number of CPU cores.
+        """
+        super().__init__(lang, psm, oem)
+
+        self.workers_ = workers or os.cpu_count() or 1
+        self.engine_ = 'tesserocr' if tesserocr is not None else 'pytesseract'
+        self.executor_ = ProcessPoolExecutor(
+            max_workers = self.workers_,
+            initializer = init_worker,
+            initargs = ((self.engine_, lang, psm, oem),)
+        )
+
+        return
+
+
+    def spec(self) -> tuple:
+        return (self.engine_, self.lang_, self.psm_, self.oem_)
+
+
+    def image_to_data(self, image: np.ndarray) -> ocr_table.OCRTable:
+        return self.executor_.submit(worker_image_to_data, image).result()
+
+
+    def map_images(self, images: list) -> list:
+        return list(self.executor_.map(worker_image_to_data, images))
+
+
+    def close(self) -> None:
+        self.executor_.shutdown()
+
+        return
+
+
+def create_backend(name: str = 'pytesseract', \
+                   lang: str = 'eng', \
+                   psm: int = None, \
+                   oem: int = None, \
+                   workers: int = None) -> OCRBackend:
+    """
+    Create a new OCR backend.
+
+    If 'tesserocr' is requested but not installed, the pytesseract backend is returned instead.
+
+    Args:
+        name (str, optional): Backend name, 'pytesseract', 'tesserocr' or 'pool'. Defaults to 'pytesseract'.
+        lang (str, optional): Tesseract language code. Defaults to 'eng'.
+        psm (int, optional): Page segmentation mode. Defaults to None.
+        oem (int, optional): OCR engine mode. Defaults to None.
+        workers (int, optional): Number of worker processes for the 'pool' backend. Defaults to None.
+
+    Returns:
+        OCRBackend: The created backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name == 'pytesseract':
+        return PytesseractBackend(lang, psm, oem)
+
+    if name == 'tesserocr':
+        if tesserocr is None:
+            warnings.warn("tesserocr is not installed, falling back to pytesseract")
+            return PytesseractBackend(lang, psm, oem)
+        return TesserocrBackend(lang, psm, oem)
+
+    if name == 'pool':
+        return WarmPoolBackend(lang, psm, oem, workers)
+
+    raise ValueError(f"Unknown OCR backend: {name}")
+
+
+def get_backend(name: str = 'pytesseract', \
+                lang: str = 'eng', \
+                psm: int = None, \
+                oem: int = None, \
+                workers: int = None) -> OCRBackend:
+    """
+    Return a long-lived OCR backend, creating it on first use.
+
+    Backends are shared by every caller in the process with the same settings,
+    so the engine start-up cost is paid only once.
+
+    Args:
+        Same as `create_backend`.
+
+    Returns:
+        OCRBackend: The shared backend.
+    """
+    key = (name, lang, psm, oem, workers if name == 'pool' else None)
+
+    with _BACKENDS_LOCK:
+        if key not in _BACKENDS:
+            _BACKENDS[key] = create_backend(name, lang, psm, oem, workers)
+
+        return _BACKENDS[key]
+
+
+def close_backends() -> None:
+    """
+    Close every shared backend of this process.
+    """
+    with _BACKENDS_LOCK:
+        for backend in _BACKENDS.values():
+            backend.close()
+        _BACKENDS.clear()
+
+    return
+
+
+def init_worker(spec: tuple = ('pytesseract', 'eng', None, None)) -> None:
+    """
+    Initialize an OCR worker process with its own engine.
+
+    Tesseract uses OpenMP threads internally, which oversubscribes the CPU when several
+    processes run at once, so each worker is limited to a single thread.
+
+    Args:
+        spec (tuple, optional): Backend specification as (name, lang, psm, oem). Defaults to pytesseract.
+    """
+    global _WORKER_BACKEND
+
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    _WORKER_BACKEND = create_backend(*spec)
+
+    return
+
+
+def worker_image_to_data(image: np.ndarray) -> ocr_table.OCRTable:
+    """
+    Perform OCR with the engine of the current worker process.
+
+    Args:
+        image (np.ndarray): The input image array.
+
+    Returns:
+        OCRTable: Columnar OCR data.
+    """
+    if _WORKER_BACKEND is None:
+        init_worker()
+
+    return _WORKER_BACKEND.image_to_data(image)
@@ -0,0 +1,232 @@
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+
+import ocr_table
+
+"""
+Persistent cache of OCR results.
+Results are keyed by the hash of the image and the OCR settings, and stored in a SQLite file in a compact binary form.
+The least recently used entries are evicted when the cache grows beyond its size limit.
+"""
+
+NUMERIC_KEYS = ocr_table.NUMERIC_KEYS
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Calculate SHA-256 hash of a given file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: SHA-256 hash of the file.
+    """
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(65536), b""):
+            sha256_hash.update(byte_block)
+
+    return sha256_hash.hexdigest()
+
+
+def make_key(image_hash: str, settings: dict) -> str:
+    """
+    Build a cache key from the image hash and the settings that change the OCR result.
+
+    Args:
+        image_hash (str): SHA-256 hash of the image file.
+        settings (dict): OCR settings such as language, page segmentation mode and preprocessing.
+
+    Returns:
+        str: The cache key.
+    """
+    payload = json.dumps([image_hash, settings], sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def pack_ocr_data(ocr_data: ocr_table.OCRTable) -> bytes:
+    """
+    Serialize OCR data into a compressed binary blob.
+
+    The numeric columns are stored as one int32 matrix and the text column as NUL separated UTF-8.
+
+    Args:
+        ocr_data (OCRTable or dict): The OCR data.
+
+    Returns:
+        bytes: The serialized data.
+    """
+    ocr_data = ocr_table.as_table(ocr_data)
+    count = ocr_data.num_rows()
+    numbers = np.array([np.asarray(ocr_data[key], dtype=np.int32) for key in NUMERIC_KEYS], dtype=np.int32).reshape(len(NUMERIC_KEYS), count)
+    text = '\0'.join(ocr_data['text'].tolist()).encode('utf-8')
+
+    blob = np.uint32(count).tobytes() + numbers.tobytes() + text
+
+    return zlib.compress(blob)
+
+
+def unpack_ocr_data(blob: bytes) -> ocr_table.OCRTable:
+    """
+    Restore OCR data serialized by `pack_ocr_data`.
+
+    Args:
+        blob (bytes): The serialized data.
+
+    Returns:
+        OCRTable: The restored OCR data.
+    """
+    blob = zlib.decompress(blob)
+    count = int(np.frombuffer(blob, dtype=np.uint32, count=1)[0])
+    numbers_size = 4 * count * len(NUMERIC_KEYS)
+    numbers = np.frombuffer(blob, dtype=np.int32, count=count * len(NUMERIC_KEYS), offset=4).reshape(len(NUMERIC_KEYS), count)
+    text = blob[4 + numbers_size:].decode('utf-8')
+
+    columns = {key: numbers[i] for i, key in enumerate(NUMERIC_KEYS)}
+    columns['text'] = text.split('\0') if count > 0 else []
+
+    return ocr_table.OCRTable(columns)
+
+
+class OCRCache:
+    """
+    A size-bounded, persistent LRU cache of OCR results backed by SQLite.
+
+    The database runs in WAL mode, so several processes may share the same file.
+
+    Attributes:
+        path_ (str): Path to the SQLite file.
+        max_bytes_ (int): Maximum total size of the stored results in bytes.
+        hits_ (int): Number of lookups answered from the cache.
+        misses_ (int): Number of lookups not found in the cache.
+        connection_ (sqlite3.Connection): The database connection.
+        lock_ (threading.Lock): Lock serializing access to the connection.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Open or create the cache database.
+
+        Args:
+            path (str): Path to the SQLite file.
+            max_bytes (int, optional): Maximum total size of the stored results. Defaults to 256 MB.
+        """
+        self.path_ = path
+        self.max_bytes_ = max_bytes
+        self.hits_ = 0
+        self.misses_ = 0
+        self.lock_ = threading.Lock()
+
+        self.connection_ = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection_.execute("PRAGMA journal_mode=WAL")
+        self.connection_.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.connection_.execute("CREATE INDEX IF NOT EXISTS ocr_cache_access ON ocr_cache (last_access)")
+        self.connection_.commit()
+
+        return
+
+
+    def get(self, key: str) -> ocr_table.OCRTable:
+        """
+        Look up OCR data by key and mark it as recently used.
+
+        Args:
+            key (str): The cache key built by `make_key`.
+
+        Returns:
+            OCRTable: The cached OCR data, or None if the key is not cached.
+        """
+        with self.lock_:
+            row = self.connection_.execute("SELECT data FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses_ += 1
+                return None
+
+            self.connection_.execute("UPDATE ocr_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.connection_.commit()
+            self.hits_ += 1
+
+        return unpack_ocr_data(row[0])
+
+
+    def put(self, key: str, ocr_data: ocr_table.OCRTable) -> None:
+        """
+        Store OCR data and evict the least recently used entries if the size limit is exceeded.
+
+        Args:
+            key (str): The cache key built by `make_key`.
+            ocr_data (OCRTable or dict): The OCR data.
+        """
+        blob = pack_ocr_data(ocr_data)
+
+        with self.lock_:
+            self.connection_.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            self.evict()
+            self.connection_.commit()
+
+        return
+
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the total size is within the limit.
+        """
+        total = self.connection_.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+        if total <= self.max_bytes_:
+            return
+
+        expired = []
+        for key, size in self.connection_.execute("SELECT key, size FROM ocr_cache ORDER BY last_access"):
+            if total <= self.max_bytes_:
+                break
+            expired.append((key,))
+            total -= size
+
+        self.connection_.executemany("DELETE FROM ocr_cache WHERE key = ?", expired)
+
+        return
+
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The counters with keys 'hits', 'misses', 'hit_rate', 'entries' and 'bytes'.
+        """
+        with self.lock_:
+            entries, total = self.connection_.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+
+        lookups = self.hits_ + self.misses_
+
+        return {
+            'hits': self.hits_,
+            'misses': self.misses_,
+            'hit_rate': self.hits_ / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': total
+        }
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self.lock_:
+            self.connection_.close()
+
+        return
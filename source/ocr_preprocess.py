@@ -0,0 +1,171 @@
+import cv2
+import numpy as np
+
+import ocr_table
+
+"""
+Preprocessing applied to the image before OCR.
+The text height is estimated from connected components and the image is rescaled so the text
+has the size Tesseract recognizes best, then converted to grayscale or binarized single-channel data.
+OCR boxes are mapped back to the coordinates of the original image afterwards.
+"""
+
+
+def to_single_channel(image: np.ndarray, mode: str = 'gray') -> np.ndarray:
+    """
+    Convert an image into single-channel data for OCR.
+
+    Args:
+        image (np.ndarray): The input image array (BGR or grayscale).
+        mode (str, optional): 'gray' for grayscale, 'binary' for Otsu binarization with dark text on a light background. Defaults to 'gray'.
+
+    Returns:
+        np.ndarray: The single-channel image.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    if mode == 'gray':
+        return gray
+
+    if mode == 'binary':
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # Tesseract expects dark text on a light background
+        if cv2.countNonZero(binary) < binary.size // 2:
+            binary = cv2.bitwise_not(binary)
+
+        return binary
+
+    raise ValueError(f"Unknown preprocessing mode: {mode}")
+
+
+def estimate_text_height(gray: np.ndarray, max_side: int = 1024, min_count: int = 10) -> float:
+    """
+    Estimate the typical character height of an image from its connected components.
+
+    The image is reduced to at most `max_side` pixels per side, binarized,
+    and the median height of the character-like components is returned.
+    For lowercase text this is close to the x-height.
+
+    Args:
+        gray (np.ndarray): The grayscale image array.
+        max_side (int, optional): Longest side of the image used for the estimation. Defaults to 1024.
+        min_count (int, optional): Minimum number of character-like components required. Defaults to 10.
+
+    Returns:
+        float: The estimated character height in original image pixels, or None if there are too few components.
+    """
+    height, width = gray.shape[:2]
+    factor = min(1.0, max_side / max(height, width))
+    small = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA) if factor < 1.0 else gray
+
+    _, binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Text is assumed to be the minority color
+    if cv2.countNonZero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    stats = stats[1:]
+
+    w = stats[:, cv2.CC_STAT_WIDTH]
+    h = stats[:, cv2.CC_STAT_HEIGHT]
+    area = stats[:, cv2.CC_STAT_AREA]
+    fill = area / np.maximum(w * h, 1)
+
+    # Keep components shaped like characters, drop noise, lines and large shapes
+    candidates = (h >= 3) & (h <= small.shape[0] / 5) & (w <= h * 5) & (fill > 0.1) & (fill < 0.95)
+    if np.count_nonzero(candidates) < min_count:
+        return None
+
+    return float(np.median(h[candidates])) / factor
+
+
+def compute_scale(text_height: float, \
+                  target_height: int = 24, \
+                  min_scale: float = 0.25, \
+                  max_scale: float = 4.0, \
+                  tolerance: float = 0.1) -> float:
+    """
+    Calculate the scale factor that brings the text to the target height.
+
+    Args:
+        text_height (float): The estimated character height, None if unknown.
+        target_height (int, optional): Target character height in pixels. Defaults to 24.
+        min_scale (float, optional): Smallest allowed scale factor. Defaults to 0.25.
+        max_scale (float, optional): Largest allowed scale factor. Defaults to 4.0.
+        tolerance (float, optional): Scale factors closer than this to 1 are ignored. Defaults to 0.1.
+
+    Returns:
+        float: The scale factor, 1.0 if no rescaling is needed.
+    """
+    if text_height is None or text_height <= 0:
+        return 1.0
+
+    scale = min(max_scale, max(min_scale, target_height / text_height))
+
+    if abs(scale - 1.0) < tolerance:
+        return 1.0
+
+    return scale
+
+
+def preprocess(image: np.ndarray, mode: str = 'gray', target_height: int = None) -> tuple:
+    """
+    Prepare an image for OCR.
+
+    Args:
+        image (np.ndarray): The input image array.
+        mode (str, optional): Single-channel conversion, 'gray', 'binary' or None to keep the channels. Defaults to 'gray'.
+        target_height (int, optional): Target character height in pixels, None disables rescaling. Defaults to None.
+
+    Returns:
+        tuple: The preprocessed image and the scale factor applied to it as (image, scale).
+    """
+    gray = to_single_channel(image, 'gray')
+
+    scale = 1.0
+    if target_height is not None:
+        scale = compute_scale(estimate_text_height(gray), target_height)
+
+    result = image if mode is None else gray
+
+    if scale != 1.0:
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        result = cv2.resize(result, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    if mode is not None:
+        result = to_single_channel(result, mode)
+
+    return result, scale
+
+
+def rescale_ocr_data(ocr_data: ocr_table.OCRTable, scale: float) -> ocr_table.OCRTable:
+    """
+    Map OCR boxes found on a rescaled image back to the original image coordinates.
+
+    Args:
+        ocr_data (OCRTable or dict): The OCR data.
+        scale (float): The scale factor that was applied to the image.
+
+    Returns:
+        OCRTable: The OCR data with boxes in original image coordinates.
+    """
+    ocr_data = ocr_table.as_table(ocr_data)
+    if scale == 1.0:
+        return ocr_data
+
+    left = np.asarray(ocr_data['left'], dtype=np.float64) / scale
+    top = np.asarray(ocr_data['top'], dtype=np.float64) / scale
+    right = left + np.asarray(ocr_data['width'], dtype=np.float64) / scale
+    bottom = top + np.asarray(ocr_data['height'], dtype=np.float64) / scale
+
+    ocr_data['left'] = np.floor(left)
+    ocr_data['top'] = np.floor(top)
+    ocr_data['width'] = np.ceil(right) - np.floor(left)
+    ocr_data['height'] = np.ceil(bottom) - np.floor(top)
+
+    return ocr_data
@@ -0,0 +1,234 @@
+import numpy as np
+
+"""
+Columnar representation of Tesseract OCR data.
+Each column is a typed NumPy array instead of a Python list, parsed directly from Tesseract TSV output.
+The table behaves like the dictionary returned by pytesseract, so existing callers keep working.
+"""
+
+# Keys of the dictionary returned by pytesseract.image_to_data(output_type=Output.DICT)
+OCR_KEYS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num', \
+            'left', 'top', 'width', 'height', 'conf', 'text']
+
+# Columns stored as integers, every column except the text
+NUMERIC_KEYS = OCR_KEYS[:-1]
+
+
+class OCRTable:
+    """
+    OCR data stored as one NumPy array per column.
+
+    Numeric columns are int32 arrays and the text column is a NumPy unicode array.
+    Indexing by column name returns the array, so `table['left'][i]` and `len(table['text'])`
+    work the same way as with the pytesseract dictionary.
+
+    Attributes:
+        columns_ (dict): Column arrays keyed by the names in `OCR_KEYS`.
+    """
+
+    def __init__(self, columns: dict) -> None:
+        """
+        Initialize the table from column data.
+
+        Args:
+            columns (dict): Column data keyed by the names in `OCR_KEYS`, as lists or arrays of equal length.
+        """
+        self.columns_ = {}
+        for key in OCR_KEYS:
+            self[key] = columns[key]
+
+        return
+
+
+    @classmethod
+    def from_tsv(cls, tsv: str, header: bool = None) -> 'OCRTable':
+        """
+        Parse Tesseract TSV output.
+
+        Numeric values are truncated to integers the same way pytesseract does (`int(float(value))`).
+
+        Args:
+            tsv (str): TSV text produced by Tesseract.
+            header (bool, optional): True if the first row is the column header. Defaults to None (detected).
+
+        Returns:
+            OCRTable: The parsed table.
+        """
+        lines = [line for line in tsv.split('\n') if line]
+        if lines and (header or (header is None and lines[0].startswith('level'))):
+            lines.pop(0)
+
+        if not lines:
+            return cls.empty()
+
+        # Split the text cell off each row, it is missing when the last word of the output is empty
+        rows = [line.rsplit('\t', 1) if line.count('\t') >= len(NUMERIC_KEYS) else [line, ''] for line in lines]
+        text = np.array([row[1] for row in rows], dtype=str)
+
+        # Parse all numeric cells in one call
+        numbers = np.fromstring('\t'.join([row[0] for row in rows]), sep='\t')
+        if numbers.size != len(rows) * len(NUMERIC_KEYS):
+            numbers = np.array([row[0].split('\t') for row in rows], dtype=np.float64)
+        numbers = np.trunc(numbers.reshape(len(rows), len(NUMERIC_KEYS))).astype(np.int32)
+
+        columns = {key: numbers[:, i] for i, key in enumerate(NUMERIC_KEYS)}
+        columns['text'] = text
+
+        return cls(columns)
+
+
+    @classmethod
+    def empty(cls) -> 'OCRTable':
+        """
+        Create a table without rows.
+
+        Returns:
+            OCRTable: The empty table.
+        """
+        return cls({key: [] for key in OCR_KEYS})
+
+
+    @classmethod
+    def concat(cls, tables: list) -> 'OCRTable':
+        """
+        Concatenate several tables row-wise.
+
+        Args:
+            tables (list): The tables or pytesseract dictionaries to concatenate.
+
+        Returns:
+            OCRTable: The concatenated table.
+        """
+        tables = [as_table(table) for table in tables]
+        if not tables:
+            return cls.empty()
+
+        return cls({key: np.concatenate([table[key] for table in tables]) for key in OCR_KEYS})
+
+
+    def num_rows(self) -> int:
+        """
+        Return the number of rows.
+
+        Returns:
+            int: The number of rows.
+        """
+        return len(self.columns_['text'])
+
+
+    def select(self, rows) -> 'OCRTable':
+        """
+        Return a new table with the selected rows.
+
+        Args:
+            rows (np.ndarray or slice): A boolean mask, index array or slice.
+
+        Returns:
+            OCRTable: The selected rows.
+        """
+        return OCRTable({key: column[rows] for key, column in self.columns_.items()})
+
+
+    def shifted(self, x: int, y: int) -> 'OCRTable':
+        """
+        Return a copy with the boxes shifted by an offset.
+
+        Args:
+            x (int): Offset added to the X-coordinates.
+            y (int): Offset added to the Y-coordinates.
+
+        Returns:
+            OCRTable: The shifted table.
+        """
+        columns = dict(self.columns_)
+        columns['left'] = columns['left'] + x
+        columns['top'] = columns['top'] + y
+
+        return OCRTable(columns)
+
+
+    def to_dict(self) -> dict:
+        """
+        Convert the table into the pytesseract dictionary layout with Python lists.
+
+        Returns:
+            dict: OCR data as lists of Python values.
+        """
+        return {key: column.tolist() for key, column in self.columns_.items()}
+
+
+    def keys(self):
+        return self.columns_.keys()
+
+
+    def values(self):
+        return self.columns_.values()
+
+
+    def items(self):
+        return self.columns_.items()
+
+
+    def get(self, key: str, default=None):
+        return self.columns_.get(key, default)
+
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns_[key]
+
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == 'text':
+            self.columns_[key] = np.asarray(value, dtype=str)
+        else:
+            self.columns_[key] = np.asarray(value, dtype=np.int32)
+
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.columns_
+
+
+    def __iter__(self):
+        return iter(self.columns_)
+
+
+    def __len__(self) -> int:
+        return len(self.columns_)
+
+
+    def __repr__(self) -> str:
+        return f"OCRTable(rows={self.num_rows()})"
+
+
+def as_table(ocr_data) -> OCRTable:
+    """
+    Return OCR data as an OCRTable, converting a pytesseract dictionary if needed.
+
+    Args:
+        ocr_data (dict or OCRTable): The OCR data.
+
+    Returns:
+        OCRTable: The OCR data as a table.
+    """
+    if isinstance(ocr_data, OCRTable):
+        return ocr_data
+
+    return OCRTable(ocr_data)
+
+
+def column_list(ocr_data, key: str) -> list:
+    """
+    Return one column of OCR data as a list of Python values.
+
+    Looping over a list is much faster than looping over the elements of a NumPy array.
+
+    Args:
+        ocr_data (dict or OCRTable): The OCR data.
+        key (str): The column name.
+
+    Returns:
+        list: The column values.
+    """
+    column = ocr_data[key]
+
+    return column.tolist() if isinstance(column, np.ndarray) else list(column)
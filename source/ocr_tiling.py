@@ -0,0 +1,413 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+import ocr_backend
+import ocr_table
+
+"""
+Tiled OCR for large images.
+The image is cut into overlapping tiles which are recognized in a process pool.
+Word boxes are shifted back to global coordinates, words cut by a tile edge or found twice in an overlap are dropped,
+and lines split by a tile boundary are joined again so the result keeps the layout of `pytesseract.image_to_data`.
+"""
+
+OCR_KEYS = ocr_backend.OCR_KEYS
+
+
+def make_tiles(image_shape: tuple, tile_size: int = 2048, overlap: int = 256) -> list:
+    """
+    Split an image area into overlapping tiles.
+
+    Tiles are returned in row-major order. The last tile of each row and column is aligned
+    to the image border, so every tile has the full tile size unless the image itself is smaller.
+
+    Args:
+        image_shape (tuple): Shape of the image array (height, width, ...).
+        tile_size (int, optional): Side length of a square tile in pixels. Defaults to 2048.
+        overlap (int, optional): Overlap between neighbouring tiles in pixels. Defaults to 256.
+
+    Returns:
+        list: A list of tiles as tuples (x, y, width, height).
+
+    Raises:
+        ValueError: If the overlap is not smaller than the tile size.
+    """
+    if overlap < 0 or overlap >= tile_size:
+        raise ValueError(f"overlap must be in [0, tile_size), got overlap={overlap}, tile_size={tile_size}")
+
+    image_height, image_width = image_shape[:2]
+    step = tile_size - overlap
+
+    def positions(length: int) -> list:
+        if length <= tile_size:
+            return [0]
+        starts = list(range(0, length - tile_size + 1, step))
+        if starts[-1] + tile_size < length:
+            starts.append(length - tile_size)
+        return starts
+
+    tiles = []
+    for y in positions(image_height):
+        for x in positions(image_width):
+            tiles.append((x, y, min(tile_size, image_width - x), min(tile_size, image_height - y)))
+
+    return tiles
+
+
+def shift_ocr_data(ocr_data: ocr_table.OCRTable, x: int, y: int) -> ocr_table.OCRTable:
+    """
+    Shift the boxes of OCR data by an offset, e.g. from tile to global image coordinates.
+
+    Args:
+        ocr_data (OCRTable or dict): The OCR data.
+        x (int): Offset added to the X-coordinates.
+        y (int): Offset added to the Y-coordinates.
+
+    Returns:
+        OCRTable: The shifted OCR data.
+    """
+    return ocr_table.as_table(ocr_data).shifted(x, y)
+
+
+def collect_lines(tile_data: ocr_table.OCRTable, tile: tuple, image_shape: tuple, edge_margin: int = 2) -> list:
+    """
+    Collect the text lines of a tile, dropping words cut by an inner tile edge.
+
+    A word touching an edge shared with another tile may be only partly visible.
+    Because the tiles overlap, the neighbouring tile sees that word completely, so it is safe to drop it here.
+
+    Args:
+        tile_data (OCRTable or dict): OCR data of the tile in global coordinates.
+        tile (tuple): The tile as (x, y, width, height).
+        image_shape (tuple): Shape of the full image array.
+        edge_margin (int, optional): Distance in pixels at which a word counts as touching an edge. Defaults to 2.
+
+    Returns:
+        list: Lines as dictionaries with keys 'key' (block, paragraph, line numbers) and 'words' (list of word rows).
+    """
+    image_height, image_width = image_shape[:2]
+    tx, ty, tw, th = tile
+
+    inner_left = tx + edge_margin if tx > 0 else -1
+    inner_top = ty + edge_margin if ty > 0 else -1
+    inner_right = tx + tw - edge_margin if tx + tw < image_width else image_width + 1
+    inner_bottom = ty + th - edge_margin if ty + th < image_height else image_height + 1
+
+    tile_data = {key: ocr_table.column_list(tile_data, key) for key in OCR_KEYS}
+    lines = []
+    line_index = {}
+
+    for i in range(len(tile_data['text'])):
+        if tile_data['level'][i] != 5:
+            continue
+
+        x = tile_data['left'][i]
+        y = tile_data['top'][i]
+        w = tile_data['width'][i]
+        h = tile_data['height'][i]
+
+        # Skip words touching an edge shared with a neighbouring tile
+        if x <= inner_left or y <= inner_top or x + w >= inner_right or y + h >= inner_bottom:
+            continue
+
+        key = (tile_data['block_num'][i], tile_data['par_num'][i], tile_data['line_num'][i])
+        if key not in line_index:
+            line_index[key] = len(lines)
+            lines.append({'key': key, 'words': []})
+
+        lines[line_index[key]]['words'].append({k: tile_data[k][i] for k in OCR_KEYS})
+
+    return lines
+
+
+def box_iou(a: dict, b: dict) -> float:
+    """
+    Calculate the intersection over union of two word boxes.
+
+    Args:
+        a (dict): The first word row with 'left', 'top', 'width' and 'height'.
+        b (dict): The second word row with 'left', 'top', 'width' and 'height'.
+
+    Returns:
+        float: The intersection over union in the range [0, 1].
+    """
+    ix = max(0, min(a['left'] + a['width'], b['left'] + b['width']) - max(a['left'], b['left']))
+    iy = max(0, min(a['top'] + a['height'], b['top'] + b['height']) - max(a['top'], b['top']))
+    intersection = ix * iy
+    union = a['width'] * a['height'] + b['width'] * b['height'] - intersection
+
+    return intersection / union if union > 0 else 0.0
+
+
+def remove_duplicates(tile_lines: list, cell_size: int = 256, iou_threshold: float = 0.5) -> list:
+    """
+    Drop words that were recognized by more than one tile inside an overlap area.
+
+    Words are indexed in a uniform grid so each word is only compared with its spatial neighbours.
+    The word from the earlier tile is kept.
+
+    Args:
+        tile_lines (list): For each tile, the list of lines returned by `collect_lines`.
+        cell_size (int, optional): Grid cell size in pixels. Defaults to 256.
+        iou_threshold (float, optional): Minimum overlap for two words to be treated as the same word. Defaults to 0.5.
+
+    Returns:
+        list: The tile lines with duplicated words and empty lines removed.
+    """
+    grid = {}
+    result = []
+
+    for tile_index, lines in enumerate(tile_lines):
+        kept_lines = []
+
+        for line in lines:
+            kept_words = []
+
+            for word in line['words']:
+                x0 = word['left'] // cell_size
+                y0 = word['top'] // cell_size
+                x1 = (word['left'] + word['width']) // cell_size
+                y1 = (word['top'] + word['height']) // cell_size
+                cells = [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+                duplicated = False
+                for cell in cells:
+                    for other_tile, other in grid.get(cell, []):
+                        if other_tile != tile_index and box_iou(word, other) > iou_threshold:
+                            duplicated = True
+                            break
+                    if duplicated:
+                        break
+
+                if duplicated:
+                    continue
+
+                for cell in cells:
+                    grid.setdefault(cell, []).append((tile_index, word))
+                kept_words.append(word)
+
+            if kept_words:
+                kept_lines.append({'key': line['key'], 'words': kept_words})
+
+        result.append(kept_lines)
+
+    return result
+
+
+def merge_lines(tile_lines: list, overlap_ratio: float = 0.5, gap_ratio: float = 2.0) -> list:
+    """
+    Join lines that were split by a tile boundary and put them in the order Tesseract reads a page.
+
+    Two lines from different tiles are joined when they overlap vertically by at least `overlap_ratio`
+    of the smaller line height and the horizontal gap between them is at most `gap_ratio` times that height.
+    A join is refused if the joined line would hold two lines of the same tile, 
+    so the layout found by Tesseract is kept, also through a line of a neighbouring tile.
+
+    The Tesseract blocks of all tiles are gathered into page regions: blocks sharing a joined line, 
+    and blocks continuing each other across a tile boundary, which overlap horizontally by at least `overlap_ratio` 
+    of the narrower block with the lower one starting at most `gap_ratio` line heights below the upper one.  
+    Regions are ordered by the first (tile, block, paragraph, line) key of their lines and the lines of a region by their own first key, 
+    so columns keep the order Tesseract reads them in, and a column running down several tiles stays in one run of lines.
+
+    Args:
+        tile_lines (list): For each tile, the list of lines returned by `remove_duplicates`.
+        overlap_ratio (float, optional): Minimum vertical overlap ratio of lines and horizontal overlap ratio of blocks. Defaults to 0.5.
+        gap_ratio (float, optional): Maximum horizontal gap between lines and vertical gap between blocks relative to the line height. Defaults to 2.0.
+
+    Returns:
+        list: Merged lines in reading order, each a tuple ((region, tile, block, paragraph, line) of its first line, 
+            list of word rows sorted by x-coordinate).
+    """
+    lines = []
+    for tile_index, tile in enumerate(tile_lines):
+        for line in tile:
+            words = line['words']
+            left = min(word['left'] for word in words)
+            top = min(word['top'] for word in words)
+            right = max(word['left'] + word['width'] for word in words)
+            bottom = max(word['top'] + word['height'] for word in words)
+            lines.append(((tile_index,) + tuple(line['key']), left, top, right, bottom, words))
+
+    def find(parent, i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    parent = list(range(len(lines)))
+    tiles = [{line[0][0]} for line in lines]
+
+    # Sweep over lines sorted by top, only lines that can still overlap vertically are compared
+    order = sorted(range(len(lines)), key=lambda i: lines[i][2])
+    for a in range(len(order)):
+        i = order[a]
+        key_i, left_i, top_i, right_i, bottom_i, _ = lines[i]
+
+        for b in range(a + 1, len(order)):
+            j = order[b]
+            key_j, left_j, top_j, right_j, bottom_j, _ = lines[j]
+            if top_j >= bottom_i:
+                break
+            if key_i[0] == key_j[0]:
+                continue
+
+            height = min(bottom_i - top_i, bottom_j - top_j)
+            vertical = min(bottom_i, bottom_j) - max(top_i, top_j)
+            gap = max(left_i, left_j) - min(right_i, right_j)
+
+            if vertical >= height * overlap_ratio and gap <= height * gap_ratio:
+                root_i, root_j = find(parent, i), find(parent, j)
+                if root_i != root_j and tiles[root_i].isdisjoint(tiles[root_j]):
+                    parent[root_j] = root_i
+                    tiles[root_i] |= tiles[root_j]
+
+    # Box and line height of every Tesseract block, keyed by (tile, block)
+    blocks = {}
+    for key, left, top, right, bottom, _ in lines:
+        box = blocks.setdefault(key[:2], [left, top, right, bottom, 0, 0])
+        box[:4] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+        box[4] += bottom - top
+        box[5] += 1
+
+    block_ids = {block: index for index, block in enumerate(blocks)}
+    boxes = list(blocks.values())
+    region_parent = list(range(len(boxes)))
+
+    for i in range(len(lines)):
+        root = find(parent, i)
+        region_parent[find(region_parent, block_ids[lines[i][0][:2]])] = find(region_parent, block_ids[lines[root][0][:2]])
+
+    # Blocks of different tiles continuing the same column, swept by top like the lines
+    block_order = sorted(range(len(boxes)), key=lambda i: boxes[i][1])
+    block_keys = list(blocks)
+    for a in range(len(block_order)):
+        i = block_order[a]
+        left_i, top_i, right_i, bottom_i, height_i, count_i = boxes[i]
+
+        for b in range(a + 1, len(block_order)):
+            j = block_order[b]
+            left_j, top_j, right_j, bottom_j, height_j, count_j = boxes[j]
+            height = min(height_i / count_i, height_j / count_j)
+            if top_j > bottom_i + height_i / count_i * gap_ratio:
+                break
+            if block_keys[i][0] == block_keys[j][0] or top_j - bottom_i > height * gap_ratio:
+                continue
+
+            if min(right_i, right_j) - max(left_i, left_j) >= min(right_i - left_i, right_j - left_j) * overlap_ratio:
+                region_parent[find(region_parent, j)] = find(region_parent, i)
+
+    groups = {}
+    for i in range(len(lines)):
+        root = find(parent, i)
+        if root not in groups:
+            groups[root] = [lines[i][0], []]
+        groups[root][0] = min(groups[root][0], lines[i][0])
+        groups[root][1].extend(lines[i][5])
+
+    regions = {}
+    for key, _ in groups.values():
+        region = find(region_parent, block_ids[key[:2]])
+        regions[region] = min(regions.get(region, key), key)
+
+    region_rank = {region: rank for rank, region in enumerate(sorted(regions, key=regions.get))}
+
+    merged = [((region_rank[find(region_parent, block_ids[key[:2]])],) + key, sorted(words, key=lambda word: word['left'])) \
+              for key, words in groups.values()]
+    merged.sort(key=lambda item: item[0])
+
+    return merged
+
+
+def lines_to_ocr_data(merged_lines: list, image_shape: tuple) -> ocr_table.OCRTable:
+    """
+    Convert merged lines back into the layout of `pytesseract.image_to_data`.
+
+    A page row (level 1) is written first, followed by a line row (level 4) and its word rows (level 5) for every line.  
+    The block number of a line is its page region. Block and paragraph rows (levels 2 and 3) are not reproduced.
+
+    Args:
+        merged_lines (list): Lines returned by `merge_lines`.
+        image_shape (tuple): Shape of the full image array.
+
+    Returns:
+        OCRTable: Columnar OCR data with the same keys as `pytesseract.image_to_data`.
+    """
+    image_height, image_width = image_shape[:2]
+    result = {key: [] for key in OCR_KEYS}
+
+    def append_row(row: dict) -> None:
+        for key in OCR_KEYS:
+            result[key].append(row[key])
+
+    append_row({'level': 1, 'page_num': 1, 'block_num': 0, 'par_num': 0, 'line_num': 0, 'word_num': 0, \
+                'left': 0, 'top': 0, 'width': image_width, 'height': image_height, 'conf': -1, 'text': ''})
+
+    for line_num, ((region, *_), words) in enumerate(merged_lines, start=1):
+        left = min(word['left'] for word in words)
+        top = min(word['top'] for word in words)
+        right = max(word['left'] + word['width'] for word in words)
+        bottom = max(word['top'] + word['height'] for word in words)
+
+        append_row({'level': 4, 'page_num': 1, 'block_num': region + 1, 'par_num': 1, 'line_num': line_num, 'word_num': 0, \
+                    'left': left, 'top': top, 'width': right - left, 'height': bottom - top, 'conf': -1, 'text': ''})
+
+        for word_num, word in enumerate(words, start=1):
+            row = dict(word)
+            row.update({'page_num': 1, 'block_num': region + 1, 'par_num': 1, 'line_num': line_num, 'word_num': word_num})
+            append_row(row)
+
+    return ocr_table.OCRTable(result)
+
+
+def tiled_image_to_data(image: np.ndarray, \
+                        tile_size: int = 2048, \
+                        overlap: int = 256, \
+                        workers: int = None, \
+                        backend: ocr_backend.OCRBackend = None) -> ocr_table.OCRTable:
+    """
+    Perform OCR on a large image by recognizing overlapping tiles in parallel.
+
+    Images that fit into a single tile are recognized directly without starting a process pool.
+    A 'pool' backend recognizes the tiles with its own warm workers,
+    any other backend is recreated once in each worker of a temporary process pool.
+
+    Args:
+        image (np.ndarray): The input image array.
+        tile_size (int, optional): Side length of a square tile in pixels. Defaults to 2048.
+        overlap (int, optional): Overlap between neighbouring tiles in pixels.
+            It should be larger than the biggest expected word. Defaults to 256.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPU cores.
+        backend (OCRBackend, optional): The OCR backend. Defaults to the pytesseract backend.
+
+    Returns:
+        OCRTable: Columnar OCR data in the same layout as `pytesseract.image_to_data`.
+    """
+    if backend is None:
+        backend = ocr_backend.get_backend('pytesseract')
+
+    tiles = make_tiles(image.shape, tile_size, overlap)
+
+    if len(tiles) == 1:
+        return backend.image_to_data(image)
+
+    tile_images = [image[y:y+h, x:x+w] for x, y, w, h in tiles]
+
+    if isinstance(backend, ocr_backend.WarmPoolBackend):
+        tile_results = backend.map_images(tile_images)
+
+    else:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(tiles)))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=ocr_backend.init_worker, initargs=(backend.spec(),)) as executor:
+            tile_results = list(executor.map(ocr_backend.worker_image_to_data, tile_images))
+
+    tile_results = [shift_ocr_data(data, x, y) for data, (x, y, _, _) in zip(tile_results, tiles)]
+
+    tile_lines = [collect_lines(data, tile, image.shape) for data, tile in zip(tile_results, tiles)]
+    tile_lines = remove_duplicates(tile_lines)
+    merged_lines = merge_lines(tile_lines)
+
+    return lines_to_ocr_data(merged_lines, image.shape)
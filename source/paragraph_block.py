@@ -1,15 +1,45 @@
 import numpy as np
 
 import erase_text
+import color_cache
+import text_layout
 
 import argos_translate
 import google_translate_lib
+import google_translate_async
+import translation_dispatch
 
 """
 Class for paragraph and sentence control.
 Manages paragraph blocks by grouping sentences, extracting colors, and performing translations.
 """
 
+def translate_text(text: str, src_lang: str, dest_lang: str, translator_mode: str) -> tuple:
+    """
+    Translate a text with the translator of a translation mode.
+
+    Args:
+        text (str): The text to be translated.
+        src_lang (str): Source language code.
+        dest_lang (str): Target language code.
+        translator_mode (str): Translation mode, 'argos', 'google_lib', 'google_async' or 'hedged'.
+
+    Returns:
+        tuple: The translated text and the engine that served it as (text, engine).
+    """
+    if translator_mode == "hedged":
+        return translation_dispatch.text_translate(text=text, src=src_lang, dest=dest_lang)
+
+    if translator_mode == "google_lib":
+        translated_text = google_translate_lib.text_translate(text=text, src=src_lang, dest=dest_lang)
+    elif translator_mode == "google_async":
+        translated_text = google_translate_async.text_translate(text=text, src=src_lang, dest=dest_lang)
+    else:
+        translated_text = argos_translate.text_translate(text=text, src=src_lang, dest=dest_lang)
+
+    return translated_text, translator_mode
+
+
 class ParagraphBlock:
     """
     Represents a paragraph block extracted from an image containing text.
@@ -17,7 +47,7 @@ class ParagraphBlock:
     This class encapsulates the attributes and functionalities related to a detected text block from an image.
     It stores the bounding box, original text, line layout information, and font sizes for each line. 
     In addition, it provides methods to extract and adjust background and font colors from the image, 
-    distribute translated text across multiple lines according to the measured line widths, 
+    lay out translated text in its line boxes by measured glyph widths, fitting the font size, 
     and perform text translation using an external translation service.
 
     The class is designed to be used in the Tesseract OCR.
@@ -34,12 +64,19 @@ class ParagraphBlock:
         line_positions_ (list): A list of tuples, where each tuple contains the (x, y, width, height) for a line.
         font_size_ (list): A list of font sizes corresponding to each line in the block.
         color_weight_ (int): A weight factor used to adjust or correct the extracted font color.
-        translator_mode_ (str): The translation mode to be used ("argos" or "google_lib").
+        color_method_ (str): The color estimator, "kmeans", "cv2" or "histogram" for `erase_text.make_cluster`, 
+            or "batch" for `erase_text.batch_colors`.
+        translator_mode_ (str): The translation mode to be used ("argos", "google_lib", "google_async" 
+            or "hedged" for the translation dispatcher with fallback between engines).
+        color_cache_ (ColorCache or None): Cache of region colors consulted before clustering a region.
         background_color_ (list or None): The detected background color(s) for the block after color extraction.
         font_color_ (list or None): The adjusted font color(s) for the block after color extraction.
         translated_text_ (list or None): The translated text distributed across lines.
+        translation_ (str or None): The translated text of the whole block.
+        layout_ (tuple or None): The rendered layout of the translation as (text of each line, font size of each line).
         src_lang_ (str or None): The source language code used for translation.
         dest_lang_ (str or None): The target language code used for translation.
+        translation_engine_ (str or None): The engine that served the translation, e.g. the fallback engine of a hedged translation.
     """
 
     def __init__(self, \
@@ -47,7 +84,9 @@ class ParagraphBlock:
                  text: str, line: int, \
                  lpos: list, fsize: list, \
                  color_weight:int=30, \
-                 translator_mode:str='argos') -> None:
+                 translator_mode:str='argos', \
+                 color_method:str='kmeans', \
+                 color_cache:color_cache.ColorCache=None) -> None:
         """
         Initialize a paragraph block with its bounding box, text content, and settings.
 
@@ -61,7 +100,9 @@ class ParagraphBlock:
             lpos (list): List of line positions as tuples (x, y, width, height).
             fsize (list): List of font sizes for each line.
             color_weight (int, optional): Value to adjust the font color. Defaults to 30.
-            translator_mode (str, optional): Translation mode ('argos' or 'google_lib'). Defaults to 'argos'.
+            translator_mode (str, optional): Translation mode ('argos', 'google_lib', 'google_async' or 'hedged'). Defaults to 'argos'.
+            color_method (str, optional): Color estimator ('kmeans', 'cv2', 'histogram' or 'batch'). Defaults to 'kmeans'.
+            color_cache (ColorCache, optional): Cache of region colors. Defaults to None (no caching).
         """
         self.x_ = x
         self.y_ = y
@@ -73,12 +114,17 @@ class ParagraphBlock:
         self.font_size_ = fsize
         self.color_weight_ = color_weight
         self.translator_mode_ = translator_mode
+        self.color_method_ = color_method
+        self.color_cache_ = color_cache
 
         self.background_color_ = None
         self.font_color_ = None
         self.translated_text_ = None
+        self.translation_ = None
+        self.layout_ = None
         self.src_lang_ = None
         self.dest_lang_ = None
+        self.translation_engine_ = None
 
         return
     
@@ -92,7 +138,10 @@ class ParagraphBlock:
         Args:
             image (np.ndarray): The full image array to find color.
         """
-        if self.line_ > 1:
+        if self.color_method_ == 'batch':
+            background_color, font_color = erase_text.batch_colors(image, self.color_rects())
+            self.set_color(background_color, font_color, correction=True)
+        elif self.line_ > 1:
             self.multi_line_init(image)
         else:
             self.single_line_init(image)
@@ -100,18 +149,28 @@ class ParagraphBlock:
         return
     
 
+    def color_rects(self) -> list:
+        """
+        Return the regions whose colors are extracted, the block for a single-line block and every line otherwise.
+
+        Returns:
+            list: The regions as tuples (x, y, width, height).
+        """
+        if self.line_ > 1:
+            return list(self.line_positions_)
+
+        return [(self.x_, self.y_, self.width_, self.height_)]
+    
+
     def single_line_init(self, image: np.ndarray) -> None:
         """
         Extract colors for a single-line block.
         """
         roi = erase_text.find_roi(image, self.x_, self.y_, self.width_, self.height_)
-        cluster = erase_text.make_cluster(roi)
+        background_color, font_color = self.roi_color(roi)
 
-        background_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0))
         self.background_color_ = [background_color]
-
-        font_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1))
-        self.font_color_ = [erase_text.correction_color(font_color, self.color_weight_)]
+        self.font_color_ = [font_color]
 
         return
     
@@ -127,13 +186,10 @@ class ParagraphBlock:
             line_x, line_y, line_w, line_h = position
 
             roi = erase_text.find_roi(image, line_x, line_y, line_w, line_h)
-            cluster = erase_text.make_cluster(roi)
+            background_color, font_color = self.roi_color(roi)
 
-            background_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0))
             bg_colors.append(background_color)
-
-            font_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1))
-            ft_colors.append(erase_text.correction_color(font_color, self.color_weight_))
+            ft_colors.append(font_color)
 
         self.background_color_ = bg_colors
         self.font_color_ = ft_colors
@@ -141,14 +197,46 @@ class ParagraphBlock:
         return
     
 
+    def roi_color(self, roi: np.ndarray) -> tuple:
+        """
+        Extract the background color and the corrected font color of one region.
+
+        If a color cache is set, a region with the same color signature reuses the cached colors without clustering.
+
+        Args:
+            roi (np.ndarray): The region of interest.
+
+        Returns:
+            tuple: The colors as (background color, font color).
+        """
+        key = None
+        if self.color_cache_ is not None:
+            key = (self.color_method_, self.color_weight_, color_cache.roi_fingerprint(roi))
+            cached_color = self.color_cache_.get(key)
+
+            if cached_color is not None:
+                return cached_color
+
+        cluster = erase_text.make_cluster(roi, method=self.color_method_)
+
+        background_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0))
+        font_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1))
+        font_color = erase_text.correction_color(font_color, self.color_weight_)
+
+        if key is not None:
+            self.color_cache_.put(key, (background_color, font_color))
+
+        return background_color, font_color
+    
+
     def distribute_text(self, text: str, line_num: int, line_width: list) -> list:
         """
         Distribute a text string into multiple lines according to specified line widths.
 
-        The text is split into words, 
-        and the number of words allocated to each line is determined
-        by the proportional width of that line.  
-        The final line receives any remaining words.
+        The text is broken by `text_layout.break_lines` with glyph widths estimated from the line font sizes, 
+        words for spaced scripts and characters for Chinese and Japanese.  
+        The final line receives any remaining text.  
+        This split does not depend on a font, the rendered lines are laid out by `layout_text()`.
 
         Args:
             text (str): The text to distribute.
@@ -158,26 +246,7 @@ class ParagraphBlock:
         Returns:
             list: A list of strings, each representing a line of text.
         """
-        tokens = text.split()
-        total_tokens_length = len(tokens)
-        total_width = sum(line_width)
-
-        # Calculate the proportion of tokens for each line.
-        line_ratios = [round(w / total_width, 2) for w in line_width]
-
-        distributed_lines = []
-
-        # Divide one sentence into multiple lines to match the line width ratio
-        for i in range(line_num):
-            if i == line_num - 1:
-                line_tokens = tokens
-                tokens = []
-            else:
-                num_tokens = int(total_tokens_length * line_ratios[i])
-                line_tokens = tokens[:num_tokens]
-                tokens = tokens[num_tokens:]
-
-            distributed_lines.append(" ".join(line_tokens))
+        distributed_lines, _ = text_layout.break_lines(text, line_width[:line_num], self.font_size_[:line_num])
         
         return distributed_lines
     
@@ -186,7 +255,8 @@ class ParagraphBlock:
         """
         Translate the block's text into the target language.
 
-        Uses either the argos_translate or google_translate_lib based on translator_mode.  
+        Uses argos_translate, google_translate_lib, google_translate_async 
+        or the translation dispatcher ('hedged') based on translator_mode.  
         For multi-line blocks, splits the translated text to match line widths.  
         You can check the translated text through `get_translated_text()`
 
@@ -201,10 +271,30 @@ class ParagraphBlock:
         if translator_mode is not None:
             self.translator_mode_ = translator_mode
         
-        if self.translator_mode_ == "google_lib":
-            translated_text = google_translate_lib.text_translate(text=self.text_, src=self.src_lang_, dest=self.dest_lang_)
-        else:
-            translated_text = argos_translate.text_translate(text=self.text_, src=self.src_lang_, dest=self.dest_lang_)
+        translated_text, engine = translate_text(self.text_, self.src_lang_, self.dest_lang_, self.translator_mode_)
+
+        self.apply_translation(translated_text, self.src_lang_, self.dest_lang_, engine)
+
+        return
+
+
+    def apply_translation(self, translated_text: str, src_lang: str, dest_lang: str, engine: str = None) -> None:
+        """
+        Store a translation of the block's text, e.g. from a batch translation of several blocks.
+
+        For multi-line blocks, splits the translated text to match line widths.
+
+        Args:
+            translated_text (str): The translation of the block's text.
+            src_lang (str): Source language code of the translation.
+            dest_lang (str): Target language code of the translation.
+            engine (str, optional): The engine that served the translation. Defaults to None.
+        """
+        self.src_lang_ = src_lang
+        self.dest_lang_ = dest_lang
+        self.translation_engine_ = engine
+        self.translation_ = translated_text
+        self.layout_ = None
 
         if self.line_ > 1:
             line_width = [line_pos[2] for line_pos in self.line_positions_]
@@ -215,6 +305,78 @@ class ParagraphBlock:
         return
 
 
+    def set_color(self, background_color: list, font_color: list, correction: bool = False) -> None:
+        """
+        Set colors extracted outside the block instead of running `color_find()`.
+
+        Args:
+            background_color (list): Background color of each region from `color_rects()`.
+            font_color (list): Font color of each region from `color_rects()`.
+            correction (bool, optional): True if the font colors are raw estimates that still need `erase_text.correction_color`. Defaults to False.
+        """
+        if correction:
+            font_color = [erase_text.correction_color(color, self.color_weight_) for color in font_color]
+
+        self.background_color_ = background_color
+        self.font_color_ = font_color
+
+        return
+
+
+    def set_translated_text(self, translated_text: list, src_lang: str, dest_lang: str, engine: str = None) -> None:
+        """
+        Set a previously translated text instead of running `text_translate()`.
+
+        Args:
+            translated_text (list): The translated text distributed across lines.
+            src_lang (str): Source language code of the translation.
+            dest_lang (str): Target language code of the translation.
+            engine (str, optional): The engine that served the translation. Defaults to None.
+        """
+        self.translated_text_ = translated_text
+        self.translation_ = text_layout.join_lines(translated_text)
+        self.layout_ = None
+        self.src_lang_ = src_lang
+        self.dest_lang_ = dest_lang
+        self.translation_engine_ = engine
+
+        return
+
+
+    def layout_text(self, font_path: str, font_weight: float = 1.0, min_scale: float = 0.5) -> tuple:
+        """
+        Lay out the translation in the line boxes of the block with a font, reducing the font size until it fits.
+
+        The text is broken by measured glyph widths, see `text_layout.fit_text`.  
+        You can check the layout through `get_layout()`
+
+        Args:
+            font_path (str): Path to the font file used for rendering.
+            font_weight (float, optional): Scaling factor applied to the line font sizes. Defaults to 1.0.
+            min_scale (float, optional): Smallest font scale tried before the text overflows the last line. Defaults to 0.5.
+
+        Returns:
+            tuple: The text and font size of each line as (lines, sizes).
+        """
+        line_width = [line_pos[2] for line_pos in self.line_positions_[:self.line_]]
+        sizes = [max(1, int(size * font_weight)) for size in self.font_size_[:self.line_]]
+
+        lines, sizes, _ = text_layout.fit_text(self.translation_ or '', line_width, sizes, font_path, min_scale=min_scale)
+        self.layout_ = (lines, sizes)
+
+        return self.layout_
+
+
+    def get_layout(self) -> tuple:
+        """
+        Return the layout found by `layout_text()`.
+
+        Returns:
+            tuple: The text and font size of each line as (lines, sizes), or None if the block has not been laid out.
+        """
+        return self.layout_
+    
+
     def get_position(self) -> tuple:
         """
         Return the bounding box of the paragraph block as (x, y, width, height).
@@ -227,6 +389,16 @@ class ParagraphBlock:
         return position
     
 
+    def get_text(self) -> str:
+        """
+        Return the original text of the block.
+
+        Returns:
+            str: The original text.
+        """
+        return self.text_
+    
+
     def get_translated_text(self) -> tuple:
         """
         Return the number of lines, line positions, and the translated text.
@@ -239,6 +411,16 @@ class ParagraphBlock:
         return result
     
 
+    def get_translation_engine(self) -> str:
+        """
+        Return the name of the engine that served the translation.
+
+        Returns:
+            str: The engine name, or None if the block has not been translated.
+        """
+        return self.translation_engine_
+    
+
     def get_color(self) -> tuple:
         """
         Return the extracted background and font colors.
@@ -0,0 +1,414 @@
+import re
+import bisect
+import unicodedata
+from operator import mul
+from itertools import accumulate
+from collections import Counter
+
+import font_cache
+
+"""
+Layout of translated text into the line boxes of a paragraph block.
+The text is cut into unbreakable segments: words separated by spaces, and single characters for
+Chinese and Japanese, which are written without spaces. Segments are packed greedily into the lines
+by their measured widths, and the font size of a block is reduced step by step until the
+text fits. Widths are added up from cached glyph advances, so no text is rasterized while fitting.
+"""
+
+# Chinese characters, kana and full-width forms, written without spaces between words
+BREAKABLE_RANGES = "⺀-ヿㇰ-ㇿ㐀-䶿一-鿿豈-﫿＀-￯"
+
+# Characters that do not start a line, they stay with the previous segment (regular expression class)
+NO_LINE_START = "、。，．・：；？！）］｝」』】〕〉》〙〗ー～ゝゞヽヾ々ぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶ,.:;!?)\\]}%'\""
+
+# Characters that do not end a line, they stay with the next segment (regular expression class)
+NO_LINE_END = "（［｛「『【〔〈《〘〖(\\[{"
+
+# One breakable character or a run of other characters, with the opening brackets before and the closing punctuation after it
+SEGMENT_PATTERN = re.compile(f"[{NO_LINE_END}]*(?:[{BREAKABLE_RANGES}]|[^{BREAKABLE_RANGES}]+)[{NO_LINE_START}]*")
+BREAKABLE_PATTERN = re.compile(f"[{BREAKABLE_RANGES}]")
+
+
+def is_breakable(char: str) -> bool:
+    """
+    Check whether a line may break before and after a character.
+
+    Chinese characters, kana and full-width punctuation are written without spaces,
+    so every one of them is a segment of its own. Hangul is written with spaces and breaks at words.
+
+    Args:
+        char (str): A single character.
+
+    Returns:
+        bool: True if the character can be broken on both sides.
+    """
+    return BREAKABLE_PATTERN.fullmatch(char) is not None
+
+
+def split_pieces(text: str) -> tuple:
+    """
+    Cut a text into the segments a line break may not split, each with the space before it.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        tuple: The segments as they are joined into a line, with a leading space if the segment follows a space, 
+            and whether each of them follows a space as (pieces, spaces).
+    """
+    words = text.split()
+
+    # Spaced scripts only break at spaces
+    if BREAKABLE_PATTERN.search(text) is None:
+        return words[:1] + [' ' + word for word in words[1:]], [i > 0 for i in range(len(words))]
+
+    pieces = []
+    spaces = []
+    for word_index, word in enumerate(words):
+        found = SEGMENT_PATTERN.findall(word)
+        if word_index > 0:
+            found[0] = ' ' + found[0]
+
+        pieces.extend(found)
+        spaces.append(word_index > 0)
+        spaces.extend([False] * (len(found) - 1))
+
+    return pieces, spaces
+
+
+def split_segments(text: str) -> list:
+    """
+    Cut a text into the segments a line break may not split.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        list: The segments as tuples (segment, space before), where space before is True if the segment
+            is separated from the previous one by a space.
+    """
+    pieces, spaces = split_pieces(text)
+
+    return [(piece[1:] if space else piece, space) for piece, space in zip(pieces, spaces)]
+
+
+def join_lines(lines: list) -> str:
+    """
+    Join broken lines back into one text, the inverse of `break_lines()` up to repeated spaces.
+
+    Lines are joined with a space, except between two characters that are written without spaces.
+
+    Args:
+        lines (list): The text of each line.
+
+    Returns:
+        str: The joined text.
+    """
+    text = ''
+    for line in lines:
+        if not line:
+            continue
+        if text and not (is_breakable(text[-1]) and is_breakable(line[0])):
+            text += ' '
+        text += line
+
+    return text
+
+
+class EstimatedMetrics:
+    """
+    Glyph widths estimated from the East Asian width of each character, for layouts without a font file.
+
+    Wide characters are one em wide, the others half an em.
+
+    Attributes:
+        size_ (float): The font size in pixels, one em.
+    """
+
+    def __init__(self, size: float) -> None:
+        """
+        Initialize the estimated metrics of a font size.
+
+        Args:
+            size (float): The font size in pixels.
+        """
+        self.size_ = size
+
+        return
+
+
+    def advance(self, char: str) -> float:
+        """
+        Return the estimated advance width of a character.
+
+        Args:
+            char (str): A single character.
+
+        Returns:
+            float: The advance width in pixels.
+        """
+        return self.size_ if unicodedata.east_asian_width(char) in ('W', 'F') else self.size_ * 0.5
+
+
+    def text_width(self, text: str) -> float:
+        """
+        Return the estimated width of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            float: The width in pixels.
+        """
+        return sum(self.advance(char) for char in text)
+
+
+    def glyph_advances(self, text: str) -> list:
+        """
+        Return the estimated advance width of every character of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list: The advance widths in pixels.
+        """
+        return [self.advance(char) for char in text]
+
+
+class MeasuredText:
+    """
+    A text cut into segments and measured once with one font, ready to be packed into lines of any width.
+
+    The segment offsets are prefix sums of the segment widths and the spaces before them, so the segments
+    that fit on a line are found by binary search instead of adding up widths segment by segment.
+
+    Attributes:
+        metrics_ (GlyphMetrics or EstimatedMetrics): The metrics the text is measured with.
+        pieces_ (list): Each segment with the space before it, as it is joined into a line.
+        spaces_ (list): Whether each segment is preceded by a space.
+        characters_ (str): The segments joined, the text as it is measured.
+        bounds_ (list): Index of the first character of each segment in `characters_`, with one more entry for the end.
+        offsets_ (list): Width of the text up to the start of each segment, with one more entry for the end of the text.
+        space_width_ (float): Width of a space.
+    """
+
+    def __init__(self, text: str, metrics, source= None) -> None:
+        """
+        Cut and measure a text.
+
+        Args:
+            text (str): The text.
+            metrics (GlyphMetrics or EstimatedMetrics): The metrics of the font.
+            source (MeasuredText, optional): The same text measured with other metrics, whose segments are reused
+                instead of cutting the text again. Defaults to None.
+        """
+        self.metrics_ = metrics
+        self.space_width_ = metrics.advance(' ')
+
+        if source is None:
+            self.pieces_, self.spaces_ = split_pieces(text)
+            self.characters_ = ''.join(self.pieces_)
+            self.bounds_ = list(accumulate(map(len, self.pieces_), initial=0))
+        else:
+            self.pieces_, self.spaces_ = source.pieces_, source.spaces_
+            self.characters_, self.bounds_ = source.characters_, source.bounds_
+
+        # Prefix sums over the characters, sampled at the segment boundaries
+        character_offsets = list(accumulate(metrics.glyph_advances(self.characters_), initial=0.0))
+        self.offsets_ = list(map(character_offsets.__getitem__, self.bounds_))
+
+        return
+
+
+    def total_width(self) -> float:
+        """
+        Return the width of the whole text on one line.
+
+        Returns:
+            float: The width in the units of the metrics.
+        """
+        return self.offsets_[-1]
+
+
+    def split_piece(self, text: str, capacity: float) -> int:
+        """
+        Count the characters of a segment that fit on an empty line, at least one.
+
+        Args:
+            text (str): The segment.
+            capacity (float): Width of the line.
+
+        Returns:
+            int: The number of characters.
+        """
+        used = 0.0
+        count = 0
+        for char in text:
+            used += self.metrics_.advance(char)
+            if count > 0 and used > capacity:
+                break
+            count += 1
+
+        return count
+
+
+    def pack(self, capacities: list, measures: list= None) -> tuple:
+        """
+        Pack the segments greedily into lines.
+
+        A segment wider than an empty line is split between characters.
+        Segments left over after the last line are appended to it.
+
+        Args:
+            capacities (list): Width of each line, in the units of the metrics of the line.
+            measures (list, optional): The text measured with the metrics of each line, created from this one
+                so the segments are shared. Defaults to None (every line uses this one).
+
+        Returns:
+            tuple: The text of each line and whether all segments fit as (lines, fits).
+        """
+        pieces = self.pieces_
+        count = len(pieces)
+        index = 0
+        pending = ''
+        lines = []
+
+        if measures is None:
+            measures = [self] * len(capacities)
+
+        for capacity, measure in zip(capacities, measures):
+            offsets = measure.offsets_
+            line = ''
+            used = 0.0
+
+            # The rest of a segment split at the end of the previous line
+            if pending:
+                width = measure.metrics_.text_width(pending)
+                if width > capacity:
+                    split = measure.split_piece(pending, capacity)
+                    lines.append(pending[:split])
+                    pending = pending[split:]
+                    continue
+                line, used, pending = pending, width, ''
+
+            if index < count:
+                # The space before the first segment of a line is dropped
+                gap = measure.space_width_ if self.spaces_[index] and not line else 0.0
+                end = bisect.bisect_right(offsets, offsets[index] + gap + capacity - used, index + 1) - 1
+
+                if end > index:
+                    text = ''.join(pieces[index:end])
+                    line += text[1:] if gap else text
+                    index = end
+                elif not line:
+                    segment = pieces[index].lstrip(' ')
+                    split = measure.split_piece(segment, capacity)
+                    line, pending = segment[:split], segment[split:]
+                    index += 1
+
+            lines.append(line)
+
+        fits = index == count and not pending
+        if not fits and lines:
+            lines[-1] = (lines[-1] + pending + ''.join(pieces[index:])).strip()
+
+        return lines, fits
+
+
+def break_lines(text: str, widths: list, sizes: list, metrics=None) -> tuple:
+    """
+    Break a text into lines of the given widths without changing the font size.
+
+    Args:
+        text (str): The text.
+        widths (list): Width of each line box in pixels.
+        sizes (list): Font size of each line in pixels.
+        metrics (GlyphMetrics, optional): Metrics of the font at the largest size of `sizes`. Defaults to None (estimated widths).
+
+    Returns:
+        tuple: The text of each line and whether the text fits as (lines, fits).
+    """
+    reference = max(sizes) if sizes else 1
+    if metrics is None:
+        metrics = EstimatedMetrics(reference)
+
+    capacities = [width * reference / max(1, size) for width, size in zip(widths, sizes)]
+
+    return MeasuredText(text, metrics).pack(capacities)
+
+
+def fit_text(text: str, \
+             widths: list, \
+             sizes: list, \
+             font_path: str, \
+             font_index: int= 0, \
+             min_scale: float= 0.5) -> tuple:
+    """
+    Lay out a text in the line boxes of a block, reducing the font size until it fits.
+
+    Font sizes are integers, so the largest line size is tried from its full size down to `min_scale` of it,
+    and the other lines are scaled with it. Every line is measured with the metrics of the size it is drawn at,
+    and a size fits when all segments are packed and every line measures at most the width of its box.
+    Packing is not monotonic in the size, so no size is skipped by a search. Instead a size is only packed
+    if the text could fit at all: drawn with the narrowest advance of each character among the line sizes,
+    less the spaces dropped at the line starts, it must not be wider than all boxes together.
+    Sizes below 1 are raised to 1. If the text does not fit even at `min_scale`, the remaining text is put on the last line.
+
+    Args:
+        text (str): The text.
+        widths (list): Width of each line box in pixels.
+        sizes (list): Font size of each line in pixels at scale 1.
+        font_path (str): Path to the font file.
+        font_index (int, optional): Face index inside a font collection. Defaults to 0.
+        min_scale (float, optional): Smallest font scale tried. Defaults to 0.5.
+
+    Returns:
+        tuple: The text of each line, the font size of each line and whether the text fits as (lines, sizes, fits).
+    """
+    if not sizes:
+        return [], [], not text.strip()
+
+    # A line of a very small block can round to size 0, which has no font
+    sizes = [max(1, size) for size in sizes]
+    reference = max(sizes)
+    measured = MeasuredText(text, font_cache.get_metrics(font_path, reference, font_index))
+    measures = {reference: measured}
+
+    # Each distinct character with its number of occurrences, to bound the width of the text at a size
+    counts = Counter(measured.characters_)
+    characters = ''.join(counts)
+    total_width = sum(widths)
+
+    def scaled_sizes(target):
+        return [max(1, size * target // reference) for size in sizes]
+
+    def may_fit(line_sizes):
+        metrics = [font_cache.get_metrics(font_path, size, font_index) for size in set(line_sizes)]
+        advances = list(map(min, *(m.glyph_advances(characters) for m in metrics))) if len(metrics) > 1 else metrics[0].glyph_advances(characters)
+        dropped = len(widths) * max(m.advance(' ') for m in metrics)
+        return sum(map(mul, counts.values(), advances)) - dropped <= total_width
+
+    def layout(line_sizes):
+        for size in set(line_sizes).difference(measures):
+            measures[size] = MeasuredText(text, font_cache.get_metrics(font_path, size, font_index), measured)
+
+        line_measures = [measures[size] for size in line_sizes]
+        lines, fits = measured.pack(widths, line_measures)
+
+        # A character wider than its box is still put on the line, and the prefix sums may round down
+        fits = fits and all(measure.metrics_.text_width(line) <= width for line, width, measure in zip(lines, widths, line_measures))
+        return lines, fits
+
+    low = max(1, int(reference * min_scale + 0.999))
+    for target in range(reference, low - 1, -1):
+        line_sizes = scaled_sizes(target)
+        if may_fit(line_sizes):
+            lines, fits = layout(line_sizes)
+            if fits:
+                return lines, line_sizes, fits
+
+    line_sizes = scaled_sizes(low)
+    lines, fits = layout(line_sizes)
+
+    return lines, line_sizes, fits
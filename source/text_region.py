@@ -0,0 +1,160 @@
+import cv2
+import numpy as np
+
+import ocr_backend
+import ocr_table
+import ocr_tiling
+
+"""
+Cheap text region proposal run before OCR.
+Text has dense, high-contrast edges, so a morphological gradient followed by a horizontal closing
+turns words and lines into solid blobs whose bounding boxes are used as OCR crops.
+Only those crops are recognized, and an image without any candidate region skips OCR entirely.
+"""
+
+
+def merge_rects(rects: list) -> list:
+    """
+    Merge overlapping rectangles until no two rectangles overlap.
+
+    Args:
+        rects (list): Rectangles as tuples (x, y, width, height).
+
+    Returns:
+        list: The merged rectangles sorted by (y, x).
+    """
+    boxes = [[x, y, x + w, y + h] for x, y, w, h in rects]
+
+    merged = True
+    while merged:
+        merged = False
+        result = []
+
+        for box in sorted(boxes):
+            for other in result:
+                if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    other[0] = min(other[0], box[0])
+                    other[1] = min(other[1], box[1])
+                    other[2] = max(other[2], box[2])
+                    other[3] = max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(box)
+
+        boxes = result
+
+    return sorted([(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes], key=lambda rect: (rect[1], rect[0]))
+
+
+def propose_regions(image: np.ndarray, \
+                    max_side: int = 2048, \
+                    min_height: int = 6, \
+                    min_density: float = 0.2, \
+                    min_contrast: int = 40, \
+                    padding: int = 8) -> list:
+    """
+    Propose rectangles that are likely to contain text.
+
+    Args:
+        image (np.ndarray): The input image array (BGR or grayscale).
+        max_side (int, optional): Longest side of the image used for the detection. Defaults to 2048.
+        min_height (int, optional): Minimum height of a candidate in detection pixels. Defaults to 6.
+        min_density (float, optional): Minimum fraction of edge pixels inside a candidate. Defaults to 0.2.
+        min_contrast (int, optional): Minimum gradient value counted as an edge, so smooth images yield no edges. Defaults to 40.
+        padding (int, optional): Padding added around each region in image pixels. Defaults to 8.
+
+    Returns:
+        list: Merged text regions as tuples (x, y, width, height) in image coordinates, empty if no text is found.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    image_height, image_width = gray.shape[:2]
+
+    factor = min(1.0, max_side / max(image_height, image_width))
+    small = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA) if factor < 1.0 else gray
+
+    # Edges of characters, then join characters of the same line into one blob
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    _, edges = cv2.threshold(gradient, max(otsu, min_contrast), 255, cv2.THRESH_BINARY)
+    closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    rects = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+
+        if h < min_height or w < min_height:
+            continue
+        # Text blobs are filled with edges, photo content and large shapes are not
+        if cv2.countNonZero(edges[y:y+h, x:x+w]) < w * h * min_density:
+            continue
+
+        x0 = max(0, int(x / factor) - padding)
+        y0 = max(0, int(y / factor) - padding)
+        x1 = min(image_width, int((x + w) / factor) + padding)
+        y1 = min(image_height, int((y + h) / factor) + padding)
+        rects.append((x0, y0, x1 - x0, y1 - y0))
+
+    return merge_rects(rects)
+
+
+def concat_ocr_data(region_data: list, image_shape: tuple) -> ocr_table.OCRTable:
+    """
+    Combine the OCR data of several regions into the layout of a single page.
+
+    Page rows of the regions are replaced by one page row for the whole image,
+    and block numbers are renumbered so they stay unique.
+
+    Args:
+        region_data (list): OCR data of each region, already in image coordinates.
+        image_shape (tuple): Shape of the full image array.
+
+    Returns:
+        OCRTable: Columnar OCR data of the whole image.
+    """
+    image_height, image_width = image_shape[:2]
+    page_row = {'level': [1], 'page_num': [1], 'block_num': [0], 'par_num': [0], 'line_num': [0], 'word_num': [0], \
+                'left': [0], 'top': [0], 'width': [image_width], 'height': [image_height], 'conf': [-1], 'text': ['']}
+    tables = [ocr_table.OCRTable(page_row)]
+
+    block_offset = 0
+    for data in region_data:
+        data = ocr_table.as_table(data)
+        table = data.select(data['level'] != 1)
+
+        if table.num_rows() > 0:
+            table['block_num'] = table['block_num'] + block_offset
+            block_offset += int(data['block_num'].max())
+
+        tables.append(table)
+
+    return ocr_table.OCRTable.concat(tables)
+
+
+def region_image_to_data(image: np.ndarray, \
+                         backend: ocr_backend.OCRBackend = None, \
+                         regions: list = None) -> ocr_table.OCRTable:
+    """
+    Perform OCR only on the proposed text regions of an image.
+
+    Args:
+        image (np.ndarray): The input image array.
+        backend (OCRBackend, optional): The OCR backend. Defaults to the pytesseract backend.
+        regions (list, optional): Text regions as tuples (x, y, width, height). Defaults to `propose_regions(image)`.
+
+    Returns:
+        OCRTable: Columnar OCR data, containing only the page row if no region was found.
+    """
+    if backend is None:
+        backend = ocr_backend.get_backend('pytesseract')
+
+    if regions is None:
+        regions = propose_regions(image)
+
+    crops = [image[y:y+h, x:x+w] for x, y, w, h in regions]
+    region_data = backend.map_images(crops) if crops else []
+    region_data = [ocr_tiling.shift_ocr_data(data, x, y) for data, (x, y, _, _) in zip(region_data, regions)]
+
+    return concat_ocr_data(region_data, image.shape)
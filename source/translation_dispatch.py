@@ -0,0 +1,492 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import argos_translate
+import google_translate_lib
+import google_translate_async
+
+"""
+Translation dispatcher with hedged requests and automatic fallback between engines.
+Each text is sent to the primary (online) engine first. If it has not answered within a high percentile
+of its recent latencies, the same text is also sent to the fallback (local Argos) engine, and whichever
+result arrives first is used. The primary engine is abandoned after a per-request deadline,
+and a circuit breaker sends every request straight to the fallback engine after repeated failures.
+"""
+
+# Translation functions by engine name, called as function(text=, dest=, src=)
+ENGINES = {
+    'argos': argos_translate.text_translate,
+    'google_lib': google_translate_lib.text_translate,
+    'google_async': google_translate_async.text_translate
+}
+
+# Dispatcher used by the 'hedged' translator mode, created on first use
+DEFAULT_DISPATCHER = None
+DEFAULT_LOCK = threading.Lock()
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker counting consecutive failures of an engine.
+
+    After `failure_threshold` consecutive failures the breaker opens and `allow()` returns False.  
+    Once `reset_timeout` seconds have passed, one trial request is allowed (half-open);
+    a success closes the breaker, a failure opens it again for another `reset_timeout`.
+
+    Attributes:
+        failure_threshold_ (int): Number of consecutive failures opening the breaker.
+        reset_timeout_ (float): Seconds the breaker stays open before a trial request.
+        failures_ (int): Number of consecutive failures.
+        opened_at_ (float or None): Monotonic time the breaker was opened or last allowed a trial request, None if closed.
+        trips_ (int): Number of times the breaker opened.
+        lock_ (threading.Lock): Lock guarding the state.
+    """
+
+    def __init__(self, failure_threshold: int= 5, reset_timeout: float= 30.0) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int, optional): Number of consecutive failures opening the breaker. Defaults to 5.
+            reset_timeout (float, optional): Seconds the breaker stays open before a trial request. Defaults to 30.0.
+        """
+        self.failure_threshold_ = failure_threshold
+        self.reset_timeout_ = reset_timeout
+        self.failures_ = 0
+        self.opened_at_ = None
+        self.trips_ = 0
+        self.lock_ = threading.Lock()
+
+        return
+
+
+    def allow(self) -> bool:
+        """
+        Return whether a request may be sent to the engine.
+
+        Returns:
+            bool: True if the breaker is closed or a trial request is due.
+        """
+        with self.lock_:
+            if self.opened_at_ is None:
+                return True
+
+            if time.monotonic() - self.opened_at_ >= self.reset_timeout_:
+                self.opened_at_ = time.monotonic()
+                return True
+
+        return False
+
+
+    def record_success(self) -> None:
+        """
+        Close the breaker and reset the failure count.
+        """
+        with self.lock_:
+            self.failures_ = 0
+            self.opened_at_ = None
+
+        return
+
+
+    def record_failure(self) -> None:
+        """
+        Count a failure and open the breaker when the threshold is reached.
+        """
+        with self.lock_:
+            self.failures_ += 1
+
+            if self.failures_ >= self.failure_threshold_:
+                if self.opened_at_ is None:
+                    self.trips_ += 1
+                self.opened_at_ = time.monotonic()
+
+        return
+
+
+    def is_open(self) -> bool:
+        """
+        Return whether the breaker is open.
+
+        Returns:
+            bool: True if requests are currently sent to the fallback engine.
+        """
+        return self.opened_at_ is not None
+
+
+class LatencyTracker:
+    """
+    Recent latencies of an engine, used to decide when to send a hedged request.
+
+    Attributes:
+        samples_ (deque): The latest latencies in seconds.
+        min_samples_ (int): Number of samples needed before the percentile is used.
+        lock_ (threading.Lock): Lock guarding the samples.
+    """
+
+    def __init__(self, window: int= 200, min_samples: int= 10) -> None:
+        """
+        Initialize an empty tracker.
+
+        Args:
+            window (int, optional): Number of latest latencies kept. Defaults to 200.
+            min_samples (int, optional): Number of samples needed before the percentile is used. Defaults to 10.
+        """
+        self.samples_ = deque(maxlen=window)
+        self.min_samples_ = min_samples
+        self.lock_ = threading.Lock()
+
+        return
+
+
+    def add(self, seconds: float) -> None:
+        """
+        Record the latency of a successful request.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        with self.lock_:
+            self.samples_.append(seconds)
+
+        return
+
+
+    def percentile(self, q: float, default: float) -> float:
+        """
+        Return a percentile of the recent latencies.
+
+        Args:
+            q (float): The percentile as a fraction, e.g. 0.95.
+            default (float): Value returned while there are fewer than `min_samples_` samples.
+
+        Returns:
+            float: The percentile in seconds.
+        """
+        with self.lock_:
+            samples = sorted(self.samples_)
+
+        if len(samples) < self.min_samples_:
+            return default
+
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class TranslationDispatcher:
+    """
+    Dispatch translations to a primary engine with a hedged request to a fallback engine.
+
+    Attributes:
+        primary_ (str): Name of the primary engine in `engines_`.
+        fallback_ (str): Name of the fallback engine in `engines_`.
+        engines_ (dict): Translation functions by engine name.
+        deadline_ (float): Seconds after which a primary request is abandoned and counted as a failure.
+        hedge_percentile_ (float): Percentile of the primary latency after which the hedged request is sent.
+        hedge_delay_ (float): Delay before the hedged request while there are too few latency samples.
+        breaker_ (CircuitBreaker): Circuit breaker of the primary engine.
+        latency_ (LatencyTracker): Recent latencies of the primary engine.
+        max_workers_ (int): Number of threads running the requests of each engine.
+        executor_ (ThreadPoolExecutor): Threads running the primary engine requests.
+        fallback_executor_ (ThreadPoolExecutor): Threads running the fallback engine requests, 
+            so hedged requests do not wait behind slow primary requests.
+        served_ (dict): Number of translations served by each engine.
+        hedged_ (int): Number of hedged requests sent.
+        timeouts_ (int): Number of primary requests abandoned at the deadline.
+        failures_ (int): Number of failed primary requests.
+        lock_ (threading.Lock): Lock guarding the counters.
+    """
+
+    def __init__(self, primary: str= 'google_async', \
+                 fallback: str= 'argos', \
+                 deadline: float= 10.0, \
+                 hedge_percentile: float= 0.95, \
+                 hedge_delay: float= 1.0, \
+                 failure_threshold: int= 5, \
+                 reset_timeout: float= 30.0, \
+                 max_workers: int= 16, \
+                 engines: dict= None) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            primary (str, optional): Name of the primary engine. Defaults to 'google_async'.
+            fallback (str, optional): Name of the fallback engine. Defaults to 'argos'.
+            deadline (float, optional): Seconds after which a primary request is abandoned. Defaults to 10.0.
+            hedge_percentile (float, optional): Percentile of the primary latency after which the hedged request is sent. Defaults to 0.95.
+            hedge_delay (float, optional): Delay before the hedged request until enough latencies are recorded. Defaults to 1.0.
+            failure_threshold (int, optional): Number of consecutive primary failures opening the circuit breaker. Defaults to 5.
+            reset_timeout (float, optional): Seconds the circuit breaker stays open before a trial request. Defaults to 30.0.
+            max_workers (int, optional): Number of threads running the requests of each engine. Defaults to 16.
+            engines (dict, optional): Translation functions by engine name. Defaults to `ENGINES`.
+        """
+        self.engines_ = ENGINES if engines is None else engines
+        if primary not in self.engines_ or fallback not in self.engines_:
+            raise ValueError(f"Unknown translation engine: {primary if primary not in self.engines_ else fallback}")
+
+        self.primary_ = primary
+        self.fallback_ = fallback
+        self.deadline_ = deadline
+        self.hedge_percentile_ = hedge_percentile
+        self.hedge_delay_ = hedge_delay
+        self.breaker_ = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency_ = LatencyTracker()
+        self.max_workers_ = max_workers
+        self.executor_ = ThreadPoolExecutor(max_workers=max_workers)
+        self.fallback_executor_ = ThreadPoolExecutor(max_workers=max_workers)
+        self.served_ = {primary: 0, fallback: 0}
+        self.hedged_ = 0
+        self.timeouts_ = 0
+        self.failures_ = 0
+        self.lock_ = threading.Lock()
+
+        return
+
+
+    def count(self, name: str, engine: str= None) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): The counter, 'served', 'hedged', 'timeouts' or 'failures'.
+            engine (str, optional): The engine whose served count is incremented if `name` is 'served'.
+        """
+        with self.lock_:
+            if name == 'served':
+                self.served_[engine] += 1
+            else:
+                setattr(self, name + '_', getattr(self, name + '_') + 1)
+
+        return
+
+
+    def submit(self, engine: str, text: str, dest: str, src: str):
+        """
+        Start a request on an engine.
+
+        Args:
+            engine (str): The engine name.
+            text (str): The text to be translated.
+            dest (str): The destination language code.
+            src (str): The source language code.
+
+        Returns:
+            Future: The future of the translated text.
+        """
+        executor = self.fallback_executor_ if engine == self.fallback_ else self.executor_
+
+        return executor.submit(self.engines_[engine], text=text, dest=dest, src=src)
+
+
+    def translate(self, text: str, dest: str, src: str= None) -> tuple:
+        """
+        Translate a text with the first engine that answers.
+
+        The primary engine gets the request first. If it fails, the fallback engine translates the text.  
+        If it is slower than the hedge delay (the configured percentile of its recent latencies), 
+        the fallback engine gets the same request and the first successful result is returned.  
+        While the circuit breaker is open, only the fallback engine is used.
+
+        Args:
+            text (str): The text to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code. Defaults to None.
+
+        Returns:
+            tuple: The translated text and the name of the engine that served it as (text, engine).
+
+        Raises:
+            Exception: If both engines fail.
+        """
+        if not self.breaker_.allow():
+            return self.translate_fallback(text, dest, src)
+
+        start = time.monotonic()
+        primary = self.submit(self.primary_, text, dest, src)
+
+        # Latencies of successful requests, also of those answered after the fallback,
+        # but not of those answered after the deadline, which would push the hedge delay up to the deadline
+        def record_latency(future):
+            latency = time.monotonic() - start
+            if future.exception() is None and latency <= self.deadline_:
+                self.latency_.add(latency)
+        primary.add_done_callback(record_latency)
+
+        hedge_delay = min(self.latency_.percentile(self.hedge_percentile_, self.hedge_delay_), self.deadline_)
+        wait([primary], timeout=hedge_delay)
+
+        if primary.done():
+            if primary.exception() is None:
+                self.breaker_.record_success()
+                self.count('served', self.primary_)
+                return primary.result(), self.primary_
+
+            self.breaker_.record_failure()
+            self.count('failures')
+            return self.translate_fallback(text, dest, src)
+
+        # The primary engine is slow, race it against the fallback engine
+        self.count('hedged')
+        fallback = self.submit(self.fallback_, text, dest, src)
+        pending = {primary, fallback}
+        error = None
+
+        while pending:
+            timeout = None
+            if primary in pending:
+                timeout = start + self.deadline_ - time.monotonic()
+
+                if timeout <= 0:
+                    pending.discard(primary)
+                    self.breaker_.record_failure()
+                    self.count('timeouts')
+                    continue
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                engine = self.primary_ if future is primary else self.fallback_
+
+                if future.exception() is None:
+                    if future is primary:
+                        self.breaker_.record_success()
+                    self.count('served', engine)
+                    return future.result(), engine
+
+                error = future.exception()
+                if future is primary:
+                    self.breaker_.record_failure()
+                    self.count('failures')
+
+        raise Exception(f"Translation failed on {self.primary_} and {self.fallback_}: {error}")
+
+
+    def translate_batch(self, texts: list, dest: str, src: str= None) -> list:
+        """
+        Translate several texts concurrently, each with its own hedged request.
+
+        Args:
+            texts (list): The texts to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code. Defaults to None.
+
+        Returns:
+            list: Tuples (text, engine) in the order of the input texts.
+        """
+        if not texts:
+            return []
+
+        # Separate threads wait for the results, the request threads of `executor_` stay free for the engines
+        with ThreadPoolExecutor(max_workers=min(len(texts), self.max_workers_)) as executor:
+            return list(executor.map(lambda text: self.translate(text, dest, src), texts))
+
+
+    def translate_fallback(self, text: str, dest: str, src: str= None) -> tuple:
+        """
+        Translate a text with the fallback engine only.
+
+        Args:
+            text (str): The text to be translated.
+            dest (str): The destination language code.
+            src (str, optional): The source language code. Defaults to None.
+
+        Returns:
+            tuple: The translated text and the name of the fallback engine as (text, engine).
+        """
+        translated_text = self.engines_[self.fallback_](text=text, dest=dest, src=src)
+        self.count('served', self.fallback_)
+
+        return translated_text, self.fallback_
+
+
+    def stats(self) -> dict:
+        """
+        Return the dispatcher counters.
+
+        Returns:
+            dict: The counters with keys 'served', 'hedged', 'timeouts', 'failures', 'breaker_trips', 'breaker_open' and 'hedge_delay'.
+        """
+        with self.lock_:
+            served = dict(self.served_)
+
+        return {
+            'served': served,
+            'hedged': self.hedged_,
+            'timeouts': self.timeouts_,
+            'failures': self.failures_,
+            'breaker_trips': self.breaker_.trips_,
+            'breaker_open': self.breaker_.is_open(),
+            'hedge_delay': self.latency_.percentile(self.hedge_percentile_, self.hedge_delay_)
+        }
+
+
+    def close(self) -> None:
+        """
+        Stop the request threads without waiting for abandoned requests.
+        """
+        self.executor_.shutdown(wait=False)
+        self.fallback_executor_.shutdown(wait=False)
+
+        return
+
+
+def set_default(dispatcher: TranslationDispatcher) -> None:
+    """
+    Set the dispatcher used by the 'hedged' translator mode.
+
+    Args:
+        dispatcher (TranslationDispatcher): The dispatcher, or None to create a default one on next use.
+    """
+    global DEFAULT_DISPATCHER
+
+    DEFAULT_DISPATCHER = dispatcher
+
+    return
+
+
+def get_default() -> TranslationDispatcher:
+    """
+    Return the shared dispatcher, creating one with the default engines on first use.
+
+    Returns:
+        TranslationDispatcher: The shared dispatcher.
+    """
+    global DEFAULT_DISPATCHER
+
+    if DEFAULT_DISPATCHER is None:
+        with DEFAULT_LOCK:
+            if DEFAULT_DISPATCHER is None:
+                DEFAULT_DISPATCHER = TranslationDispatcher()
+
+    return DEFAULT_DISPATCHER
+
+
+def text_translate(text: str, dest: str, src: str= None) -> tuple:
+    """
+    Translate a text through the shared dispatcher.
+
+    Args:
+        text (str): The text to be translated.
+        dest (str): The destination language code.
+        src (str, optional): The source language code. Defaults to None.
+
+    Returns:
+        tuple: The translated text and the name of the engine that served it as (text, engine).
+    """
+    return get_default().translate(text, dest, src)
+
+
+def text_translate_batch(texts: list, dest: str, src: str= None) -> list:
+    """
+    Translate several texts concurrently through the shared dispatcher.
+
+    Args:
+        texts (list): The texts to be translated.
+        dest (str): The destination language code.
+        src (str, optional): The source language code. Defaults to None.
+
+    Returns:
+        list: Tuples (text, engine) in the order of the input texts.
+    """
+    return get_default().translate_batch(texts, dest, src)
\ No newline at end of file
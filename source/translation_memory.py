@@ -0,0 +1,270 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+"""
+Persistent translation memory.
+Translations are keyed by the engine, the model version, the languages and the normalized source text,
+and stored in a SQLite file shared by the CLI, the server workers and text-to-speech.
+Recently used entries are also kept in an in-process LRU so repeated strings skip the database.
+"""
+
+# Translation memory used by the translator modules, None disables it
+DEFAULT_MEMORY = None
+
+
+def set_default(memory: 'TranslationMemory') -> None:
+    """
+    Set the translation memory used by `argos_translate` and `google_translate_lib`.
+
+    Args:
+        memory (TranslationMemory): The translation memory, None disables it.
+    """
+    global DEFAULT_MEMORY
+
+    DEFAULT_MEMORY = memory
+
+    return
+
+
+def get_default() -> 'TranslationMemory':
+    """
+    Return the translation memory used by the translator modules.
+
+    Returns:
+        TranslationMemory: The translation memory, or None if it is disabled.
+    """
+    return DEFAULT_MEMORY
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a source text so equivalent strings share one entry.
+
+    The text is converted to Unicode NFC form and runs of whitespace are collapsed into single spaces.
+
+    Args:
+        text (str): The source text.
+
+    Returns:
+        str: The normalized text.
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def make_key(engine: str, model: str, src: str, dest: str, text: str) -> str:
+    """
+    Build a memory key from the translation settings and the normalized text.
+
+    Args:
+        engine (str): The translation engine, e.g. 'argos'.
+        model (str): The model or library version of the engine.
+        src (str): The source language code.
+        dest (str): The destination language code.
+        text (str): The normalized source text.
+
+    Returns:
+        str: The memory key.
+    """
+    payload = json.dumps([engine, model, src, dest, text], ensure_ascii=False, separators=(',', ':'))
+
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    A size-bounded translation memory backed by SQLite with an in-process LRU on top.
+
+    The database runs in WAL mode with a busy timeout, so several server workers may read and write the same file.
+
+    Attributes:
+        path_ (str): Path to the SQLite file.
+        max_entries_ (int): Maximum number of stored translations in the database.
+        evict_batch_ (int): Number of entries deleted below the limit on eviction, so the next one is that many inserts away.
+        count_ (int): Running number of entries in the database, counted on open and after each eviction.
+        memory_entries_ (int): Maximum number of translations kept in the in-process LRU.
+        entries_ (OrderedDict): In-process LRU of translations, from least to most recently used.
+        hits_ (int): Number of lookups answered from the in-process LRU or the database.
+        memory_hits_ (int): Number of lookups answered from the in-process LRU.
+        misses_ (int): Number of lookups not found.
+        connection_ (sqlite3.Connection): The database connection.
+        lock_ (threading.Lock): Lock serializing access to the connection and the LRU.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, memory_entries: int = 4096, evict_batch: int = None) -> None:
+        """
+        Open or create the translation memory database.
+
+        Args:
+            path (str): Path to the SQLite file.
+            max_entries (int, optional): Maximum number of stored translations. Defaults to 200000.
+            memory_entries (int, optional): Maximum number of translations in the in-process LRU. Defaults to 4096.
+            evict_batch (int, optional): Number of entries deleted below the limit on eviction. Defaults to 1% of max_entries.
+        """
+        self.path_ = path
+        self.max_entries_ = max_entries
+        self.evict_batch_ = evict_batch if evict_batch is not None else max(1, max_entries // 100)
+        self.memory_entries_ = memory_entries
+        self.entries_ = OrderedDict()
+        self.hits_ = 0
+        self.memory_hits_ = 0
+        self.misses_ = 0
+        self.lock_ = threading.Lock()
+
+        self.connection_ = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection_.execute("PRAGMA journal_mode=WAL")
+        self.connection_.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory ("
+            "key TEXT PRIMARY KEY, engine TEXT NOT NULL, src TEXT, dest TEXT NOT NULL, "
+            "source_text TEXT NOT NULL, translated_text TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.connection_.execute("CREATE INDEX IF NOT EXISTS translation_memory_access ON translation_memory (last_access)")
+        self.connection_.commit()
+        self.count_ = self.connection_.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+
+        return
+
+
+    def get(self, engine: str, model: str, src: str, dest: str, text: str) -> str:
+        """
+        Look up the translation of a text.
+
+        Args:
+            engine (str): The translation engine.
+            model (str): The model or library version of the engine.
+            src (str): The source language code.
+            dest (str): The destination language code.
+            text (str): The source text, normalized before the lookup.
+
+        Returns:
+            str: The stored translation, or None if the text has not been translated with these settings.
+        """
+        key = make_key(engine, model, src, dest, normalize_text(text))
+
+        with self.lock_:
+            translated_text = self.entries_.get(key)
+            if translated_text is not None:
+                self.entries_.move_to_end(key)
+                self.hits_ += 1
+                self.memory_hits_ += 1
+                return translated_text
+
+            row = self.connection_.execute("SELECT translated_text FROM translation_memory WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses_ += 1
+                return None
+
+            self.connection_.execute("UPDATE translation_memory SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.connection_.commit()
+            self.hits_ += 1
+            self.remember(key, row[0])
+
+        return row[0]
+
+
+    def put(self, engine: str, model: str, src: str, dest: str, text: str, translated_text: str) -> None:
+        """
+        Store the translation of a text and evict the least recently used entries beyond the size limit.
+
+        Args:
+            engine (str): The translation engine.
+            model (str): The model or library version of the engine.
+            src (str): The source language code.
+            dest (str): The destination language code.
+            text (str): The source text, normalized before storing.
+            translated_text (str): The translation.
+        """
+        normalized = normalize_text(text)
+        key = make_key(engine, model, src, dest, normalized)
+
+        with self.lock_:
+            now = time.time()
+            cursor = self.connection_.execute(
+                "INSERT OR IGNORE INTO translation_memory (key, engine, src, dest, source_text, translated_text, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, engine, src, dest, normalized, translated_text, now)
+            )
+            if cursor.rowcount == 1:
+                self.count_ += 1
+            else:
+                self.connection_.execute(
+                    "UPDATE translation_memory SET translated_text = ?, last_access = ? WHERE key = ?",
+                    (translated_text, now, key)
+                )
+
+            if self.count_ > self.max_entries_:
+                self.evict()
+            self.connection_.commit()
+            self.remember(key, translated_text)
+
+        return
+
+
+    def remember(self, key: str, translated_text: str) -> None:
+        """
+        Add a translation to the in-process LRU, the caller holds the lock.
+        """
+        self.entries_[key] = translated_text
+        self.entries_.move_to_end(key)
+
+        while len(self.entries_) > self.memory_entries_:
+            self.entries_.popitem(last=False)
+
+        return
+
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries beyond the limit and `evict_batch_` more, the caller holds the lock.
+
+        Called when the running count exceeds the limit. The count is then taken from the database,
+        since other processes sharing the file insert and evict as well.
+        """
+        count = self.connection_.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        if count > self.max_entries_:
+            excess = count - max(self.max_entries_ - self.evict_batch_, 0)
+            self.connection_.execute(
+                "DELETE FROM translation_memory WHERE key IN "
+                "(SELECT key FROM translation_memory ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            count -= excess
+
+        self.count_ = count
+
+        return
+
+
+    def stats(self) -> dict:
+        """
+        Return the memory counters.
+
+        Returns:
+            dict: The counters with keys 'hits', 'memory_hits', 'misses', 'hit_rate' and 'entries'.
+        """
+        with self.lock_:
+            entries = self.connection_.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+
+        lookups = self.hits_ + self.misses_
+
+        return {
+            'hits': self.hits_,
+            'memory_hits': self.memory_hits_,
+            'misses': self.misses_,
+            'hit_rate': self.hits_ / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self.lock_:
+            self.connection_.close()
+
+        return
@@ -0,0 +1,222 @@
+import re
+
+import translation_memory
+
+"""
+Translation work list of one image.
+The texts of all paragraph blocks are normalized and deduplicated, texts without anything to translate
+(numbers, prices, URLs, e-mail addresses, symbols) and texts already written in the destination language are skipped,
+and only the remaining unique texts are sent to the translator. The results are fanned back out to every block.
+The language check compares Unicode scripts, so it only recognizes a destination language
+whose script differs from the source language, e.g. Korean text in an English to Korean translation.
+"""
+
+# Tokens that are kept as they are: URLs, e-mail addresses, numbers with units, prices, percentages and dates, and symbols
+TOKEN_PATTERN = re.compile(
+    r'(?:https?://\S+|www\.\S+'
+    r'|[\w.+-]+@[\w-]+(?:\.[\w-]+)+'
+    r'|[(\[]?[-+]?[$€£¥₩]?\d[\d.,:/-]*(?:%|[kKmM]|[$€£¥₩])?[)\]]?[.,;:!?]?'
+    r'|[^\w\s]+)'
+)
+
+# Characters of each script, the Japanese script includes the Han characters used with kana
+SCRIPT_PATTERNS = {
+    'Latin': re.compile(r'[A-Za-zÀ-ɏ]'),
+    'Hangul': re.compile(r'[가-힣ᄀ-ᇿ㄰-㆏]'),
+    'Japanese': re.compile(r'[぀-ヿㇰ-ㇿ㐀-䶿一-鿿]'),
+    'Han': re.compile(r'[㐀-䶿一-鿿]'),
+    'Cyrillic': re.compile(r'[Ѐ-ӿ]'),
+    'Greek': re.compile(r'[Ͱ-Ͽ]'),
+    'Arabic': re.compile(r'[؀-ۿ]'),
+    'Hebrew': re.compile(r'[֐-׿]'),
+    'Thai': re.compile(r'[฀-๿]'),
+    'Devanagari': re.compile(r'[ऀ-ॿ]')
+}
+
+# Hiragana and katakana, which tell Japanese from Chinese
+KANA_PATTERN = re.compile(r'[぀-ヿ]')
+
+# Script of each language code, languages not listed are written in the Latin script
+LANGUAGE_SCRIPTS = {
+    'ko': 'Hangul',
+    'ja': 'Japanese',
+    'zh': 'Han', 'zh-cn': 'Han', 'zh-tw': 'Han', 'zt': 'Han',
+    'ru': 'Cyrillic', 'uk': 'Cyrillic', 'bg': 'Cyrillic', 'sr': 'Cyrillic',
+    'el': 'Greek',
+    'ar': 'Arabic', 'fa': 'Arabic', 'ur': 'Arabic',
+    'he': 'Hebrew',
+    'th': 'Thai',
+    'hi': 'Devanagari'
+}
+
+# Marker of the translator that served a skipped text
+SKIPPED = 'skipped'
+
+
+def language_script(lang: str) -> str:
+    """
+    Return the script a language is written in.
+
+    Args:
+        lang (str): The language code, None if unknown.
+
+    Returns:
+        str: The script name, a key of `SCRIPT_PATTERNS`, or None if the language is unknown.
+    """
+    if lang is None:
+        return None
+
+    return LANGUAGE_SCRIPTS.get(lang.lower(), 'Latin')
+
+
+def is_translatable(text: str) -> bool:
+    """
+    Return whether a text contains anything to translate.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        bool: False if every token is a number, price, URL, e-mail address or symbol.
+    """
+    return not all(TOKEN_PATTERN.fullmatch(token) for token in text.split())
+
+
+def script_share(text: str, script: str) -> float:
+    """
+    Return the share of the letters of a text written in a script.
+
+    Args:
+        text (str): The text.
+        script (str): The script name, a key of `SCRIPT_PATTERNS`.
+
+    Returns:
+        float: The share between 0 and 1, 0 for a text without letters.
+    """
+    letters = sum(1 for char in text if char.isalpha())
+    if letters == 0:
+        return 0.0
+
+    return len(SCRIPT_PATTERNS[script].findall(text)) / letters
+
+
+def is_in_language(text: str, src: str, dest: str, threshold: float = 0.8) -> bool:
+    """
+    Return whether a text is already written in the destination language, judged by its script.
+
+    Only a destination script different from the source script can be recognized. 
+    Without a source language, a Latin destination script is not recognized either, 
+    because the unknown source may also be written in it.
+
+    Args:
+        text (str): The text.
+        src (str): The source language code, None if unknown.
+        dest (str): The destination language code.
+        threshold (float, optional): Share of letters in the destination script needed. Defaults to 0.8.
+
+    Returns:
+        bool: True if the text is considered to be in the destination language.
+    """
+    dest_script = language_script(dest)
+    src_script = language_script(src)
+
+    if dest_script == src_script or (src_script is None and dest_script == 'Latin'):
+        return False
+
+    # Japanese shares the Han characters with Chinese, kana are needed to tell them apart
+    if dest_script == 'Han' and KANA_PATTERN.search(text):
+        return False
+
+    return script_share(text, dest_script) >= threshold
+
+
+class TranslationPlan:
+    """
+    The translation work list of the blocks of one image.
+
+    Attributes:
+        texts_ (list): The unique normalized texts to translate.
+        assignments_ (list): For each block, the index into `texts_`, or the text kept as is if the block is skipped.
+        stats_ (dict): Counters with keys 'blocks', 'translated', 'duplicates', 'non_translatable', 'same_language' and 'avoided'.
+    """
+
+    def __init__(self, texts: list, src: str, dest: str, enabled: bool = True) -> None:
+        """
+        Build the work list from the texts of the blocks.
+
+        Args:
+            texts (list): The text of each block.
+            src (str): The source language code, None if unknown.
+            dest (str): The destination language code.
+            enabled (bool, optional): If False, every text is translated as is, once per block. Defaults to True.
+        """
+        self.texts_ = []
+        self.assignments_ = []
+        self.stats_ = {'blocks': len(texts), 'translated': 0, 'duplicates': 0, 'non_translatable': 0, 'same_language': 0, 'avoided': 0}
+
+        if not enabled:
+            self.texts_ = list(texts)
+            self.assignments_ = list(range(len(texts)))
+            self.stats_['translated'] = len(texts)
+            return
+
+        index = {}
+        for text in texts:
+            normalized = translation_memory.normalize_text(text)
+
+            if not is_translatable(normalized):
+                self.assignments_.append(text)
+                self.stats_['non_translatable'] += 1
+            elif is_in_language(normalized, src, dest):
+                self.assignments_.append(text)
+                self.stats_['same_language'] += 1
+            elif normalized in index:
+                self.assignments_.append(index[normalized])
+                self.stats_['duplicates'] += 1
+            else:
+                index[normalized] = len(self.texts_)
+                self.assignments_.append(len(self.texts_))
+                self.texts_.append(normalized)
+
+        self.stats_['translated'] = len(self.texts_)
+        self.stats_['avoided'] = len(texts) - len(self.texts_)
+
+        return
+
+
+    def fan_out(self, translated_texts: list, engines: list = None) -> tuple:
+        """
+        Distribute the translations of the unique texts back to the blocks.
+
+        Args:
+            translated_texts (list): The translation of each text in `texts_`.
+            engines (list, optional): The engine that served each translation. Defaults to None.
+
+        Returns:
+            tuple: The translated text and the engine of each block as (texts, engines), 
+                skipped blocks keep their text and get the engine `SKIPPED`.
+        """
+        if engines is None:
+            engines = [None] * len(translated_texts)
+
+        block_texts = []
+        block_engines = []
+        for assignment in self.assignments_:
+            if isinstance(assignment, int):
+                block_texts.append(translated_texts[assignment])
+                block_engines.append(engines[assignment])
+            else:
+                block_texts.append(assignment)
+                block_engines.append(SKIPPED)
+
+        return block_texts, block_engines
+
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the plan.
+
+        Returns:
+            dict: The counters, 'avoided' is the number of translation calls saved compared to one call per block.
+        """
+        return dict(self.stats_)
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import ocr_table
+import make_sentence_block
+
+
+'''
+Check that the vectorized find_sentence gives the same output as find_sentence_sequential,
+and compare their speed on synthetic pages with 10k+ words.
+
+Pages are generated with random gaps, confidences and empty words.
+With --irregular, some pages also contain one-character sentences and words going back to the left,
+which exercise the sequential fallback.
+
+usage: python bench_find_sentence.py [--words 20000] [--pages 200]
+'''
+
+
+def make_page(word_count, irregular=False):
+    rows = {key: [] for key in ocr_table.OCR_KEYS}
+
+    def add(level, x, y, w, h, conf, text):
+        for key, value in zip(['level', 'left', 'top', 'width', 'height', 'conf', 'text'], [level, x, y, w, h, conf, text]):
+            rows[key].append(value)
+        for key in ['page_num', 'block_num', 'par_num', 'line_num', 'word_num']:
+            rows[key].append(1)
+
+    add(1, 0, 0, 5000, 8000, -1, '')
+    line = 0
+    words = 0
+    while words < word_count:
+        line += 1
+        y = line * 30
+        x = random.randint(0, 50)
+        add(4, x, y, 4000, 24, -1, '')
+        for _ in range(random.randint(1, 15)):
+            w = random.randint(5, 120)
+            h = random.randint(12, 30)
+            text = random.choice(['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'of', ' ', ''])
+            if irregular and random.random() < 0.02:
+                text = random.choice(['a', 'I', '-'])
+            if irregular and random.random() < 0.01:
+                x = max(0, x - random.randint(50, 200))
+            add(5, x, y + random.randint(-3, 3), w, h, random.choice([-1, 30, 60, 95.5, 96]), text)
+            x += w + random.choice([5, 10, 15, 200])
+            words += 1
+
+    return rows
+
+
+def measure(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(0)
+
+    # Equivalence on many small pages, regular and irregular
+    for i in range(args.pages):
+        page = make_page(random.randint(1, 300), irregular=i % 2 == 1)
+        for data in [page, ocr_table.OCRTable(page)]:
+            for threshold in [0, 50, 90]:
+                expected = make_sentence_block.find_sentence_sequential(data, threshold)
+                assert make_sentence_block.find_sentence(data, threshold) == expected, f"page {i} differs"
+    print(f"{args.pages} pages identical")
+
+    # Speed on a dense page
+    page = ocr_table.OCRTable(make_page(args.words))
+    sequential_time, sequential = measure(lambda: make_sentence_block.find_sentence_sequential(page))
+    vectorized_time, vectorized = measure(lambda: make_sentence_block.find_sentence(page))
+    assert sequential == vectorized
+
+    print(f"{args.words} words, {len(vectorized['text'])} sentences")
+    print(f"sequential {sequential_time * 1000:8.1f} ms   vectorized {vectorized_time * 1000:8.1f} ms   speedup {sequential_time / vectorized_time:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
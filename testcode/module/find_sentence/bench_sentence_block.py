@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import make_sentence_block
+import translation_plan
+
+
+'''
+Compare the sequential and the spatial paragraph clustering on synthetic multi-column pages.
+Tesseract usually reads a column to its end, but on newspapers and UI screenshots the reading order
+often jumps between columns line by line, which fragments the sequential scan.
+For each mode reports the grouping time, the number of blocks against the true number of paragraphs,
+how many blocks are exactly one paragraph or mix several, and the translation calls of the blocks
+(one per block, and after translation_plan removes duplicates and untranslatable text).
+With --translate the blocks are also translated with Argos, which needs the package for --src and --dest installed.
+
+usage: python bench_sentence_block.py [--columns 3] [--paragraphs 200] [--interleave 0.5] [--translate] [--src en] [--dest ko]
+'''
+
+
+def make_page(columns, paragraphs, interleave):
+    lines = []
+    column_width = 600
+    y = [40] * columns
+    for p in range(paragraphs):
+        c = p % columns
+        for k in range(random.randint(2, 8)):
+            h = 20
+            lines.append((p, k, c, 20 + c * (column_width + 60), y[c], random.randint(300, column_width), h))
+            y[c] += 26
+        y[c] += 40
+
+    # Reading order: by column, with a share of lines read across columns by height
+    lines.sort(key=lambda line: (line[2], line[4]))
+    if interleave > 0:
+        count = int(len(lines) * interleave)
+        mixed = sorted(lines[:count], key=lambda line: (line[4], line[2]))
+        lines = mixed + lines[count:]
+
+    data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'fsize': []}
+    paragraph = {}
+    for p, k, c, x, y, w, h in lines:
+        for key, value in zip(data.keys(), [f"Line {k} of paragraph {p} is printed in column {c}.", x, y, w, h, h - 4]):
+            data[key].append(value)
+        paragraph[(x, y)] = p
+
+    return data, paragraph
+
+
+def measure(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def check_blocks(blocks, paragraph):
+    sizes = {}
+    for p in paragraph.values():
+        sizes[p] = sizes.get(p, 0) + 1
+
+    whole = mixed = 0
+    for lpos in blocks['lpos']:
+        members = {paragraph[(x, y)] for x, y, _, _ in lpos}
+        if len(members) > 1:
+            mixed += 1
+        elif len(lpos) == sizes[members.pop()]:
+            whole += 1
+    return whole, mixed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--interleave", type=float, default=0.5)
+    parser.add_argument("--translate", action="store_true", help="Translate the blocks of each mode with Argos")
+    parser.add_argument("--src", type=str, default="en")
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    random.seed(0)
+    page, paragraph = make_page(args.columns, args.paragraphs, args.interleave)
+    print(f"{len(page['text'])} sentences, {args.paragraphs} paragraphs in {args.columns} columns")
+
+    if args.translate:
+        import argos_translate
+        argos_translate.text_translate(text="Hello world.", dest=args.dest, src=args.src)
+
+    for name, func in [("sequential", make_sentence_block.make_sentence_block), ("spatial", make_sentence_block.make_sentence_block_spatial)]:
+        elapsed, blocks = measure(lambda: func(page))
+        whole, mixed = check_blocks(blocks, paragraph)
+        calls = translation_plan.TranslationPlan(blocks['text'], args.src, args.dest).stats()['translated']
+        line = f"{name:>10} : {elapsed * 1000:8.2f} ms  blocks {len(blocks['text']):5d}  whole {whole:5d}  mixed {mixed:4d}  translation calls {len(blocks['text']):5d} ({calls} planned)"
+
+        if args.translate:
+            start = time.perf_counter()
+            for text in blocks['text']:
+                argos_translate.text_translate(text=text, dest=args.dest, src=args.src)
+            line += f"  translation {time.perf_counter() - start:7.2f} s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import ocr_backend
+
+
+'''
+Measure the per-image overhead of the OCR backends.
+The image is cut into small crops, similar to the short captions and UI screenshots the server receives,
+and every crop is recognized by each backend. The difference to the in-process engine is the cost of
+starting the tesseract binary, loading the language data and writing temporary files.
+
+usage: python bench_ocr_backend.py <image> [--crop 256] [--count 50] [--workers 4]
+'''
+
+
+def make_crops(image, crop, count):
+    height, width = image.shape[:2]
+    crops = []
+    for y in range(0, max(height - crop, 0) + 1, crop):
+        for x in range(0, max(width - crop, 0) + 1, crop):
+            crops.append(image[y:y+crop, x:x+crop])
+            if len(crops) == count:
+                return crops
+    return crops
+
+
+def measure(name, backend, crops):
+    # Warm up: the first call pays the engine start-up
+    start = time.perf_counter()
+    backend.image_to_data(crops[0])
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.map_images(crops)
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:>12} : first call {first * 1000:8.1f} ms  per image {elapsed / len(crops) * 1000:8.1f} ms")
+    return elapsed / len(crops)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image", type=str)
+    parser.add_argument("--crop", type=int, default=256)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    image = cv2.imread(args.image)
+    if image is None:
+        raise ValueError(f"Unable to load image from path: {args.image}")
+
+    crops = make_crops(image, args.crop, args.count)
+    print(f"{len(crops)} crops of {args.crop}x{args.crop}")
+
+    base = measure("pytesseract", ocr_backend.create_backend("pytesseract"), crops)
+
+    if ocr_backend.tesserocr is not None:
+        backend = ocr_backend.create_backend("tesserocr")
+        in_process = measure("tesserocr", backend, crops)
+        backend.close()
+        print(f"{'saved':>12} : {(base - in_process) * 1000:8.1f} ms per image")
+    else:
+        print("tesserocr is not installed, skipping the in-process engine")
+
+    backend = ocr_backend.create_backend("pool", workers=args.workers)
+    measure(f"pool x{args.workers}", backend, crops)
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
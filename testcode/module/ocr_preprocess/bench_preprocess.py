@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import ocr_backend
+import ocr_preprocess
+
+
+'''
+Measure OCR wall time per megapixel with and without the preprocessing stage.
+Preprocessing time is included in the measurement, the megapixels are those of the original image.
+Mean confidence and word count show whether the rescaling helped or hurt recognition.
+
+usage: python bench_preprocess.py <image> [<image> ...] [--text_height 24] [--engine pytesseract]
+'''
+
+
+def summary(ocr_data):
+    conf = [c for lv, c, t in zip(ocr_data['level'], ocr_data['conf'], ocr_data['text']) if lv == 5 and t.strip()]
+    return len(conf), (float(np.mean(conf)) if conf else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", type=str, nargs="+")
+    parser.add_argument("--text_height", type=int, default=24)
+    parser.add_argument("--engine", type=str, default="pytesseract")
+    args = parser.parse_args()
+
+    backend = ocr_backend.get_backend(args.engine)
+    settings = [
+        ("original", None, None),
+        ("gray", "gray", None),
+        ("binary", "binary", None),
+        ("gray+scale", "gray", args.text_height),
+        ("binary+scale", "binary", args.text_height),
+    ]
+
+    for path in args.images:
+        image = cv2.imread(path)
+        if image is None:
+            raise ValueError(f"Unable to load image from path: {path}")
+
+        megapixels = image.shape[0] * image.shape[1] / 1e6
+        print(f"{path} ({megapixels:.2f} MP)")
+
+        for name, mode, text_height in settings:
+            start = time.perf_counter()
+            if mode is None and text_height is None:
+                ocr_image, scale = image, 1.0
+            else:
+                ocr_image, scale = ocr_preprocess.preprocess(image, mode, text_height)
+            ocr_data = ocr_preprocess.rescale_ocr_data(backend.image_to_data(ocr_image), scale)
+            elapsed = time.perf_counter() - start
+
+            words, conf = summary(ocr_data)
+            print(f"  {name:>12} : {elapsed / megapixels:7.3f} s/MP  scale {scale:5.2f}  words {words:5d}  mean conf {conf:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+import numpy as np
+from pytesseract.pytesseract import file_to_dict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import ocr_table
+import make_sentence_block
+
+
+'''
+Compare the pytesseract TSV parser with the columnar OCRTable on a synthetic dense page.
+Checks that both give the same values and sentences, and reports parse and find_sentence time.
+
+usage: python bench_ocr_table.py [--words 30000]
+'''
+
+
+def make_tsv(word_count, words_per_line=12):
+    rows = ["\t".join(ocr_table.OCR_KEYS), "1\t1\t0\t0\t0\t0\t0\t0\t5000\t8000\t-1\t"]
+    line = 0
+    for i in range(word_count):
+        if i % words_per_line == 0:
+            line += 1
+            rows.append(f"4\t1\t1\t1\t{line}\t0\t10\t{line * 30}\t4000\t24\t-1\t")
+        x = 10 + (i % words_per_line) * 90
+        conf = random.uniform(0, 100)
+        word = random.choice(["lorem", "ipsum", "dolor", "sit", "amet", "a", ""])
+        rows.append(f"5\t1\t1\t1\t{line}\t{i % words_per_line + 1}\t{x}\t{line * 30}\t80\t{random.randint(18, 24)}\t{conf:.6f}\t{word}")
+    return "\n".join(rows) + "\n"
+
+
+def measure(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=30000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    tsv = make_tsv(args.words)
+
+    dict_time, dict_data = measure(lambda: file_to_dict(tsv, "\t", -1))
+    table_time, table_data = measure(lambda: ocr_table.OCRTable.from_tsv(tsv))
+
+    assert table_data.to_dict() == dict_data, "parsed values differ"
+    print(f"parse          dict {dict_time * 1000:8.1f} ms   table {table_time * 1000:8.1f} ms")
+
+    dict_time, dict_sentence = measure(lambda: make_sentence_block.find_sentence(dict_data))
+    table_time, table_sentence = measure(lambda: make_sentence_block.find_sentence(table_data))
+
+    assert dict_sentence == table_sentence, "sentences differ"
+    print(f"find_sentence  dict {dict_time * 1000:8.1f} ms   table {table_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import pytesseract
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import ocr_tiling
+
+
+'''
+Measure how tiled OCR scales with the number of worker processes.
+Compares a single pytesseract.image_to_data call against ocr_tiling.tiled_image_to_data
+with 1, 2, 4, ... workers up to the number of CPU cores.
+
+usage: python bench_tiled_ocr.py <image> [--tile_size 2048] [--overlap 256] [--repeat 3]
+'''
+
+
+def count_words(ocr_data):
+    return sum(1 for lv, text in zip(ocr_data['level'], ocr_data['text']) if lv == 5 and text.strip())
+
+
+def measure(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image", type=str)
+    parser.add_argument("--tile_size", type=int, default=2048)
+    parser.add_argument("--overlap", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image = cv2.imread(args.image)
+    if image is None:
+        raise ValueError(f"Unable to load image from path: {args.image}")
+
+    tiles = ocr_tiling.make_tiles(image.shape, args.tile_size, args.overlap)
+    print(f"image {image.shape[1]}x{image.shape[0]}, {len(tiles)} tiles, {os.cpu_count()} cores")
+
+    full_time, full_data = measure(lambda: pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT), args.repeat)
+    print(f"{'full':>10} : {full_time:8.2f} s  words {count_words(full_data)}")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        tiled_time, tiled_data = measure(lambda: ocr_tiling.tiled_image_to_data(image, args.tile_size, args.overlap, workers), args.repeat)
+        print(f"{'tiled x' + str(workers):>10} : {tiled_time:8.2f} s  words {count_words(tiled_data)}  speedup {full_time / tiled_time:5.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import image_processing
+import ocr_table
+
+
+'''
+Measure the concurrent color and translation stages of ProcessingBlock for 1, 2, 4 and 8 workers.
+A synthetic image with paragraphs of known layout is written to a temporary file and its OCR data
+is built directly, so Tesseract is not needed. Every run starts with an empty stage memo,
+and the colors and translations are checked against the serial run.
+Translation is skipped unless --translate is given, it needs an installed Argos package.
+
+usage: python bench_parallel_blocks.py [--blocks 50] [--lines 3] [--color_method kmeans] [--translate]
+'''
+
+
+def make_page(path, blocks, lines, seed):
+    rng = np.random.default_rng(seed)
+    columns = 5
+    block_width, line_height = 360, 28
+    block_height = lines * line_height + 60
+    rows = (blocks + columns - 1) // columns
+    image = np.full((rows * block_height + 20, columns * (block_width + 20) + 20, 3), 255, dtype=np.uint8)
+
+    ocr_rows = {key: [] for key in ocr_table.OCR_KEYS}
+
+    def add_row(level, block_num, line_num, word_num, x, y, w, h, conf, text):
+        for key, value in zip(ocr_table.OCR_KEYS, [level, 1, block_num, 1, line_num, word_num, x, y, w, h, conf, text]):
+            ocr_rows[key].append(value)
+
+    for b in range(blocks):
+        bx = 20 + (b % columns) * (block_width + 20)
+        by = 20 + (b // columns) * block_height
+        background = rng.integers(0, 256, 3)
+        font = 255 - background
+        image[by-5:by+lines*line_height+5, bx-5:bx+block_width+5] = background
+
+        for l in range(lines):
+            y = by + l * line_height
+            x = bx
+            add_row(4, b + 1, l + 1, 0, bx, y, block_width, line_height, -1, "")
+            for w in range(4):
+                word = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz"), 5))
+                (tw, th), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+                cv2.putText(image, word, (x, y + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.7, font.tolist(), 2, cv2.LINE_AA)
+                add_row(5, b + 1, l + 1, w + 1, x, y + 20 - th, tw, th, 95, word)
+                x += tw + 14
+
+    noise = rng.normal(0, 2, image.shape)
+    cv2.imwrite(path, np.clip(image + noise, 0, 255).astype(np.uint8))
+    return ocr_table.OCRTable(ocr_rows)
+
+
+def run(path, ocr_data, color_method, workers, translate):
+    block = image_processing.ProcessingBlock(path, color_method=color_method, color_workers=workers, translate_workers=workers)
+    block.ocr_data_ = ocr_data
+    block.recollection_text()
+    block.build_blocks()
+
+    start = time.perf_counter()
+    if translate:
+        block.render_process()
+    else:
+        block.color_process()
+    elapsed = time.perf_counter() - start
+
+    colors = [b.get_color() for b in block.blocks_]
+    translations = [b.get_translated_text()[2] for b in block.blocks_]
+    return elapsed, len(block.blocks_), colors, translations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--color_method", type=str, default="kmeans")
+    parser.add_argument("--translate", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parallel_page.png")
+    ocr_data = make_page(path, args.blocks, args.lines, args.seed)
+
+    print(f"cpu count {os.cpu_count()}, color method {args.color_method}, translation {'on' if args.translate else 'off'}")
+
+    base = None
+    for workers in [1, 2, 4, 8]:
+        elapsed, count, colors, translations = run(path, ocr_data, args.color_method, workers, args.translate)
+
+        if base is None:
+            base = (elapsed, colors, translations)
+            same = True
+        else:
+            same = colors == base[1] and translations == base[2]
+
+        print(f"workers {workers} : {count} blocks  {elapsed * 1000:9.1f} ms  speedup {base[0] / elapsed:5.2f}x  identical {same}")
+
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
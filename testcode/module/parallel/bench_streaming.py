@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, "..", "..", "..", "source"))
+sys.path.append(os.path.join(HERE, "..", "translate"))
+sys.path.append(HERE)
+import image_processing
+import google_translate_async
+from bench_parallel_blocks import make_page
+from stub_translate_server import start_stub_server
+
+
+'''
+Compare the time to the first visible result of ProcessingBlock.iter_results with the full processing_run.
+The synthetic page of bench_parallel_blocks is used, so Tesseract is not needed, and the blocks are translated
+with the google_async translator against the local stub server, so Argos is not needed either.
+The translation chunks are sent one after another (--workers 1) or concurrently.
+
+usage: python bench_streaming.py --font <ttf> [--blocks 50] [--delay 0.1] [--chunk 4] [--workers 1] [--priority font]
+'''
+
+
+def make_block(path, ocr_data, font, workers):
+    block = image_processing.ProcessingBlock(path, font_type=font, translator_mode="google_async", \
+                                             translate_workers=workers, translate_plan=False)
+    block.ocr_data_ = ocr_data
+    block.recollection_text()
+    block.build_blocks()
+    return block
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font", type=str, required=True)
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0.1)
+    parser.add_argument("--chunk", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--priority", type=str, default="font")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(delay=args.delay)
+    # One request at a time, like a rate-limited online translator or a single local model
+    google_translate_async.set_default(google_translate_async.AsyncTranslator(url=url, max_concurrency=1))
+
+    path = os.path.join(HERE, "streaming_page.png")
+    ocr_data = make_page(path, args.blocks, args.lines, args.seed)
+
+    block = make_block(path, ocr_data, args.font, args.workers)
+    start = time.perf_counter()
+    block.processing_run()
+    full = time.perf_counter() - start
+    full_image = block.result_image_
+
+    block = make_block(path, ocr_data, args.font, args.workers)
+    times = [result["elapsed"] for result in block.iter_results(priority=args.priority, chunk_size=args.chunk)]
+    count = len(times)
+
+    print(f"{count} blocks, stub delay {args.delay * 1000:.0f} ms per request, chunk {args.chunk}, workers {args.workers}")
+    print(f"processing_run : {full * 1000:9.1f} ms until anything is visible")
+    print(f"iter_results   : first {times[0] * 1000:9.1f} ms ({times[0] / full:.0%})  "
+          f"10% {times[count // 10] * 1000:9.1f} ms  all {times[-1] * 1000:9.1f} ms")
+    print(f"identical final image {bool((full_image == block.result_image_).all())}")
+
+    os.remove(path)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
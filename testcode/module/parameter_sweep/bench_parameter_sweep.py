@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+import itertools
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import image_processing
+
+
+'''
+Compare a threshold sweep that rebuilds the ProcessingBlock for every parameter set
+with a sweep over one ProcessingBlock through `sweep()`, which keeps the image and the OCR result
+and only regroups the text.
+The rebuild only runs for the first few parameter sets, it reads the image and runs Tesseract every time.
+
+usage: python bench_parameter_sweep.py <image> [--stage block] [--rebuild 3]
+'''
+
+
+def parameter_grid():
+    sentence_thresholds = [30, 40, 50, 60, 70]
+    block_thresholds = [1.0, 1.25, 1.5, 1.75, 2.0]
+    return [{'sentence_threshold': s, 'block_threshold': b} for s, b in itertools.product(sentence_thresholds, block_thresholds)]
+
+
+def measure_rebuild(image_path, grid):
+    start = time.perf_counter()
+    for parameters in grid:
+        block = image_processing.ProcessingBlock(image_path, **parameters)
+        block.recollection_text()
+    return (time.perf_counter() - start) / len(grid)
+
+
+def measure_sweep(image_path, grid, stage):
+    block = image_processing.ProcessingBlock(image_path)
+
+    start = time.perf_counter()
+    block.ocr_process()
+    ocr = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = block.sweep(grid, stage=stage)
+    first = time.perf_counter() - start
+
+    # Every stage result is memoized now, the second pass only looks them up
+    start = time.perf_counter()
+    block.sweep(grid, stage=stage)
+    second = time.perf_counter() - start
+
+    return ocr, first / len(grid), second / len(grid), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image", type=str)
+    parser.add_argument("--stage", type=str, default="block")
+    parser.add_argument("--rebuild", type=int, default=3)
+    args = parser.parse_args()
+
+    grid = parameter_grid()
+
+    rebuild = measure_rebuild(args.image, grid[:args.rebuild])
+    ocr, first, second, results = measure_sweep(args.image, grid, args.stage)
+
+    print(f"{len(grid)} parameter sets up to the '{args.stage}' stage")
+    print(f"   rebuild : {rebuild * 1000:10.2f} ms per parameter set")
+    print(f"       ocr : {ocr * 1000:10.2f} ms once")
+    print(f"     sweep : {first * 1000:10.2f} ms per parameter set")
+    print(f"  memoized : {second * 1000:10.2f} ms per parameter set")
+
+    if args.stage == "block":
+        for parameters, block_data in results:
+            print(f"{parameters} -> {len(block_data['text'])} blocks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import erase_text
+
+
+'''
+Compare per-region color estimation with the single-pass erase_text.batch_colors
+on an image full of short UI labels with known background and font colors.
+
+usage: python bench_batch_color.py [--labels 400] [--label_width 90] [--label_height 22] [--seed 0] [--workers 2 4]
+'''
+
+
+def make_image(count, label_width, label_height, seed):
+    rng = np.random.default_rng(seed)
+    columns = 10
+    rows = (count + columns - 1) // columns
+    cell_width, cell_height = label_width + 20, label_height + 20
+    image = np.full((rows * cell_height, columns * cell_width, 3), 128, dtype=np.uint8)
+
+    labels = []
+    for i in range(count):
+        x = (i % columns) * cell_width + 10
+        y = (i // columns) * cell_height + 10
+
+        background = rng.integers(0, 256, 3)
+        font = rng.integers(0, 256, 3)
+        while np.linalg.norm(background - font) < 120:
+            font = rng.integers(0, 256, 3)
+
+        image[y:y+label_height, x:x+label_width] = background
+        text = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz"), label_width // 14))
+        cv2.putText(image, text, (x + 2, y + int(label_height * 0.75)), cv2.FONT_HERSHEY_SIMPLEX, label_height / 40, font.tolist(), 1, cv2.LINE_AA)
+        labels.append(((x, y, label_width, label_height), background, font))
+
+    noise = rng.normal(0, 2, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8), labels
+
+
+def report(name, elapsed, labels, background_color, font_color):
+    background_error = np.mean([np.linalg.norm(np.array(bg) - true_bg) for bg, (_, true_bg, _) in zip(background_color, labels)])
+    font_error = np.mean([np.linalg.norm(np.array(ft) - true_ft) for ft, (_, _, true_ft) in zip(font_color, labels)])
+    print(f"{name:>10} : {elapsed * 1000:8.1f} ms total  {elapsed / len(labels) * 1000:6.3f} ms/label  bg error {background_error:6.1f}  font error {font_error:6.1f}")
+
+
+def measure_single(image, labels, method):
+    start = time.perf_counter()
+    background_color, font_color = [], []
+    for (x, y, w, h), _, _ in labels:
+        cluster = erase_text.make_cluster(image[y:y+h, x:x+w], method=method)
+        background_color.append(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0))
+        font_color.append(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1))
+    report(method, time.perf_counter() - start, labels, background_color, font_color)
+
+
+def measure_batch(image, labels, workers=1):
+    start = time.perf_counter()
+    background_color, font_color = erase_text.batch_colors(image, [rect for rect, _, _ in labels], margin=0, workers=workers)
+    report("batch" if workers == 1 else f"batch x{workers}", time.perf_counter() - start, labels, background_color, font_color)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--labels", type=int, default=400)
+    parser.add_argument("--label_width", type=int, default=90)
+    parser.add_argument("--label_height", type=int, default=22)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", action="store_true", help="Also run the sklearn KMeans reference")
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4], help="Thread counts of the batch runs besides 1")
+    args = parser.parse_args()
+
+    image, labels = make_image(args.labels, args.label_width, args.label_height, args.seed)
+    print(f"{len(labels)} labels of {args.label_width}x{args.label_height}")
+
+    if args.reference:
+        measure_single(image, labels, "kmeans")
+    measure_single(image, labels, "cv2")
+    measure_single(image, labels, "histogram")
+    measure_batch(image, labels)
+    for workers in args.workers:
+        measure_batch(image, labels, workers)
+
+
+if __name__ == "__main__":
+    main()
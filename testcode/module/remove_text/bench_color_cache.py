@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import erase_text
+import color_cache
+
+
+'''
+Measure the region color cache on comic-like pages, where many boxes share a few color palettes.
+Every page is processed once without the cache and once through a ColorCache shared by all pages,
+the way ParagraphBlock.roi_color uses it. The hit rate, the time per page and the mean error
+of the background and font colors against the true palette colors are reported for both runs.
+
+usage: python bench_color_cache.py [--pages 4] [--boxes 60] [--palettes 5] [--method histogram]
+'''
+
+
+def make_page(boxes, palettes, seed):
+    rng = np.random.default_rng(seed)
+    palette_rng = np.random.default_rng(1234)
+    colors = [(palette_rng.integers(0, 256, 3), palette_rng.integers(0, 256, 3)) for _ in range(palettes)]
+
+    image = np.full((1600, 1200, 3), 230, dtype=np.uint8)
+    rects = []
+    for _ in range(boxes):
+        w, h = int(rng.integers(120, 300)), int(rng.integers(24, 40))
+        x, y = int(rng.integers(10, 1200 - w - 10)), int(rng.integers(10, 1600 - h - 10))
+        background, font = colors[rng.integers(0, palettes)]
+
+        image[y:y+h, x:x+w] = background
+        text = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz "), w // 14))
+        cv2.putText(image, text, (x + 4, y + int(h * 0.7)), cv2.FONT_HERSHEY_SIMPLEX, h / 45, font.tolist(), 2, cv2.LINE_AA)
+        rects.append(((x + 5, y + 5, w - 10, h - 10), background, np.array(erase_text.correction_color(tuple(font), 30))))
+
+    noise = rng.normal(0, 2, image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8), rects
+
+
+def roi_color(roi, method, cache):
+    key = None
+    if cache is not None:
+        key = (method, 30, color_cache.roi_fingerprint(roi))
+        cached_color = cache.get(key)
+        if cached_color is not None:
+            return cached_color
+
+    cluster = erase_text.make_cluster(roi, method=method)
+    background_color = tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0))
+    font_color = erase_text.correction_color(tuple(erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1)), 30)
+
+    if key is not None:
+        cache.put(key, (background_color, font_color))
+    return background_color, font_color
+
+
+def process(image, rects, method, cache):
+    start = time.perf_counter()
+    colors = [roi_color(erase_text.find_roi(image, *rect), method, cache) for rect, _, _ in rects]
+    elapsed = time.perf_counter() - start
+
+    background_error = np.mean([np.linalg.norm(np.array(bg) - true_bg) for (bg, _), (_, true_bg, _) in zip(colors, rects)])
+    font_error = np.mean([np.linalg.norm(np.array(ft) - true_ft) for (_, ft), (_, _, true_ft) in zip(colors, rects)])
+    return elapsed, background_error, font_error
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--boxes", type=int, default=60)
+    parser.add_argument("--palettes", type=int, default=5)
+    parser.add_argument("--method", type=str, default="histogram")
+    args = parser.parse_args()
+
+    cache = color_cache.ColorCache(4096)
+
+    for page in range(args.pages):
+        image, rects = make_page(args.boxes, args.palettes, page)
+
+        plain, plain_bg, plain_ft = process(image, rects, args.method, None)
+        cached, cached_bg, cached_ft = process(image, rects, args.method, cache)
+
+        print(f"page {page} : no cache {plain * 1000:8.1f} ms (bg error {plain_bg:5.1f}, font error {plain_ft:5.1f})"
+              f"  cache {cached * 1000:8.1f} ms (bg error {cached_bg:5.1f}, font error {cached_ft:5.1f})")
+
+    stats = cache.stats()
+    print(f"hits {stats['hits']}  misses {stats['misses']}  hit rate {stats['hit_rate']:.2f}  entries {stats['entries']}")
+
+
+if __name__ == "__main__":
+    main()
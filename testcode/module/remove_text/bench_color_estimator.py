@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import erase_text
+
+
+'''
+Compare the color estimators of erase_text.make_cluster with the sklearn KMeans reference.
+Synthetic text lines with known background and font colors are rendered with anti-aliasing and noise,
+some of them without any text. For every estimator the time per line, the mean error of the background
+and font colors against the true colors, and the mean distance to the colors found by the reference are reported.
+
+usage: python bench_color_estimator.py [--lines 200] [--width 600] [--height 32] [--seed 0]
+'''
+
+
+def make_lines(count, width, height, seed):
+    rng = np.random.default_rng(seed)
+    lines = []
+    for i in range(count):
+        background = rng.integers(0, 256, 3)
+        font = rng.integers(0, 256, 3)
+        while np.linalg.norm(background - font) < 120:
+            font = rng.integers(0, 256, 3)
+
+        roi = np.empty((height, width, 3), dtype=np.uint8)
+        roi[:] = background
+
+        # Every tenth line is an empty region of solid background
+        if i % 10 != 0:
+            text = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz  "), width // 14))
+            cv2.putText(roi, text, (4, int(height * 0.75)), cv2.FONT_HERSHEY_SIMPLEX, height / 40, font.tolist(), 2, cv2.LINE_AA)
+        else:
+            font = background
+
+        noise = rng.normal(0, 2, roi.shape)
+        roi = np.clip(roi + noise, 0, 255).astype(np.uint8)
+        lines.append((roi, background, font))
+    return lines
+
+
+def estimate(roi, method, solid_threshold):
+    cluster = erase_text.make_cluster(roi, method=method, solid_threshold=solid_threshold)
+    background = erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=0)
+    font = erase_text.find_dominant_color(cluster, cluster.cluster_centers_, order=1)
+    return np.array(background, dtype=float), np.array(font, dtype=float)
+
+
+def measure(name, lines, method, solid_threshold, reference=None):
+    start = time.perf_counter()
+    results = [estimate(roi, method, solid_threshold) for roi, _, _ in lines]
+    elapsed = (time.perf_counter() - start) / len(lines)
+
+    background_error = np.mean([np.linalg.norm(bg - true_bg) for (bg, _), (_, true_bg, _) in zip(results, lines)])
+    font_error = np.mean([np.linalg.norm(ft - true_ft) for (_, ft), (_, _, true_ft) in zip(results, lines)])
+
+    line = f"{name:>18} : {elapsed * 1000:8.2f} ms/line  bg error {background_error:6.1f}  font error {font_error:6.1f}"
+    if reference is not None:
+        distance = np.mean([np.linalg.norm(bg - ref_bg) + np.linalg.norm(ft - ref_ft) for (bg, ft), (ref_bg, ref_ft) in zip(results, reference)])
+        line += f"  vs reference {distance:6.1f}"
+    print(line)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--width", type=int, default=600)
+    parser.add_argument("--height", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.width, args.height, args.seed)
+    print(f"{len(lines)} lines of {args.width}x{args.height}")
+
+    reference = measure("kmeans (reference)", lines, "kmeans", None)
+    measure("kmeans + solid", lines, "kmeans", 4.0, reference)
+    measure("cv2", lines, "cv2", 4.0, reference)
+    measure("histogram", lines, "histogram", 4.0, reference)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import erase_text
+
+
+'''
+Compare the ways of erasing the old text of the line boxes on a large page.
+"pil" draws one filled rectangle per box on a PIL copy of the page, as ProcessingBlock.draw_block used to,
+"fill" is erase_text.fill_boxes, one array slice per box, checked to give the same pixels.
+For textured backgrounds, erase_text.inpaint_boxes inpaints the text pixels of the merged boxes only,
+and is compared with one cv2.inpaint call over the whole page with the same mask.
+The page is a noisy gradient with lines of text in boxes of random sizes and background colors,
+or with --corners two small boxes in opposite corners, where the bounding rectangle of the boxes is the whole page.
+
+usage: python bench_erase.py [--width 4000] [--height 3000] [--boxes 400] [--repeat 5] [--seed 0] [--corners]
+'''
+
+
+def make_page(width, height, count, seed, corners=False):
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(90, 200, width, dtype=np.float32)[None, :, None]
+    image = (gradient + rng.normal(0, 6, (height, width, 3))).clip(0, 255).astype(np.uint8)
+
+    if corners:
+        boxes = [(10, 10, 100, 20), (width - 111, height - 31, 100, 20)]
+    else:
+        boxes = []
+        for _ in range(count):
+            w, h = int(rng.integers(120, 600)), int(rng.integers(16, 40))
+            boxes.append((int(rng.integers(0, width - w - 1)), int(rng.integers(0, height - h - 1)), w, h))
+
+    rects = []
+    colors = []
+    for x, y, w, h in boxes:
+        color = tuple(int(c) for c in image[y + h // 2, x + w // 2])
+        cv2.putText(image, "translated text", (x + 2, y + h - 4), cv2.FONT_HERSHEY_SIMPLEX, h / 40, (20, 20, 20), 2)
+        rects.append((x, y, w, h))
+        colors.append(color)
+
+    return image, rects, colors
+
+
+def pil_fill(image, rects, colors):
+    region = Image.fromarray(image)
+    draw = ImageDraw.Draw(region)
+    for (x, y, w, h), color in zip(rects, colors):
+        draw.rectangle([(x, y), (x + w, y + h)], fill=color)
+    image[:] = np.asarray(region)
+
+
+def full_inpaint(image, rects, colors):
+    # The same text mask as inpaint_boxes, inpainted in one call over the whole page
+    bounds = erase_text.box_bounds(image.shape, rects)
+    labels, (left, top) = erase_text.label_mask(bounds)
+    region = image[top:top + labels.shape[0], left:left + labels.shape[1]].astype(np.float32)
+    palette = np.asarray(colors, dtype=np.float32)
+
+    inside = labels > 0
+    distance = np.zeros(labels.shape, dtype=np.float32)
+    distance[inside] = np.abs(region[inside] - palette[labels[inside] - 1]).sum(axis=1)
+    text = cv2.dilate(((distance > 48.0) * 255).astype(np.uint8), np.ones((3, 3), dtype=np.uint8))
+    text[~inside] = 0
+
+    mask = np.zeros(image.shape[:2], dtype=np.uint8)
+    mask[top:top + labels.shape[0], left:left + labels.shape[1]] = text
+    image[:] = cv2.inpaint(image, mask, 3, cv2.INPAINT_TELEA)
+
+
+def timed(function, page, rects, colors, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        image = page.copy()
+        start = time.perf_counter()
+        function(image, rects, colors)
+        best = min(best, time.perf_counter() - start)
+    return best, image
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--boxes", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corners", action="store_true", help="Two 100x20 boxes in opposite corners instead of --boxes random boxes")
+    args = parser.parse_args()
+
+    page, rects, colors = make_page(args.width, args.height, args.boxes, args.seed, args.corners)
+    area = sum((w + 1) * (h + 1) for _, _, w, h in rects) / (args.width * args.height)
+    print(f"{args.width}x{args.height}, {len(rects)} boxes covering {area * 100:.1f}% of the page, best of {args.repeat}")
+
+    pil_time, pil_image = timed(pil_fill, page, rects, colors, args.repeat)
+    fill_time, fill_image = timed(erase_text.fill_boxes, page, rects, colors, args.repeat)
+    print(f"{'pil rectangles':>16} : {pil_time * 1000:8.2f} ms")
+    print(f"{'sliced fill':>16} : {fill_time * 1000:8.2f} ms  ({pil_time / fill_time:.1f}x, identical {np.array_equal(pil_image, fill_image)})")
+
+    full_time, full_image = timed(full_inpaint, page, rects, colors, 1)
+    crop_time, crop_image = timed(erase_text.inpaint_boxes, page, rects, colors, 1)
+    difference = np.abs(full_image.astype(np.int16) - crop_image.astype(np.int16)).mean()
+    print(f"{'full inpaint':>16} : {full_time * 1000:8.2f} ms")
+    print(f"{'cropped inpaint':>16} : {crop_time * 1000:8.2f} ms  ({full_time / crop_time:.1f}x, mean difference {difference:.3f})")
+
+
+if __name__ == "__main__":
+    main()
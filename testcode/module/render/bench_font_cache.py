@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import font_cache
+
+
+'''
+Measure the cost of rendering one line of translated text, before and after the font cache.
+Every line is drawn the way ProcessingBlock.draw_block does it: a background rectangle, a font of the
+line's size and the text. "before" loads the font with ImageFont.truetype for every line, "after" takes it
+from font_cache.get_font. Measuring a line width with getlength is compared with the cached glyph advances.
+Font sizes are drawn from a small set, as they are on a real page.
+
+usage: python bench_font_cache.py <font> [--lines 500] [--sizes 8]
+'''
+
+
+def make_lines(count, sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["translation", "image", "text", "번역", "이미지", "텍스트", "block", "의", "paragraph", "문장"]
+    size_set = rng.integers(12, 48, sizes).tolist()
+
+    lines = []
+    for i in range(count):
+        text = " ".join(rng.choice(words, int(rng.integers(3, 9))))
+        lines.append((text, size_set[i % sizes], (10, 10 + (i * 30) % 1900)))
+    return lines
+
+
+def render(lines, load):
+    image = Image.new("RGB", (1600, 2000), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+
+    start = time.perf_counter()
+    for text, size, (x, y) in lines:
+        draw.rectangle([(x, y), (x + 1200, y + size)], fill=(240, 240, 240))
+        draw.text((x, y), text, font=load(size), fill=(0, 0, 0))
+    return time.perf_counter() - start, np.array(image)
+
+
+def measure(lines, width):
+    start = time.perf_counter()
+    widths = [width(text, size) for text, size, _ in lines]
+    return time.perf_counter() - start, widths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", type=str)
+    parser.add_argument("--lines", type=int, default=500)
+    parser.add_argument("--sizes", type=int, default=8)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.sizes)
+    per_line = lambda elapsed: elapsed / len(lines) * 1000
+
+    before, before_image = render(lines, lambda size: ImageFont.truetype(args.font, size))
+    font_cache.clear()
+    after, after_image = render(lines, lambda size: font_cache.get_font(args.font, size))
+
+    loading, _ = measure(lines, lambda text, size: ImageFont.truetype(args.font, size))
+
+    print(f"{len(lines)} lines, {args.sizes} font sizes, font file {os.path.getsize(args.font) / 1024:.0f} KB")
+    print(f"{'truetype only':>16} : {per_line(loading):8.3f} ms per line")
+    print(f"{'render before':>16} : {per_line(before):8.3f} ms per line")
+    print(f"{'render after':>16} : {per_line(after):8.3f} ms per line  ({before / after:.1f}x, identical {np.array_equal(before_image, after_image)})")
+
+    measured, exact = measure(lines, lambda text, size: font_cache.get_font(args.font, size).getlength(text))
+    cached, advances = measure(lines, lambda text, size: font_cache.text_width(text, args.font, size))
+    error = np.max(np.abs(np.array(exact) - np.array(advances)))
+
+    print(f"{'getlength':>16} : {per_line(measured):8.3f} ms per line")
+    print(f"{'glyph advances':>16} : {per_line(cached):8.3f} ms per line  ({measured / cached:.1f}x, max error {error:.2f} px)")
+    print(font_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import argparse
+import resource
+import subprocess
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, "..", "parallel"))
+
+
+'''
+Measure the peak memory of processing one large image the way the server does: render the translated text,
+optionally draw the debug boxes, and save the result.
+A page of paragraphs from bench_parallel_blocks is placed in the corner of a large white image, so Tesseract
+is not needed, and the translation is an identity function, so no translator is needed either.
+Every run is a fresh process and reports its peak RSS above the RSS after the imports.
+Pass --source to run another checkout of the source directory, e.g. the previous commit, for a before/after pair.
+
+usage: python bench_memory.py --font <ttf> [--megapixels 50] [--blocks 50] [--draw] [--source <dir>]
+'''
+
+
+def peak_rss():
+    # ru_maxrss survives exec and would include the parent, VmHWM belongs to this process only
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def make_image(path, megapixels, blocks, seed):
+    from bench_parallel_blocks import make_page
+
+    page_path = path + ".page.png"
+    make_page(page_path, blocks, 3, seed)
+    page = cv2.imread(page_path)
+    os.remove(page_path)
+
+    width = int(np.sqrt(megapixels * 1e6 * 4 / 3))
+    height = int(megapixels * 1e6 / width)
+    image = np.full((max(height, page.shape[0]), max(width, page.shape[1]), 3), 255, dtype=np.uint8)
+    image[:page.shape[0], :page.shape[1]] = page
+    cv2.imwrite(path, image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+
+    return image.shape
+
+
+def child(args):
+    # The measured source directory comes first, bench_parallel_blocks only appends the one of this checkout
+    sys.path.insert(0, args.source)
+    import image_processing
+    from bench_parallel_blocks import make_page
+
+    base = peak_rss()
+    start = time.perf_counter()
+
+    # The same OCR data as the page in the image
+    ocr_data = make_page(args.image + ".page.png", args.blocks, 3, args.seed)
+    os.remove(args.image + ".page.png")
+
+    block = image_processing.ProcessingBlock(args.image, font_type=args.font, translate_plan=False)
+    block.translate_texts = lambda texts: ([text.upper() for text in texts], ["identity"] * len(texts))
+    block.ocr_data_ = ocr_data
+    block.recollection_text()
+    block.build_blocks()
+
+    block.processing_run()
+    if args.draw:
+        block.draw_process()
+    block.save_result(args.image + ".result.jpg")
+    os.remove(args.image + ".result.jpg")
+
+    peak = peak_rss()
+    print(f"{(peak - base) / 1024:.1f} {time.perf_counter() - start:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--font", type=str, required=True)
+    parser.add_argument("--megapixels", type=float, default=50)
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--draw", action="store_true", help="Also draw the debug boxes, as the server used to")
+    parser.add_argument("--source", type=str, default=os.path.join(HERE, "..", "..", "..", "source"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", action="store_true")
+    parser.add_argument("--image", type=str, default=os.path.join(HERE, "memory_page.png"))
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    shape = make_image(args.image, args.megapixels, args.blocks, args.seed)
+    image_mb = shape[0] * shape[1] * shape[2] / 1024 / 1024
+
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--image", args.image, "--font", args.font, \
+               "--blocks", str(args.blocks), "--seed", str(args.seed), "--source", os.path.abspath(args.source)]
+    if args.draw:
+        command.append("--draw")
+
+    output = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True).stdout.split()
+    peak, elapsed = float(output[-2]), float(output[-1])
+    os.remove(args.image)
+
+    print(f"{shape[1]}x{shape[0]} ({image_mb:.0f} MB decoded), source {os.path.abspath(args.source)}, debug boxes {'on' if args.draw else 'off'}")
+    print(f"peak RSS above imports {peak:8.1f} MB ({peak / image_mb:.1f} decoded images)  time {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import font_cache
+import text_layout
+
+
+'''
+Compare the word-ratio line split that ParagraphBlock.distribute_text used to do with the measured-width layout.
+Paragraphs of 20 lines are filled with English, Korean (spaced words) and Chinese (no spaces) text
+measuring `fill` times the total width of the line boxes. For each method the share of lines wider than their box is reported,
+measured with the font at the size the line is drawn with, together with the layout time per paragraph
+once the glyph advances are cached (the best of --repeat passes) and the mean font scale chosen by the fit search.
+
+usage: python bench_text_layout.py <font> [--blocks 50] [--lines 20] [--fill 1.1] [--repeat 10]
+'''
+
+
+def word_ratio(text, line_width):
+    tokens = text.split()
+    total = len(tokens)
+    ratios = [round(w / sum(line_width), 2) for w in line_width]
+
+    lines = []
+    for i in range(len(line_width)):
+        if i == len(line_width) - 1:
+            count = len(tokens)
+        else:
+            count = int(total * ratios[i])
+        lines.append(" ".join(tokens[:count]))
+        tokens = tokens[count:]
+    return lines
+
+
+WORDS = {
+    "en": ["translation", "of", "the", "image", "text", "is", "rendered", "back", "into", "paragraph", "boxes"],
+    "ko": ["이미지의", "텍스트를", "번역하여", "다시", "그립니다", "문단", "상자"],
+    "zh": list("图像中的文字被翻译后重新绘制到段落框里这是一个没有空格的句子")
+}
+
+
+def make_text(language, width, font, size, rng):
+    # Add words until the text measures `width` pixels at the font size
+    separator = "" if language == "zh" else " "
+    words = []
+    while font_cache.text_width(separator.join(words), font, size) < width:
+        words.append(rng.choice(WORDS[language]))
+    return separator.join(words) + ("。" if language == "zh" else "")
+
+
+def overflow(lines, widths, sizes, font):
+    over = 0
+    for line, width, size in zip(lines, widths, sizes):
+        if font_cache.text_width(line, font, size) > width + 0.5:
+            over += 1
+    return over
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", type=str)
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=20)
+    parser.add_argument("--fill", type=float, default=1.1, help="Text length relative to the capacity of the boxes")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed passes, the fastest is reported")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    for language in ["en", "ko", "zh"]:
+        blocks = []
+        for _ in range(args.blocks):
+            widths = rng.integers(300, 500, args.lines).tolist()
+            sizes = [int(rng.integers(18, 26))] * args.lines
+            blocks.append((make_text(language, sum(widths) * args.fill, args.font, sizes[0], rng), widths, sizes))
+
+        before = sum(overflow(word_ratio(text, widths), widths, sizes, args.font) for text, widths, sizes in blocks)
+
+        # Warm the glyph caches, then time the fit search alone
+        results = [text_layout.fit_text(text, widths, sizes, args.font) for text, widths, sizes in blocks]
+        elapsed = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = [text_layout.fit_text(text, widths, sizes, args.font) for text, widths, sizes in blocks]
+            elapsed = min(elapsed, (time.perf_counter() - start) / len(blocks))
+
+        after = sum(overflow(lines, widths, fitted, args.font) for (lines, fitted, _), (_, widths, _) in zip(results, blocks))
+        scale = np.mean([fitted[0] / sizes[0] for (_, fitted, _), (_, _, sizes) in zip(results, blocks)])
+        total = args.blocks * args.lines
+
+        print(f"{language} : word ratio overflow {before / total * 100:5.1f}% of lines  "
+              f"measured overflow {after / total * 100:5.1f}%  fit {elapsed * 1000:6.3f} ms per {args.lines}-line paragraph  mean scale {scale:.2f}")
+
+
+if __name__ == "__main__":
+    main()
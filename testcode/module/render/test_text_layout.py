@@ -0,0 +1,74 @@
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import font_cache
+import text_layout
+
+
+'''
+Check text_layout.fit_text on random blocks: whenever it reports that the text fits, every line measured
+with PIL at the size it is drawn with is at most as wide as its box, and no larger font size fits.
+The font is taken from the TEXT_LAYOUT_FONT environment variable, or DejaVu Sans if it is installed.
+
+usage: python -m pytest test_text_layout.py
+       TEXT_LAYOUT_FONT=<font> python -m pytest test_text_layout.py
+'''
+
+FONT = os.environ.get("TEXT_LAYOUT_FONT", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+
+WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "a", "lazy", "dog", "I", "translation", "extraordinarily"]
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FONT), reason="font not found, set TEXT_LAYOUT_FONT")
+
+
+def make_blocks(count, seed):
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(count):
+        lines = rng.randint(1, 6)
+        widths = [rng.randint(40, 500) for _ in range(lines)]
+        sizes = [rng.randint(8, 48) for _ in range(lines)]
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 40)))
+        blocks.append((text, widths, sizes))
+    return blocks
+
+
+def fits_at(text, widths, sizes, target):
+    # Pack with the metrics of every line size and measure the lines with PIL
+    reference = max(sizes)
+    line_sizes = [max(1, size * target // reference) for size in sizes]
+    measured = text_layout.MeasuredText(text, font_cache.get_metrics(FONT, reference))
+    measures = [text_layout.MeasuredText(text, font_cache.get_metrics(FONT, size), measured) for size in line_sizes]
+    lines, fits = measured.pack(widths, measures)
+    return fits and all(font_cache.get_font(FONT, size).getlength(line) <= width for line, width, size in zip(lines, widths, line_sizes))
+
+
+def test_fitted_lines_are_not_wider_than_their_boxes():
+    for text, widths, sizes in make_blocks(1000, 0):
+        lines, fitted, fits = text_layout.fit_text(text, widths, sizes, FONT)
+        assert len(lines) == len(widths) and len(fitted) == len(widths)
+        if fits:
+            for line, width, size in zip(lines, widths, fitted):
+                assert font_cache.get_font(FONT, size).getlength(line) <= width, (text, widths, sizes)
+
+
+def test_fitted_size_is_the_largest_that_fits():
+    for text, widths, sizes in make_blocks(300, 1):
+        _, fitted, fits = text_layout.fit_text(text, widths, sizes, FONT)
+        reference = max(sizes)
+        low = max(1, int(reference * 0.5 + 0.999))
+        target = max(fitted) if fits else low - 1
+        assert not any(fits_at(text, widths, sizes, larger) for larger in range(target + 1, reference + 1)), (text, widths, sizes)
+
+
+def test_small_sizes_are_raised_to_one():
+    lines, fitted, fits = text_layout.fit_text("a b", [200, 200], [0, 0], FONT)
+    assert fitted == [1, 1] and fits and text_layout.join_lines(lines) == "a b"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
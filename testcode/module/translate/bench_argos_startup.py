@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source")
+sys.path.append(SOURCE_DIR)
+import argos_translate
+import argostranslate.translate
+
+
+'''
+Measure the cold start and the per-call overhead of Argos translation.
+Cold start runs in a fresh interpreter: the package check plus the first translation.
+"index" updates the package index over the network first (the previous behavior),
+"offline" uses argos_translate.valid_check() which only reads the installed packages.
+Per call compares argostranslate.translate.translate, which resolves the installed languages on every call,
+with the resident translator returned by argos_translate.get_translator.
+Needs argostranslate with the package for the language pair installed.
+
+usage: python bench_argos_startup.py [--calls 50] [--src en] [--dest ko]
+'''
+
+COLD_START = {
+    "index": "import argostranslate.package, argostranslate.translate\n"
+             "argostranslate.package.update_package_index()\n"
+             "argostranslate.translate.translate('Hello world.', '{src}', '{dest}')\n",
+    "offline": "import sys\n"
+               "sys.path.append({source!r})\n"
+               "import argos_translate\n"
+               "argos_translate.text_translate(text='Hello world.', dest='{dest}', src='{src}')\n",
+}
+
+
+def cold_start(mode, src, dest):
+    code = COLD_START[mode].format(source=SOURCE_DIR, src=src, dest=dest)
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--src", type=str, default="en")
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    for mode in COLD_START:
+        elapsed = cold_start(mode, args.src, args.dest)
+        print(f"cold start {mode:>8} : {elapsed * 1000:9.1f} ms")
+
+    texts = [f"Press any key to continue. ({i})" for i in range(args.calls)]
+
+    # Warm up both paths so the model files are in the page cache
+    argostranslate.translate.translate(texts[0], args.src, args.dest)
+    translation = argos_translate.get_translator(args.src, args.dest)
+    translation.translate(texts[0])
+
+    start = time.perf_counter()
+    for text in texts:
+        argostranslate.translate.translate(text, args.src, args.dest)
+    lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        argos_translate.get_translator(args.src, args.dest).translate(text)
+    resident_time = time.perf_counter() - start
+
+    print(f"per call   lookup   : {lookup_time / len(texts) * 1000:9.1f} ms")
+    print(f"per call   resident : {resident_time / len(texts) * 1000:9.1f} ms  speedup {lookup_time / resident_time:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import argparse
+import itertools
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import argos_translate
+
+
+'''
+Sweep the CTranslate2 settings of the Argos translator on a fixed sentence corpus.
+For every combination of inter threads, intra threads, compute type and beam size, the models are reloaded
+and the corpus is translated with argos_translate.text_translate_batch.
+Latency is the median time of translating one sentence, throughput is measured on the whole corpus in one batch call.
+No translation memory is set, so every call reaches CTranslate2.
+Needs argostranslate with the package for the language pair installed.
+
+usage: python bench_ctranslate2_settings.py [--inter 1,2] [--intra 0,4,8] [--compute default,int8,float32] [--beam 1,4] [--repeat 8]
+'''
+
+CORPUS = [
+    "Click the button below to save your changes.",
+    "The quick brown fox jumps over the lazy dog.",
+    "Settings",
+    "Your download will start automatically.",
+    "If it does not, use the link below.",
+    "Terms of service and privacy policy apply to every account.",
+    "Chapter one. The beginning of a long journey through the mountains.",
+    "Press any key to continue.",
+    "Free shipping on orders over fifty dollars!",
+    "Open the menu and select the language you want to use.",
+]
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def measure(texts, src, dest, latency_count):
+    latencies = []
+    for text in texts[:latency_count]:
+        start = time.perf_counter()
+        argos_translate.text_translate_batch([text], dest=dest, src=src)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    argos_translate.text_translate_batch(texts, dest=dest, src=src)
+    elapsed = time.perf_counter() - start
+
+    return statistics.median(latencies), len(texts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inter", type=str, default="1,2")
+    parser.add_argument("--intra", type=str, default="0,4,8")
+    parser.add_argument("--compute", type=str, default="default,int8,float32")
+    parser.add_argument("--beam", type=str, default="1,4")
+    parser.add_argument("--repeat", type=int, default=8, help="Number of copies of the corpus in the throughput batch")
+    parser.add_argument("--src", type=str, default="en")
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    texts = [f"{sentence} ({i})" for i in range(args.repeat) for sentence in CORPUS]
+
+    grid = itertools.product(parse_list(args.inter, int), parse_list(args.intra, int), \
+                             parse_list(args.compute, str), parse_list(args.beam, int))
+
+    print(f"{len(texts)} sentences, cores {os.cpu_count()}")
+    print(f"{'inter':>5} {'intra':>5} {'compute':>14} {'beam':>4} {'load ms':>9} {'latency ms':>11} {'sentences/s':>12}")
+
+    for inter_threads, intra_threads, compute_type, beam_size in grid:
+        argos_translate.configure(inter_threads=inter_threads, intra_threads=intra_threads, \
+                                  compute_type=compute_type, beam_size=beam_size)
+
+        # Loading the model with the new settings, counted separately
+        start = time.perf_counter()
+        argos_translate.preload(args.src, args.dest)
+        load_time = time.perf_counter() - start
+
+        argos_translate.text_translate_batch(texts[:1], dest=args.dest, src=args.src)
+        latency, throughput = measure(texts, args.src, args.dest, len(CORPUS))
+
+        print(f"{inter_threads:>5} {intra_threads:>5} {compute_type:>14} {beam_size:>4} {load_time * 1000:9.1f} {latency * 1000:11.1f} {throughput:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import google_translate_async
+from stub_translate_server import start_stub_server
+
+
+'''
+Compare serial and concurrent Google translation of one page against the local stub server.
+"serial" sends the requests of all blocks one after another, as the block-by-block translation did,
+"batch" sends them concurrently over the pooled client of google_translate_async.
+With the stub delay d, serial takes about blocks * d and batch about ceil(blocks / concurrency) * d.
+Pass --url to run against another endpoint instead of the stub.
+
+usage: python bench_google_async.py [--blocks 40] [--delay 0.2] [--jitter 0.05] [--concurrency 8,16,40] [--url URL]
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=str, default="8,16,40")
+    parser.add_argument("--url", type=str, default=None)
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        server, url = start_stub_server(delay=args.delay, jitter=args.jitter)
+
+    texts = [f"Paragraph number {i} of the page." for i in range(args.blocks)]
+
+    translator = google_translate_async.AsyncTranslator(url=url, max_concurrency=1)
+    start = time.perf_counter()
+    serial = [translator.translate(text, args.dest)[0] for text in texts]
+    serial_time = time.perf_counter() - start
+    translator.close()
+    print(f"{args.blocks} blocks, delay {args.delay * 1000:.0f} ms + jitter up to {args.jitter * 1000:.0f} ms")
+    print(f"{'serial':>14} : {serial_time * 1000:9.1f} ms")
+
+    for concurrency in [int(value) for value in args.concurrency.split(",")]:
+        translator = google_translate_async.AsyncTranslator(url=url, max_concurrency=concurrency)
+        start = time.perf_counter()
+        batch = translator.translate_batch(texts, args.dest)
+        batch_time = time.perf_counter() - start
+        translator.close()
+
+        same = sum(a == b for a, b in zip(serial, batch))
+        print(f"{f'batch x{concurrency}':>14} : {batch_time * 1000:9.1f} ms  speedup {serial_time / batch_time:5.2f}x  identical {same}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import google_translate_async
+import translation_dispatch
+from stub_translate_server import start_stub_server
+
+
+'''
+Measure the tail latency of hedged translation against the local stub server with injected delays and errors.
+The primary engine is google_async pointed at the stub. The fallback is Argos if --fallback argos is given,
+otherwise a local engine with a fixed latency (--local_delay) standing in for Argos, so the benchmark
+runs without the Argos models.
+Phase 1 compares direct requests with the dispatcher on the same fault mix,
+phase 2 makes every request fail and shows the circuit breaker sending requests to the fallback.
+
+usage: python bench_hedged_dispatch.py [--requests 200] [--delay 0.1] [--slow_rate 0.05] [--slow_delay 3.0] [--error_rate 0.05]
+'''
+
+
+def local_engine(delay):
+    def translate(text, dest, src=None):
+        time.sleep(delay)
+        return f"[{dest}] {text}"
+    return translate
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    return statistics.median(ordered), ordered[int(0.95 * len(ordered))], ordered[int(0.99 * len(ordered))], ordered[-1]
+
+
+def run_direct(translator, texts, dest):
+    latencies, errors = [], 0
+    for text in texts:
+        start = time.perf_counter()
+        try:
+            translator.translate(text, dest)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def run_hedged(dispatcher, texts, dest):
+    latencies, errors = [], 0
+    for text in texts:
+        start = time.perf_counter()
+        try:
+            dispatcher.translate(text, dest, "en")
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def report(name, latencies, errors):
+    p50, p95, p99, worst = percentiles(latencies)
+    print(f"{name:>8} : p50 {p50 * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  max {worst * 1000:7.1f} ms  errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--slow_rate", type=float, default=0.05)
+    parser.add_argument("--slow_delay", type=float, default=3.0)
+    parser.add_argument("--error_rate", type=float, default=0.05)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    parser.add_argument("--fallback", type=str, default="local")
+    parser.add_argument("--local_delay", type=float, default=0.15)
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(delay=args.delay, jitter=args.jitter, error_rate=args.error_rate, \
+                                    slow_rate=args.slow_rate, slow_delay=args.slow_delay)
+    translator = google_translate_async.AsyncTranslator(url=url, retries=0, timeout=args.slow_delay + 1)
+    google_translate_async.set_default(translator)
+
+    engines = dict(translation_dispatch.ENGINES)
+    engines["local"] = local_engine(args.local_delay)
+    dispatcher = translation_dispatch.TranslationDispatcher(primary="google_async", fallback=args.fallback, \
+                                                             deadline=args.deadline, engines=engines)
+
+    texts = [f"Paragraph number {i} of the page." for i in range(args.requests)]
+    print(f"{args.requests} requests, delay {args.delay * 1000:.0f} ms, {args.slow_rate:.0%} slow ({args.slow_delay * 1000:.0f} ms), "
+          f"{args.error_rate:.0%} errors, fallback {args.fallback}")
+
+    report("direct", *run_direct(translator, texts, args.dest))
+    report("hedged", *run_hedged(dispatcher, texts, args.dest))
+    print(f"{'':>8}   {dispatcher.stats()}")
+
+    # Phase 2: the online engine fails every request
+    server.RequestHandlerClass.error_rate = 1.0
+    report("outage", *run_hedged(dispatcher, texts[:50], args.dest))
+    print(f"{'':>8}   {dispatcher.stats()}")
+
+    dispatcher.close()
+    translator.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import argos_translate
+
+
+'''
+Compare the translation throughput of the per-block loop over argos_translate.text_translate
+with one argos_translate.text_translate_batch call for all blocks.
+Needs argostranslate with the package for the language pair installed.
+
+usage: python bench_translate_batch.py [--blocks 40] [--src en] [--dest ko]
+'''
+
+PARAGRAPHS = [
+    "Click the button below to save your changes.",
+    "The quick brown fox jumps over the lazy dog. It was a sunny day.",
+    "Settings",
+    "Your download will start automatically. If it does not, use the link below.",
+    "Terms of service and privacy policy apply to every account.",
+    "Chapter one. The beginning of a long journey through the mountains.",
+    "Press any key to continue.",
+    "Free shipping on orders over fifty dollars!",
+    "Menu\nOpen a file. Save it before you close the window.",
+]
+
+
+def count_sentences(texts):
+    return sum(len([s for s in argos_translate.SENTENCE_PATTERN.split(paragraph.strip()) if s]) for text in texts for paragraph in text.split("\n"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--src", type=str, default="en")
+    parser.add_argument("--dest", type=str, default="ko")
+    args = parser.parse_args()
+
+    texts = [PARAGRAPHS[i % len(PARAGRAPHS)] + f" ({i})" for i in range(args.blocks)]
+    sentences = count_sentences(texts)
+
+    # Warm up: package check, model loading and tokenizer
+    argos_translate.text_translate(text=texts[0], dest=args.dest, src=args.src)
+    argos_translate.text_translate_batch(texts[:1], dest=args.dest, src=args.src)
+
+    start = time.perf_counter()
+    loop = [argos_translate.text_translate(text=text, dest=args.dest, src=args.src) for text in texts]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = argos_translate.text_translate_batch(texts, dest=args.dest, src=args.src)
+    batch_time = time.perf_counter() - start
+
+    same = sum(a == b for a, b in zip(loop, batch))
+    print(f"{len(texts)} blocks, {sentences} sentences")
+    print(f" loop : {loop_time * 1000:9.1f} ms  {sentences / loop_time:8.1f} sentences/s")
+    print(f"batch : {batch_time * 1000:9.1f} ms  {sentences / batch_time:8.1f} sentences/s  speedup {loop_time / batch_time:5.2f}x")
+    print(f"identical translations {same}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    main()
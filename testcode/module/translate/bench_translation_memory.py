@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from multiprocessing import Pool
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "source"))
+import translation_memory
+
+
+'''
+Measure the translation memory: lookups answered by the in-process LRU, lookups answered by SQLite,
+and several processes writing to the same file at once, the way server workers share it.
+
+usage: python bench_translation_memory.py [--entries 5000] [--writers 4]
+'''
+
+
+def write_entries(args):
+    path, worker, count = args
+    memory = translation_memory.TranslationMemory(path)
+    start = time.perf_counter()
+    for i in range(count):
+        memory.put("argos", "en-ko-1.0", "en", "ko", f"label {worker} {i}", f"translated {worker} {i}")
+    elapsed = time.perf_counter() - start
+    memory.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "translation_memory.db")
+
+        with Pool(args.writers) as pool:
+            start = time.perf_counter()
+            times = pool.map(write_entries, [(path, worker, args.entries // args.writers) for worker in range(args.writers)])
+            elapsed = time.perf_counter() - start
+        print(f"{args.writers} writers : {args.entries / elapsed:10.0f} puts/s  (slowest writer {max(times):.2f} s)")
+
+        # A fresh memory has an empty LRU, so the first pass reads SQLite and the second pass the LRU
+        memory = translation_memory.TranslationMemory(path, memory_entries=args.entries)
+        keys = [(worker, i) for worker in range(args.writers) for i in range(args.entries // args.writers)]
+
+        for name in ["sqlite", "lru"]:
+            start = time.perf_counter()
+            found = sum(memory.get("argos", "en-ko-1.0", "en", "ko", f"label {worker} {i}") is not None for worker, i in keys)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>9} : {len(keys) / elapsed:10.0f} gets/s  found {found}/{len(keys)}")
+
+        print(memory.stats())
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
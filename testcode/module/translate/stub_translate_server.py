@@ -0,0 +1,95 @@
+import json
+import time
+import random
+import argparse
+import threading
+
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+'''
+Local HTTP server imitating the Google translate endpoint used by google_translate_async.
+GET /translate_a/single?client=gtx&sl=<src>&tl=<dest>&dt=t&q=<text> answers after a fixed delay (plus optional jitter)
+with the same JSON layout as the real endpoint. The "translation" is the text prefixed with the destination language,
+and "auto" is detected as "en".
+Faults can be injected: a share of the requests answers with HTTP 503 (error_rate),
+and a share answers after slow_delay instead of delay (slow_rate), imitating rate limiting and tail latency.
+The settings are class attributes of the handler, so they can be changed while the server runs.
+
+usage: python stub_translate_server.py [--port 8765] [--delay 0.2] [--jitter 0.05] [--error_rate 0.0] [--slow_rate 0.0] [--slow_delay 3.0]
+'''
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.2
+    jitter = 0.0
+    error_rate = 0.0
+    slow_rate = 0.0
+    slow_delay = 3.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/translate_a/single":
+            self.send_error(404)
+            return
+
+        query = parse_qs(url.query)
+        text = query.get("q", [""])[0]
+        src = query.get("sl", ["auto"])[0]
+        dest = query.get("tl", ["en"])[0]
+
+        slow = random.random() < self.slow_rate
+        time.sleep((self.slow_delay if slow else self.delay) + random.uniform(0, self.jitter))
+
+        if random.random() < self.error_rate:
+            self.send_error(503)
+            return
+
+        body = json.dumps([[[f"[{dest}] {text}", text, None, None, 10]], None, "en" if src == "auto" else src]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return
+
+
+def start_stub_server(port=0, delay=0.2, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_delay=3.0):
+    """
+    Start the stub server on a daemon thread and return (server, endpoint URL).
+    Port 0 picks a free port. The fault settings can be changed later through server.RequestHandlerClass.
+    """
+    handler = type("Handler", (StubHandler,), {"delay": delay, "jitter": jitter, "error_rate": error_rate, \
+                                               "slow_rate": slow_rate, "slow_delay": slow_delay})
+    # The default listen backlog of 5 would queue concurrent connections behind SYN retries
+    server_class = type("Server", (ThreadingHTTPServer,), {"request_queue_size": 128})
+    server = server_class(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error_rate", type=float, default=0.0)
+    parser.add_argument("--slow_rate", type=float, default=0.0)
+    parser.add_argument("--slow_delay", type=float, default=3.0)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.delay, args.jitter, args.error_rate, args.slow_rate, args.slow_delay)
+    print(f"stub translate endpoint at {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()